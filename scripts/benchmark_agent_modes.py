@@ -0,0 +1,172 @@
+"""
+Multi-agent prompting: 3 calls per model ("separate") vs. 1 structured call ("combined")
+
+Runs the 54 benchmark cases (scripts/generate_benchmark_report.py) through
+the ensemble (or, with ``--detector multi_agent``, the 3-agent detector) once
+per LLM_AGENT_MODE and reports LLM calls, billed
+prompt/output tokens (summed over every agent result), wall time, accuracy,
+and how closely the modes agree: verdict (phishing / not) agreement and the
+mean absolute difference of the ensemble score and of each agent's score.
+The LLM response cache is bypassed so every call is real.
+
+Offline with the mock provider:
+    python scripts/mock_llm_server.py --latency lognormal:800:0.4
+    LLM_BASE_URL=http://127.0.0.1:8090 GEMINI_API_KEY=mock python scripts/benchmark_agent_modes.py
+
+Usage:
+    python scripts/benchmark_agent_modes.py
+    python scripts/benchmark_agent_modes.py --limit 10 --output agent_modes.json
+    MULTI_AGENT_CLIENT=gemini python scripts/benchmark_agent_modes.py --detector multi_agent
+"""
+import sys
+from pathlib import Path
+import argparse
+import json
+import statistics
+import time
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.config import config
+from src.llm.agent_prompts import AGENT_MODES, AGENTS
+from src.llm.multi_agent_detector import MultiAgentPhishingDetector
+from src.llm.multi_llm_ensemble import MultiLLMEnsemble
+from scripts.generate_benchmark_report import test_cases
+
+
+def is_correct(case, score: float) -> bool:
+    """phishing: score >= min, legitimate: score <= max, caution: min <= score <= max"""
+    return case.get("min", 0) <= score <= case.get("max", 100)
+
+
+DETECTORS = {"ensemble": MultiLLMEnsemble, "multi_agent": MultiAgentPhishingDetector}
+
+
+def run_mode(detector_name: str, mode: str, cases, pause: float):
+    detector = DETECTORS[detector_name](agent_mode=mode)
+    rows = []
+    for i, case in enumerate(cases, 1):
+        start = time.perf_counter()
+        result = detector.analyze(case["text"])
+        seconds = time.perf_counter() - start
+
+        # ensemble: "<LLM>_<agent>" → result, multi-agent: "<agent>" → result
+        agent_results = result.get("all_results", result.get("agent_results", {}))
+        usages = [item["usage"] for item in agent_results.values() if item.get("usage")]
+        rows.append({
+            "id": case["id"],
+            "score": result["risk_score"],
+            "is_phishing": result["is_phishing"],
+            "correct": is_correct(case, result["risk_score"]),
+            "agent_scores": {key: item.get("score") for key, item in agent_results.items()},
+            "llm_calls": result.get("llm_calls", 0),
+            "prompt_tokens": sum(usage.get("prompt_tokens", 0) for usage in usages) if usages else None,
+            "output_tokens": sum(usage.get("output_tokens", 0) for usage in usages) if usages else None,
+            "seconds": seconds
+        })
+        print(
+            f"  [{i}/{len(cases)}] {case['id']:<4} {result['risk_score']:>6}  "
+            f"{'✓' if rows[-1]['correct'] else '✗'}  {rows[-1]['llm_calls']:>2} calls  "
+            f"{rows[-1]['prompt_tokens'] or '?':>6} tok  {seconds:5.2f}s"
+        )
+        time.sleep(pause)
+    return rows
+
+
+def summarize(rows):
+    latencies = sorted(row["seconds"] for row in rows)
+    prompt_tokens = [row["prompt_tokens"] for row in rows if row["prompt_tokens"] is not None]
+    output_tokens = [row["output_tokens"] for row in rows if row["output_tokens"] is not None]
+    return {
+        "accuracy": sum(row["correct"] for row in rows) / len(rows) * 100 if rows else 0.0,
+        "avg_llm_calls": statistics.mean(row["llm_calls"] for row in rows) if rows else 0.0,
+        "avg_prompt_tokens": statistics.mean(prompt_tokens) if prompt_tokens else None,
+        "avg_output_tokens": statistics.mean(output_tokens) if output_tokens else None,
+        "avg_seconds": statistics.mean(latencies) if latencies else None,
+        "p95_seconds": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] if latencies else None
+    }
+
+
+def agreement(baseline, rows):
+    """Verdict agreement and mean absolute score differences against the baseline mode"""
+    base = {row["id"]: row for row in baseline}
+    pairs = [(base[row["id"]], row) for row in rows if row["id"] in base]
+    agent_diffs = {agent: [] for agent in AGENTS}
+    for a, b in pairs:
+        for key, score in b["agent_scores"].items():
+            agent = key.rsplit("_", 1)[-1]
+            if agent in agent_diffs and a["agent_scores"].get(key) is not None and score is not None:
+                agent_diffs[agent].append(abs(a["agent_scores"][key] - score))
+    return {
+        "verdict_agreement": sum(a["is_phishing"] == b["is_phishing"] for a, b in pairs) / len(pairs) * 100
+        if pairs else 0.0,
+        "changed_verdicts": [b["id"] for a, b in pairs if a["is_phishing"] != b["is_phishing"]],
+        "score_mae": statistics.mean(abs(a["score"] - b["score"]) for a, b in pairs) if pairs else 0.0,
+        "agent_score_mae": {agent: statistics.mean(diffs) if diffs else None for agent, diffs in agent_diffs.items()}
+    }
+
+
+def fmt(value, spec: str) -> str:
+    return "-" if value is None else format(value, spec)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-agent prompting: separate (3 calls) vs. combined (1 call)")
+    parser.add_argument("--detector", choices=sorted(DETECTORS), default="ensemble")
+    parser.add_argument("--modes", nargs="+", choices=AGENT_MODES, default=list(AGENT_MODES))
+    parser.add_argument("--limit", type=int, help="Only the first N cases")
+    parser.add_argument("--pause", type=float, default=1.0, help="Seconds between cases (API quota)")
+    parser.add_argument("--output", help="Write per-case rows and summaries to this JSON file")
+    args = parser.parse_args()
+
+    config.llm_cache.enabled = False  # token counts and latency need real calls
+    if not DETECTORS[args.detector](agent_mode=args.modes[0]).is_available():
+        print("⚠️ No LLM API keys configured (or set LLM_BASE_URL to the mock server)")
+        return
+
+    cases = test_cases[:args.limit] if args.limit else test_cases
+    print("=" * 60)
+    print(f"Agent mode benchmark ({args.detector}): {len(cases)} cases, modes {', '.join(args.modes)}")
+    print("=" * 60)
+
+    results = {}
+    for mode in args.modes:
+        print(f"\n[{mode}]")
+        results[mode] = run_mode(args.detector, mode, cases, args.pause)
+
+    baseline = args.modes[0]
+    summaries = {}
+    print()
+    print("=" * 60)
+    print(f"{'mode':<10} {'acc':>7} {'calls':>6} {'prompt tok':>11} {'out tok':>8} {'avg':>7} {'p95':>7}")
+    print("-" * 60)
+    for mode, rows in results.items():
+        summary = summarize(rows)
+        summary.update(agreement(results[baseline], rows))
+        summaries[mode] = summary
+        print(
+            f"{mode:<10} {summary['accuracy']:6.1f}% {summary['avg_llm_calls']:6.1f} "
+            f"{fmt(summary['avg_prompt_tokens'], '11.0f')} {fmt(summary['avg_output_tokens'], '8.0f')} "
+            f"{fmt(summary['avg_seconds'], '6.2f')}s {fmt(summary['p95_seconds'], '6.2f')}s"
+        )
+    print("=" * 60)
+    print(f"Agreement with '{baseline}':")
+    for mode, summary in summaries.items():
+        if mode == baseline:
+            continue
+        agents = ", ".join(f"{agent} {fmt(mae, '.1f')}" for agent, mae in summary["agent_score_mae"].items())
+        print(
+            f"  {mode}: verdicts {summary['verdict_agreement']:.1f}% "
+            f"(changed: {', '.join(summary['changed_verdicts']) or 'none'}), "
+            f"score MAE {summary['score_mae']:.1f}, agent MAE {agents}"
+        )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"cases": results, "summary": summaries}, f, ensure_ascii=False, indent=2)
+        print(f"Saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
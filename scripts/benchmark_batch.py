@@ -0,0 +1,108 @@
+"""
+Batched Gemini prompting: throughput vs. transcripts per request (K)
+
+Scores the 54 benchmark cases (scripts/generate_benchmark_report.py) with
+GeminiPhishingDetector.analyze_batch for each K and reports transcripts/s,
+requests sent (including splits after unparsable responses), prompt tokens
+per transcript, accuracy, and verdicts that differ from K=1. The LLM response
+cache is bypassed so K=1 makes real calls too.
+
+Offline with the mock provider:
+    python scripts/mock_llm_server.py --latency lognormal:800:0.4
+    LLM_BASE_URL=http://127.0.0.1:8090 GEMINI_API_KEY=mock python scripts/benchmark_batch.py
+
+Usage:
+    python scripts/benchmark_batch.py
+    python scripts/benchmark_batch.py --sizes 1 8 32 --repeat 3 --output batch.json
+"""
+import sys
+from pathlib import Path
+import argparse
+import json
+import time
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.config import config
+from src.llm.gemini_detector import PROMPTS, GeminiPhishingDetector
+from scripts.generate_benchmark_report import test_cases
+
+
+def is_correct(case, score: float) -> bool:
+    """phishing: score >= min, legitimate: score <= max, caution: min <= score <= max"""
+    return case.get("min", 0) <= score <= case.get("max", 100)
+
+
+def run_size(detector: GeminiPhishingDetector, cases, size: int, enable_filter: bool):
+    start = time.perf_counter()
+    results = detector.analyze_batch([case["text"] for case in cases], enable_filter=enable_filter, batch_size=size)
+    seconds = time.perf_counter() - start
+
+    answered = [(case, result) for case, result in zip(cases, results) if "error" not in result]
+    prompt_tokens = [result["usage"]["prompt_tokens"] for _, result in answered if result.get("usage")]
+    return {
+        "batch_size": size,
+        "seconds": seconds,
+        "transcripts_per_second": len(cases) / seconds,
+        # each item carries the size of the request that scored it, so splits are counted too
+        "requests": round(sum(1 / result.get("batch_size", 1) for _, result in answered)),
+        "errors": len(cases) - len(answered),
+        "prompt_tokens_per_transcript": sum(prompt_tokens) / len(prompt_tokens) if prompt_tokens else None,
+        "accuracy": sum(is_correct(case, result["score"]) for case, result in answered) / len(answered) * 100
+        if answered else 0.0,
+        "verdicts": {case["id"]: result.get("is_phishing") for case, result in zip(cases, results)}
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batched Gemini prompting throughput (K transcripts per request)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32])
+    parser.add_argument("--variant", choices=sorted(PROMPTS), default=config.prompt.gemini_variant)
+    parser.add_argument("--repeat", type=int, default=1, help="Score the case list this many times per K")
+    parser.add_argument("--no-filter", action="store_true", help="Raw Gemini scores (no rule filter)")
+    parser.add_argument("--output", help="Write the per-K results to this JSON file")
+    args = parser.parse_args()
+
+    config.llm_cache.enabled = False  # every K makes real calls
+    detector = GeminiPhishingDetector(prompt_variant=args.variant)
+    if not detector.is_available():
+        print("⚠️ GEMINI_API_KEY is not configured (or set LLM_BASE_URL to the mock server)")
+        return
+
+    cases = test_cases * args.repeat
+    print("=" * 60)
+    print(f"Batch benchmark: {len(cases)} transcripts, K = {', '.join(map(str, args.sizes))}")
+    print("=" * 60)
+
+    runs = []
+    for size in args.sizes:
+        print(f"K={size} ...")
+        runs.append(run_size(detector, cases, size, enable_filter=not args.no_filter))
+
+    baseline = runs[0]["verdicts"]
+    print()
+    print("=" * 60)
+    print(f"{'K':>3} {'trans/s':>8} {'requests':>9} {'tok/trans':>10} {'acc':>7} {'changed':>8} {'errors':>7}")
+    print("-" * 60)
+    for run in runs:
+        run["changed_verdicts"] = sorted({
+            case_id for case_id, verdict in run["verdicts"].items() if verdict != baseline.get(case_id)
+        })
+        tokens = run["prompt_tokens_per_transcript"]
+        print(
+            f"{run['batch_size']:>3} {run['transcripts_per_second']:8.2f} {run['requests']:>9} "
+            f"{'-' if tokens is None else format(tokens, '10.0f'):>10} {run['accuracy']:6.1f}% "
+            f"{len(run['changed_verdicts']):>8} {run['errors']:>7}"
+        )
+    print("=" * 60)
+    print(f"changed = verdicts (phishing / not) that differ from K={args.sizes[0]}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"args": vars(args), "runs": runs}, f, ensure_ascii=False, indent=2)
+        print(f"Saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
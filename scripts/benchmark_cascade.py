@@ -0,0 +1,160 @@
+"""
+LLM cascade benchmark: accuracy vs. average LLM calls per request
+
+Every case is scored once by the cascade's first stage (Gemini + Rule Filter)
+and once by the escalation detector (3-agent ensemble or multi-agent). The
+cascade for any pair of bands is then replayed from those scores, so a whole
+grid of bands costs one pass over the API. Answers come from the shared LLM
+response cache when the same case was scored before; pass ``--no-cache`` to
+measure real latencies.
+
+Usage:
+    python scripts/benchmark_cascade.py
+    python scripts/benchmark_cascade.py --escalation multi_agent
+    python scripts/benchmark_cascade.py --safe-below 20 30 40 --phishing-at 70 80 90 --output cascade.json
+"""
+import sys
+from pathlib import Path
+import argparse
+import json
+import time
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.config import config
+from src.llm.cascade_detector import CascadeDetector
+from scripts.benchmark_gemini_filter import test_cases
+
+PHISHING_THRESHOLD = 70
+
+
+def score_cases(cascade: CascadeDetector, cases, pause: float):
+    """First-stage and escalation score, calls and latency for every case"""
+    rows = []
+    for i, case in enumerate(cases, 1):
+        start = time.perf_counter()
+        first = cascade.first_stage.finalize(
+            case["text"], cascade.first_stage.query_llm(case["text"]), allow_second_stage=False
+        )
+        first_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        escalated = cascade.escalation.analyze(case["text"])
+        escalation_seconds = time.perf_counter() - start
+
+        rows.append({
+            "id": case["id"],
+            "expected_phishing": case["type"] == "phishing",
+            "first_score": first["score"],
+            "first_seconds": first_seconds,
+            "escalation_score": escalated["risk_score"],
+            "escalation_calls": escalated.get("llm_calls", 3),
+            "escalation_seconds": escalation_seconds
+        })
+        print(
+            f"[{i}/{len(cases)}] {case['id']:<4} first {first['score']:>5}  "
+            f"escalation {escalated['risk_score']:>6}  ({'phishing' if case['type'] == 'phishing' else 'legit'})"
+        )
+        time.sleep(pause)
+    return rows
+
+
+def evaluate(rows, decide):
+    """decide(row) -> (score, calls, seconds); accuracy at the 70-point threshold"""
+    correct = calls = seconds = 0
+    escalated = 0
+    for row in rows:
+        score, row_calls, row_seconds, was_escalated = decide(row)
+        correct += (score >= PHISHING_THRESHOLD) == row["expected_phishing"]
+        calls += row_calls
+        seconds += row_seconds
+        escalated += was_escalated
+    n = len(rows)
+    return {
+        "accuracy": correct / n * 100,
+        "avg_calls": calls / n,
+        "avg_seconds": seconds / n,
+        "escalation_rate": escalated / n * 100
+    }
+
+
+def cascade_policy(safe_below: float, phishing_at: float):
+    def decide(row):
+        if row["first_score"] < safe_below or row["first_score"] >= phishing_at:
+            return row["first_score"], 1, row["first_seconds"], False
+        return (
+            row["escalation_score"],
+            1 + row["escalation_calls"],
+            row["first_seconds"] + row["escalation_seconds"],
+            True
+        )
+    return decide
+
+
+def print_row(name: str, stats):
+    print(
+        f"{name:<28} {stats['accuracy']:6.1f}%  {stats['avg_calls']:6.2f}  "
+        f"{stats['avg_seconds']:7.2f}s  {stats['escalation_rate']:6.1f}%"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cascade accuracy vs. LLM calls per request")
+    parser.add_argument("--escalation", choices=["ensemble", "multi_agent"], default=config.cascade.escalation)
+    parser.add_argument("--safe-below", type=float, nargs="+", default=[20, 30, 40])
+    parser.add_argument("--phishing-at", type=float, nargs="+", default=[70, 80, 85, 90])
+    parser.add_argument("--limit", type=int, help="Only the first N cases")
+    parser.add_argument("--pause", type=float, default=1.0, help="Seconds between cases (API quota)")
+    parser.add_argument("--output", help="Write per-case scores and the band grid to this JSON file")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the LLM response cache (real latencies)")
+    args = parser.parse_args()
+
+    if args.no_cache:
+        config.llm_cache.enabled = False
+
+    cascade = CascadeDetector(escalation=CascadeDetector._default_escalation(args.escalation))
+    if not cascade.is_available() or not cascade.escalation.is_available():
+        print("⚠️ Gemini and the escalation detector both need API keys")
+        return
+
+    cases = test_cases[:args.limit] if args.limit else test_cases
+
+    print("=" * 60)
+    print(f"Cascade benchmark: {len(cases)} cases, escalation = {args.escalation}")
+    print("=" * 60)
+    rows = score_cases(cascade, cases, args.pause)
+
+    print()
+    print("=" * 60)
+    print(f"{'policy':<28} {'acc':>7}  {'calls':>6}  {'latency':>8}  {'escal.':>7}")
+    print("-" * 60)
+    baselines = {
+        "gemini only": evaluate(rows, lambda r: (r["first_score"], 1, r["first_seconds"], False)),
+        f"{args.escalation} only": evaluate(
+            rows, lambda r: (r["escalation_score"], r["escalation_calls"], r["escalation_seconds"], True)
+        )
+    }
+    for name, stats in baselines.items():
+        print_row(name, stats)
+
+    grid = []
+    for safe_below in args.safe_below:
+        for phishing_at in args.phishing_at:
+            if safe_below > phishing_at:
+                continue
+            stats = evaluate(rows, cascade_policy(safe_below, phishing_at))
+            grid.append({"safe_below": safe_below, "phishing_at": phishing_at, **stats})
+            marker = " *" if (safe_below, phishing_at) == (config.cascade.safe_below, config.cascade.phishing_at) else ""
+            print_row(f"cascade [{safe_below:g}, {phishing_at:g}){marker}", stats)
+    print("=" * 60)
+    print("* = configured bands (CASCADE_SAFE_BELOW / CASCADE_PHISHING_AT)")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"cases": rows, "baselines": baselines, "grid": grid}, f, ensure_ascii=False, indent=2)
+        print(f"Saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
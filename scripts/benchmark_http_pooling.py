@@ -0,0 +1,142 @@
+"""
+Per-call latency: fresh connection per request vs pooled keep-alive session
+
+By default a local HTTP/1.1 server stands in for the LLM API. It sleeps
+``--handshake-ms`` once per new connection (models the TCP + TLS handshake
+round trips to a remote provider) and ``--service-ms`` per request. With
+``--url`` the same comparison runs against a real HTTPS endpoint (GET; the
+status code does not matter, only the connection cost).
+
+Usage:
+    python scripts/benchmark_http_pooling.py
+    python scripts/benchmark_http_pooling.py --calls 200 --concurrency 8 --handshake-ms 120
+    python scripts/benchmark_http_pooling.py --url https://generativelanguage.googleapis.com/
+"""
+import sys
+from pathlib import Path
+import argparse
+import json
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import requests
+
+from src.llm.llm_clients.base_client import get_session, http_timeout
+
+RESPONSE_BODY = json.dumps({
+    "candidates": [{"content": {"parts": [{"text": "{\"score\": 12, \"reasoning\": \"정상 통화\"}"}]}}]
+}).encode("utf-8")
+
+
+def make_handler(handshake_seconds: float, service_seconds: float):
+    class FakeLLMHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive
+
+        def setup(self):
+            super().setup()
+            time.sleep(handshake_seconds)  # once per connection
+
+        def _respond(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            if length:
+                self.rfile.read(length)
+            time.sleep(service_seconds)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(RESPONSE_BODY)))
+            self.end_headers()
+            self.wfile.write(RESPONSE_BODY)
+
+        do_GET = _respond
+        do_POST = _respond
+
+        def log_message(self, format, *args):
+            pass
+
+    return FakeLLMHandler
+
+
+def run_calls(call, calls: int, concurrency: int):
+    """Per-call latencies (ms) and wall time (s)"""
+    latencies = []
+    lock = threading.Lock()
+
+    def one(_):
+        start = time.perf_counter()
+        call()
+        elapsed = (time.perf_counter() - start) * 1000
+        with lock:
+            latencies.append(elapsed)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(calls)))
+    return latencies, time.perf_counter() - start
+
+
+def summarize(name: str, latencies, wall: float):
+    ordered = sorted(latencies)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    print(
+        f"{name:<22} mean {statistics.mean(ordered):8.1f} ms   p50 {statistics.median(ordered):8.1f} ms   "
+        f"p95 {p95:8.1f} ms   {len(ordered) / wall:7.1f} req/s"
+    )
+    return statistics.mean(ordered)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP connection pooling benchmark for LLM clients")
+    parser.add_argument("--calls", type=int, default=100, help="Calls per mode")
+    parser.add_argument("--concurrency", type=int, default=4, help="Concurrent callers")
+    parser.add_argument("--handshake-ms", type=float, default=80, help="Simulated connection setup cost")
+    parser.add_argument("--service-ms", type=float, default=20, help="Simulated per-request server time")
+    parser.add_argument("--url", help="Benchmark a real endpoint (GET) instead of the local server")
+    args = parser.parse_args()
+
+    server = None
+    if args.url:
+        url, method = args.url, "GET"
+    else:
+        server = ThreadingHTTPServer(
+            ("127.0.0.1", 0), make_handler(args.handshake_ms / 1000, args.service_ms / 1000)
+        )
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url, method = f"http://127.0.0.1:{server.server_port}/v1/generate", "POST"
+
+    payload = {"contents": [{"parts": [{"text": "검찰청입니다. 계좌가 범죄에 연루되었습니다."}]}]}
+
+    def fresh_connection():
+        # What the clients did before: module-level requests.post, new connection every call
+        requests.request(method, url, json=payload, headers={"Connection": "close"}, timeout=http_timeout())
+
+    def pooled():
+        get_session(url).request(method, url, json=payload, timeout=http_timeout())
+
+    print("=" * 60)
+    print(f"Target: {url}")
+    print(f"Calls: {args.calls} per mode, concurrency {args.concurrency}")
+    if server:
+        print(f"Simulated handshake {args.handshake_ms:.0f} ms, service {args.service_ms:.0f} ms")
+    print("=" * 60)
+
+    pooled()  # open the pool's first connection outside the measurement
+    fresh_mean = summarize("fresh connection", *run_calls(fresh_connection, args.calls, args.concurrency))
+    pooled_mean = summarize("pooled keep-alive", *run_calls(pooled, args.calls, args.concurrency))
+
+    print("-" * 60)
+    print(f"Saved per call: {fresh_mean - pooled_mean:.1f} ms ({(1 - pooled_mean / fresh_mean) * 100:.0f}%)")
+    print("=" * 60)
+
+    if server:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Gemini prompt variants: prompt tokens, latency and accuracy side by side
+
+Runs the 54 benchmark cases (scripts/generate_benchmark_report.py) through
+the detector once per prompt variant (GEMINI_PROMPT_VARIANT) and reports
+billed prompt/output tokens (Gemini ``usageMetadata``), LLM latency and
+accuracy after the rule filter, plus how many verdicts differ from the
+first variant. The LLM response cache is bypassed so every call is real.
+The second-stage verifier is skipped unless ``--second-stage`` is given, so
+the numbers are the prompt's own.
+
+Usage:
+    python scripts/benchmark_prompts.py
+    python scripts/benchmark_prompts.py --variants full compact --limit 10
+    python scripts/benchmark_prompts.py --output prompts.json
+"""
+import sys
+from pathlib import Path
+import argparse
+import json
+import statistics
+import time
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.config import config
+from src.llm.gemini_detector import PROMPTS, GeminiPhishingDetector
+from scripts.generate_benchmark_report import test_cases
+
+
+def is_correct(case, score: float) -> bool:
+    """phishing: score >= min, legitimate: score <= max, caution: min <= score <= max"""
+    return case.get("min", 0) <= score <= case.get("max", 100)
+
+
+def run_variant(variant: str, cases, second_stage: bool, pause: float):
+    detector = GeminiPhishingDetector(prompt_variant=variant)
+    rows = []
+    for i, case in enumerate(cases, 1):
+        start = time.perf_counter()
+        gemini_result = detector.query_llm(case["text"])
+        seconds = time.perf_counter() - start
+        if "error" in gemini_result:
+            print(f"  [{i}/{len(cases)}] {case['id']:<4} ✗ {gemini_result['error']}")
+            rows.append({"id": case["id"], "error": gemini_result["error"]})
+            time.sleep(pause)
+            continue
+
+        result = detector.finalize(case["text"], gemini_result, allow_second_stage=second_stage)
+        usage = gemini_result.get("usage", {})
+        rows.append({
+            "id": case["id"],
+            "llm_score": gemini_result.get("score"),
+            "score": result["score"],
+            "is_phishing": result["is_phishing"],
+            "correct": is_correct(case, result["score"]),
+            "prompt_tokens": usage.get("prompt_tokens"),
+            "output_tokens": usage.get("output_tokens"),
+            "seconds": seconds
+        })
+        print(
+            f"  [{i}/{len(cases)}] {case['id']:<4} {result['score']:>5}  "
+            f"{'✓' if rows[-1]['correct'] else '✗'}  {usage.get('prompt_tokens', '?'):>5} tok  {seconds:5.2f}s"
+        )
+        time.sleep(pause)
+    return rows
+
+
+def summarize(rows):
+    answered = [row for row in rows if "error" not in row]
+    prompt_tokens = [row["prompt_tokens"] for row in answered if row["prompt_tokens"] is not None]
+    output_tokens = [row["output_tokens"] for row in answered if row["output_tokens"] is not None]
+    latencies = sorted(row["seconds"] for row in answered)
+    return {
+        "answered": len(answered),
+        "errors": len(rows) - len(answered),
+        "accuracy": sum(row["correct"] for row in answered) / len(answered) * 100 if answered else 0.0,
+        "avg_prompt_tokens": statistics.mean(prompt_tokens) if prompt_tokens else None,
+        "avg_output_tokens": statistics.mean(output_tokens) if output_tokens else None,
+        "avg_seconds": statistics.mean(latencies) if latencies else None,
+        "p95_seconds": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] if latencies else None
+    }
+
+
+def verdict_changes(baseline, rows):
+    """Case ids whose is_phishing verdict differs from the baseline variant"""
+    base = {row["id"]: row.get("is_phishing") for row in baseline if "error" not in row}
+    return [row["id"] for row in rows if "error" not in row and row["id"] in base and base[row["id"]] != row["is_phishing"]]
+
+
+def fmt(value, spec: str) -> str:
+    return "-" if value is None else format(value, spec)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gemini prompt variants: tokens, latency, accuracy")
+    parser.add_argument("--variants", nargs="+", choices=sorted(PROMPTS), default=["full", "compact"])
+    parser.add_argument("--limit", type=int, help="Only the first N cases")
+    parser.add_argument("--pause", type=float, default=1.0, help="Seconds between calls (API quota)")
+    parser.add_argument("--second-stage", action="store_true", help="Include the second-stage LLM verifier")
+    parser.add_argument("--output", help="Write per-case rows and summaries to this JSON file")
+    args = parser.parse_args()
+
+    config.llm_cache.enabled = False  # token counts and latency need real calls
+    if not GeminiPhishingDetector(prompt_variant=args.variants[0]).is_available():
+        print("⚠️ GEMINI_API_KEY is not configured (or set LLM_BASE_URL to the mock server)")
+        return
+
+    cases = test_cases[:args.limit] if args.limit else test_cases
+    print("=" * 60)
+    print(f"Prompt benchmark: {len(cases)} cases, variants {', '.join(args.variants)}")
+    print("=" * 60)
+
+    results = {}
+    for variant in args.variants:
+        print(f"\n[{variant}] {len(PROMPTS[variant])} chars")
+        results[variant] = run_variant(variant, cases, args.second_stage, args.pause)
+
+    baseline = args.variants[0]
+    summaries = {}
+    print()
+    print("=" * 60)
+    print(f"{'variant':<10} {'acc':>7} {'prompt tok':>11} {'out tok':>8} {'avg':>7} {'p95':>7} {'changed':>8}")
+    print("-" * 60)
+    for variant, rows in results.items():
+        summary = summarize(rows)
+        summary["changed_verdicts"] = verdict_changes(results[baseline], rows)
+        summaries[variant] = summary
+        print(
+            f"{variant:<10} {summary['accuracy']:6.1f}% {fmt(summary['avg_prompt_tokens'], '11.0f')} "
+            f"{fmt(summary['avg_output_tokens'], '8.0f')} {fmt(summary['avg_seconds'], '6.2f')}s "
+            f"{fmt(summary['p95_seconds'], '6.2f')}s {len(summary['changed_verdicts']):>8}"
+        )
+    print("=" * 60)
+    print(f"changed = verdicts (phishing / not) that differ from '{baseline}'")
+    for variant, summary in summaries.items():
+        if summary["changed_verdicts"]:
+            print(f"  {variant}: {', '.join(summary['changed_verdicts'])}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"cases": results, "summary": summaries}, f, ensure_ascii=False, indent=2)
+        print(f"Saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Throughput and tail latency of a running API server
+
+Sends ``--requests`` analyses at ``--concurrency`` and reports req/s,
+p50/p95/p99 latency, HTTP statuses and how many verdicts were degraded or
+served from the cache. Texts are the benchmark cases; ``--unique`` appends a
+request number to each so the response cache does not answer them.
+
+Offline run against the mock providers (no API keys, no cost):
+    python scripts/mock_llm_server.py --latency lognormal:800:0.4 --error-rate 0.01
+    LLM_BASE_URL=http://127.0.0.1:8090 GEMINI_API_KEY=mock LLM_LIMIT_GEMINI=256:0 python scripts/run_server.py
+    python scripts/load_test.py --requests 500 --concurrency 32 --unique
+
+The endpoints' per-client rate limits (slowapi, e.g. 10/minute) apply to
+the load generator too; raise them for the test run or expect 429s.
+
+Usage:
+    python scripts/load_test.py
+    python scripts/load_test.py --endpoint /api/analyze/text --requests 100 --concurrency 8
+    python scripts/load_test.py --output load.json
+"""
+import sys
+from pathlib import Path
+import argparse
+import json
+import statistics
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import requests
+
+from scripts.benchmark_gemini_filter import test_cases
+
+
+def percentile(ordered, q: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+def run_load(url: str, texts, concurrency: int, timeout: float, deadline: float = None):
+    """Per-request (latency ms, status, degraded, cached) and wall time (s)"""
+    samples = []
+    lock = threading.Lock()
+    local = threading.local()
+
+    def one(text):
+        session = getattr(local, "session", None)
+        if session is None:
+            session = local.session = requests.Session()
+        body = {"text": text}
+        if deadline:
+            body["deadline_seconds"] = deadline
+        start = time.perf_counter()
+        try:
+            response = session.post(url, json=body, timeout=timeout)
+            status = response.status_code
+            data = response.json() if status == 200 else {}
+        except requests.RequestException as e:
+            status, data = type(e).__name__, {}
+        elapsed = (time.perf_counter() - start) * 1000
+        with lock:
+            samples.append((elapsed, status, bool(data.get("degraded")), bool(data.get("cached"))))
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, texts))
+    return samples, time.perf_counter() - start
+
+
+def summarize(samples, wall: float):
+    latencies = sorted(elapsed for elapsed, status, _, _ in samples if status == 200)
+    statuses = Counter(str(status) for _, status, _, _ in samples)
+    summary = {
+        "requests": len(samples),
+        "ok": len(latencies),
+        "throughput_rps": len(samples) / wall,
+        "ok_rps": len(latencies) / wall,
+        "statuses": dict(statuses),
+        "degraded": sum(1 for _, status, degraded, _ in samples if status == 200 and degraded),
+        "cached": sum(1 for _, status, _, cached in samples if status == 200 and cached)
+    }
+    if latencies:
+        summary.update({
+            "mean_ms": statistics.mean(latencies),
+            "p50_ms": statistics.median(latencies),
+            "p95_ms": percentile(latencies, 0.95),
+            "p99_ms": percentile(latencies, 0.99),
+            "max_ms": latencies[-1]
+        })
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test a running Sentinel-Voice API server")
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="API server base URL")
+    parser.add_argument("--endpoint", default="/api/analyze/gemini",
+                        help="POST endpoint taking {\"text\": ...} (/api/analyze/gemini, /api/analyze/text)")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--unique", action="store_true", help="Make every text unique (bypass the response cache)")
+    parser.add_argument("--deadline", type=float, help="deadline_seconds sent with each request")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Client-side timeout per request")
+    parser.add_argument("--output", help="Write the summary to this JSON file")
+    args = parser.parse_args()
+
+    texts = [test_cases[i % len(test_cases)]["text"] for i in range(args.requests)]
+    if args.unique:
+        texts = [f"{text} ({i})" for i, text in enumerate(texts)]
+    url = args.url.rstrip("/") + args.endpoint
+
+    print("=" * 60)
+    print(f"Load test: {args.requests} requests → {url}")
+    print(f"Concurrency {args.concurrency}, {'unique' if args.unique else 'repeating'} texts")
+    print("=" * 60)
+
+    samples, wall = run_load(url, texts, args.concurrency, args.timeout, args.deadline)
+    summary = summarize(samples, wall)
+
+    print(f"Wall time:   {wall:8.2f} s")
+    print(f"Throughput:  {summary['throughput_rps']:8.2f} req/s ({summary['ok_rps']:.2f} ok/s)")
+    if summary["ok"]:
+        print(
+            f"Latency:     p50 {summary['p50_ms']:.0f} ms   p95 {summary['p95_ms']:.0f} ms   "
+            f"p99 {summary['p99_ms']:.0f} ms   max {summary['max_ms']:.0f} ms"
+        )
+    print(f"Statuses:    {summary['statuses']}")
+    print(f"Degraded:    {summary['degraded']}   Cached: {summary['cached']}")
+    print("=" * 60)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"args": vars(args), **summary}, f, ensure_ascii=False, indent=2)
+        print(f"Saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
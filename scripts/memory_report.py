@@ -0,0 +1,52 @@
+"""
+Print RSS / PSS / shared pages of a (pre-fork) server and its workers
+
+Usage:
+    python scripts/memory_report.py <parent pid>
+    python scripts/memory_report.py <parent pid> --json
+"""
+import sys
+from pathlib import Path
+import argparse
+import json
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.server.prefork import memory_report
+
+
+def _mb(kb: int) -> str:
+    return f"{kb / 1024:8.1f} MB"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory sharing report for Sentinel-Voice workers")
+    parser.add_argument("pid", type=int, help="Parent process id (pre-fork parent or uvicorn master)")
+    parser.add_argument("--json", action="store_true", help="Print the raw JSON report")
+    args = parser.parse_args()
+
+    report = memory_report(args.pid)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print("=" * 72)
+    print(f"{'PID':>8} {'ROLE':<8} {'RSS':>11} {'PSS':>11} {'SHARED':>11} {'PRIVATE':>11} {'SHARED%':>8}")
+    print("-" * 72)
+    for p in report["processes"]:
+        print(
+            f"{p['pid']:>8} {p['role']:<8} {_mb(p['rss_kb'])} {_mb(p['pss_kb'])} "
+            f"{_mb(p['shared_kb'])} {_mb(p['private_kb'])} {p['shared_ratio'] * 100:7.1f}%"
+        )
+    print("-" * 72)
+    total = report["total"]
+    print(f"Sum of RSS:        {_mb(total['rss_kb'])}")
+    print(f"Sum of PSS:        {_mb(total['pss_kb'])}  (actual footprint)")
+    print(f"Shared pages:      {total['shared_pages']:>8} x {report['page_size_kb']} kB")
+    print(f"Saved by sharing:  {_mb(total['saved_by_sharing_kb'])}")
+    print("=" * 72)
+
+
+if __name__ == "__main__":
+    main()
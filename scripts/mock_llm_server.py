@@ -0,0 +1,278 @@
+"""
+Offline stand-in for the LLM provider APIs (load and latency testing without API keys)
+
+Answers the request shapes the clients send, with the provider's response shape:
+    POST /v1beta/models/<model>:generateContent      Gemini
+    POST /v1/chat/completions, /chat/completions     OpenAI, DeepSeek, Perplexity
+    POST /v1/messages                                Anthropic
+    POST /testapp/v1/chat-completions/<model>        ClovaX
+    GET  /stats                                      request counts per provider / outcome
+
+Each request sleeps for a sample of ``--latency`` and fails with one of
+``--error-statuses`` at ``--error-rate``. Verdicts come from ``--verdicts``
+(a JSON list of ``{"match": regex, "score": int, "reasoning": str}`` rules,
+optionally with ``"status"`` or ``"latency_ms"`` for that input); transcripts
+no rule matches are scored by a small keyword heuristic. Batched requests
+(numbered ``[통화 N]`` transcripts) get a JSON array with one verdict per
+transcript and take ``--batch-item-ms`` longer per extra transcript.
+Combined multi-agent prompts (LLM_AGENT_MODE=combined) get one verdict per
+agent field, ``{"context": {...}, "psychological": {...}, ...}``.
+
+Point the server at it (any non-empty API keys):
+    LLM_BASE_URL=http://127.0.0.1:8090 GEMINI_API_KEY=mock OPENAI_API_KEY=mock python scripts/run_server.py
+
+Usage:
+    python scripts/mock_llm_server.py
+    python scripts/mock_llm_server.py --latency lognormal:900:0.5 --error-rate 0.02
+    python scripts/mock_llm_server.py --latency uniform:200:1500 --verdicts verdicts.json --port 8091
+"""
+import argparse
+import json
+import math
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+TRANSCRIPT_MARKER = "**통화 내용:**"
+BATCH_ITEM = re.compile(r"\[통화 (\d+)\]\n")
+COMBINED_FIELD = re.compile(r'^  "(\w+)": \{$', re.M)  # agent fields of a combined multi-agent schema
+
+# Keyword heuristic for transcripts no scripted rule matches
+PHISHING_KEYWORDS = [
+    "검찰", "검사", "금융감독원", "금감원", "수사", "대포통장", "안전계좌", "송금", "이체",
+    "앱 설치", "어플", "팀뷰어", "원격", "링크", "모텔", "비밀번호", "OTP", "선입금", "수수료"
+]
+
+
+class LatencyModel:
+    """
+    Per-request latency from a spec string (milliseconds)
+
+        fixed:<ms> | uniform:<min>:<max> | lognormal:<median>:<sigma> | exp:<mean>
+    """
+
+    def __init__(self, spec: str, rng: random.Random):
+        kind, *params = spec.split(":")
+        self.spec = spec
+        self.kind = kind
+        self.params = [float(p) for p in params]
+        self.rng = rng
+        expected = {"fixed": 1, "uniform": 2, "lognormal": 2, "exp": 1}
+        if kind not in expected or len(self.params) != expected[kind]:
+            raise ValueError(f"Bad latency spec '{spec}' (fixed:ms, uniform:min:max, lognormal:median:sigma, exp:mean)")
+
+    def sample(self) -> float:
+        """Seconds"""
+        if self.kind == "fixed":
+            ms = self.params[0]
+        elif self.kind == "uniform":
+            ms = self.rng.uniform(*self.params)
+        elif self.kind == "lognormal":
+            median, sigma = self.params
+            ms = self.rng.lognormvariate(math.log(median), sigma)
+        else:
+            ms = self.rng.expovariate(1 / self.params[0])
+        return max(0.0, ms) / 1000
+
+
+class MockBehavior:
+    """Latency, failures and verdicts shared by all handler threads"""
+
+    def __init__(self, latency: str = "lognormal:800:0.4", error_rate: float = 0.0,
+                 error_statuses: Tuple[int, ...] = (503,), verdicts: Optional[List[Dict]] = None,
+                 seed: Optional[int] = None, batch_item_ms: float = 40.0):
+        self.rng = random.Random(seed)
+        self.latency = LatencyModel(latency, self.rng)
+        self.error_rate = error_rate
+        self.error_statuses = list(error_statuses)
+        self.batch_item_seconds = batch_item_ms / 1000
+        self.rules = [(re.compile(rule["match"]), rule) for rule in (verdicts or [])]
+        self.counts = Counter()
+        self._lock = threading.Lock()
+
+    def decide(self, provider: str, transcript: str) -> Tuple[float, Optional[int], Dict]:
+        """(delay seconds, error status or None, verdict)"""
+        rule = next((rule for pattern, rule in self.rules if pattern.search(transcript)), None)
+        with self._lock:
+            delay = rule["latency_ms"] / 1000 if rule and "latency_ms" in rule else self.latency.sample()
+            status = rule.get("status") if rule else None
+            if status is None and self.rng.random() < self.error_rate:
+                status = self.rng.choice(self.error_statuses)
+            self.counts[(provider, "error" if status else "ok")] += 1
+
+        if rule is not None:
+            score = rule.get("score", 50)
+            reasoning = rule.get("reasoning", f"scripted: {rule['match']}")
+        else:
+            hits = [keyword for keyword in PHISHING_KEYWORDS if keyword in transcript]
+            score = min(95, 10 + 25 * len(hits))
+            reasoning = f"mock heuristic: {', '.join(hits) or 'no phishing keywords'}"
+        verdict = {"score": score, "is_phishing": score >= 70, "reasoning": reasoning, "key_points": []}
+        return delay, status, verdict
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {f"{provider}.{outcome}": count for (provider, outcome), count in sorted(self.counts.items())}
+
+
+def _provider(path: str) -> Optional[str]:
+    if path.endswith(":generateContent"):
+        return "gemini"
+    if path.endswith("/chat/completions"):
+        return "openai"
+    if path.endswith("/v1/messages"):
+        return "anthropic"
+    if "/chat-completions/" in path:
+        return "clovax"
+    return None
+
+
+def _prompt_text(provider: str, payload: Dict) -> str:
+    if provider == "gemini":
+        return payload["contents"][-1]["parts"][0]["text"]
+    return payload["messages"][-1]["content"]
+
+
+def _response_body(provider: str, content: str, prompt_tokens: int) -> Dict:
+    output_tokens = max(1, len(content) // 3)
+    if provider == "gemini":
+        return {
+            "candidates": [{"content": {"parts": [{"text": content}], "role": "model"}, "finishReason": "STOP"}],
+            "usageMetadata": {
+                "promptTokenCount": prompt_tokens,
+                "candidatesTokenCount": output_tokens,
+                "totalTokenCount": prompt_tokens + output_tokens
+            }
+        }
+    if provider == "anthropic":
+        return {
+            "content": [{"type": "text", "text": content}],
+            "usage": {"input_tokens": prompt_tokens, "output_tokens": output_tokens}
+        }
+    if provider == "clovax":
+        return {"status": {"code": "20000"}, "result": {"message": {"role": "assistant", "content": content}}}
+    return {
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": output_tokens,
+            "total_tokens": prompt_tokens + output_tokens
+        }
+    }
+
+
+def make_handler(behavior: MockBehavior):
+    class MockLLMHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, like the real APIs
+
+        def do_GET(self):
+            if self.path.startswith("/stats"):
+                self._send(200, behavior.stats())
+            else:
+                self._send(200, {"status": "ok"})
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length) if length else b"{}"
+            provider = _provider(self.path.split("?", 1)[0])
+            if provider is None:
+                self._send(404, {"error": {"message": f"Unknown path {self.path}"}})
+                return
+            try:
+                prompt = _prompt_text(provider, json.loads(body))
+            except (ValueError, KeyError, IndexError, TypeError):
+                self._send(400, {"error": {"message": "Malformed request body"}})
+                return
+
+            transcript = prompt.split(TRANSCRIPT_MARKER, 1)[-1]
+            batch = BATCH_ITEM.split(transcript)[2::2]  # texts of "[통화 N]" sections, if any
+            delay, status, verdict = behavior.decide(provider, transcript if not batch else batch[0])
+            verdicts = [verdict]
+            for text in batch[1:]:
+                _, item_status, item_verdict = behavior.decide(provider, text)
+                status = status or item_status
+                verdicts.append(item_verdict)
+            time.sleep(delay + behavior.batch_item_seconds * (len(verdicts) - 1))
+            if status:
+                headers = {"Retry-After": "1"} if status in (429, 503) else {}
+                self._send(status, {"error": {"code": status, "message": "mock failure"}}, headers)
+                return
+            agents = COMBINED_FIELD.findall(prompt.split(TRANSCRIPT_MARKER, 1)[0])
+            if batch:
+                content = json.dumps([{"index": i, **v} for i, v in enumerate(verdicts, 1)], ensure_ascii=False)
+            elif agents:
+                content = json.dumps({agent: verdict for agent in agents}, ensure_ascii=False)
+            else:
+                content = json.dumps(verdict, ensure_ascii=False)
+            self._send(200, _response_body(provider, content, max(1, len(prompt) // 3)))
+
+        def _send(self, status: int, data: Dict, headers: Optional[Dict] = None):
+            payload = json.dumps(data, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass
+
+    return MockLLMHandler
+
+
+def start_server(behavior: MockBehavior, host: str = "127.0.0.1", port: int = 0) -> ThreadingHTTPServer:
+    """Serve in a background thread (port 0 = any free port); stop with ``server.shutdown()``"""
+    server = ThreadingHTTPServer((host, port), make_handler(behavior))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock LLM provider server (Gemini / OpenAI / Anthropic / ClovaX)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--latency", default="lognormal:800:0.4",
+                        help="fixed:ms | uniform:min:max | lognormal:median:sigma | exp:mean")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests that fail")
+    parser.add_argument("--error-statuses", type=int, nargs="+", default=[503], help="HTTP statuses for failures")
+    parser.add_argument("--verdicts", help="JSON file with scripted verdict rules")
+    parser.add_argument("--seed", type=int, help="Random seed (reproducible latencies and failures)")
+    parser.add_argument("--batch-item-ms", type=float, default=40.0,
+                        help="Extra latency per additional transcript in a batched request")
+    args = parser.parse_args()
+
+    verdicts = None
+    if args.verdicts:
+        with open(args.verdicts, encoding="utf-8") as f:
+            verdicts = json.load(f)
+
+    behavior = MockBehavior(
+        args.latency, args.error_rate, tuple(args.error_statuses), verdicts, args.seed, args.batch_item_ms
+    )
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(behavior))
+    server.daemon_threads = True
+
+    print("=" * 60)
+    print(f"Mock LLM server on http://{args.host}:{args.port}")
+    print(f"Latency {args.latency}, error rate {args.error_rate:.1%} {args.error_statuses}, "
+          f"{len(verdicts or [])} scripted verdicts")
+    print(f"Use: LLM_BASE_URL=http://{args.host}:{args.port} (any non-empty API keys)")
+    print("=" * 60)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(json.dumps(behavior.stats(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
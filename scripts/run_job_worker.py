@@ -0,0 +1,93 @@
+"""
+Script to run standalone job workers for /api/jobs
+
+Workers share the SQLite job database with the API server, so STT capacity
+can be scaled independently of API processes (set JOB_WORKERS=0 on the API
+to keep it request-only).
+"""
+import sys
+from pathlib import Path
+import argparse
+import logging
+import signal
+import threading
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.config import config
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run Sentinel-Voice job workers")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=max(config.jobs.workers, 1),
+        help="Number of worker threads (default: JOB_WORKERS or 1)"
+    )
+    parser.add_argument(
+        "--db",
+        type=str,
+        default=config.jobs.db_path,
+        help=f"Job database path (default: {config.jobs.db_path})"
+    )
+    parser.add_argument(
+        "--no-gemini",
+        action="store_true",
+        help="Use the rule-based risk scorer instead of Gemini + Rule Filter"
+    )
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    from src.nlp.phishing_pipeline import PhishingDetectionPipeline
+    from src.scoring.risk_scorer import RiskScorer
+    from src.server.jobs import JobStore, JobWorkerPool, delete_audio_upload, make_audio_job_handler
+
+    pipeline = PhishingDetectionPipeline()
+    risk_scorer = RiskScorer()
+
+    gemini_detector = None
+    if not args.no_gemini:
+        try:
+            from src.llm.gemini_detector import GeminiPhishingDetector
+            gemini_detector = GeminiPhishingDetector()
+        except Exception as e:
+            print(f"⚠ Gemini detector unavailable, using risk scorer: {e}")
+
+    store = JobStore(
+        args.db,
+        lease_seconds=config.jobs.lease_seconds,
+        max_attempts=config.jobs.max_attempts
+    )
+    pool = JobWorkerPool(
+        store,
+        {"audio": make_audio_job_handler(pipeline, gemini_detector, risk_scorer)},
+        num_workers=args.workers,
+        name="worker",
+        on_failed={"audio": delete_audio_upload}
+    )
+
+    print("=" * 60)
+    print("Sentinel-Voice Job Workers")
+    print("=" * 60)
+    print(f"Database: {args.db}")
+    print(f"Workers:  {args.workers}")
+    print(f"Detector: {'Gemini + Rule Filter' if gemini_detector else 'Risk Scorer'}")
+    print("=" * 60)
+    print("\nPress Ctrl+C to stop the workers")
+
+    stop = threading.Event()
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+
+    pool.start()
+    while not stop.wait(1.0):
+        pass
+    pool.stop()
+    print("Workers stopped")
+
+
+if __name__ == "__main__":
+    main()
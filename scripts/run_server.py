@@ -31,6 +31,17 @@ def main():
         default=config.server.debug,
         help="Enable auto-reload"
     )
+    parser.add_argument(
+        "--prefork",
+        action="store_true",
+        help="Load models once in the parent and fork workers that share them (Linux)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes (default: 1)"
+    )
 
     args = parser.parse_args()
 
@@ -40,6 +51,7 @@ def main():
     print(f"Host:   {args.host}")
     print(f"Port:   {args.port}")
     print(f"Reload: {args.reload}")
+    print(f"Mode:   {'pre-fork' if args.prefork else 'uvicorn'} ({args.workers} workers)")
     print("=" * 60)
     print("\nStarting server...")
     print("API docs will be available at:")
@@ -48,13 +60,22 @@ def main():
     print("\nPress Ctrl+C to stop the server")
     print("=" * 60)
 
+    if args.prefork:
+        import logging
+        from src.server.prefork import serve
+
+        logging.basicConfig(level=logging.INFO)
+        serve(args.host, args.port, args.workers)
+        return
+
     import uvicorn
 
     uvicorn.run(
         "src.server.main:app",
         host=args.host,
         port=args.port,
-        reload=args.reload
+        reload=args.reload and args.workers == 1,
+        workers=args.workers
     )
 
 
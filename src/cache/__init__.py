@@ -0,0 +1,17 @@
+"""
+Response caching module (bounded LRU+TTL with pluggable backends)
+"""
+from .backends import CacheBackend, MemoryCacheBackend, SQLiteCacheBackend
+from .response_cache import ResponseCache, build_response_cache
+from .llm_cache import get_llm_cache, llm_cache_key, normalize_text
+
+__all__ = [
+    "CacheBackend",
+    "MemoryCacheBackend",
+    "SQLiteCacheBackend",
+    "ResponseCache",
+    "build_response_cache",
+    "get_llm_cache",
+    "llm_cache_key",
+    "normalize_text",
+]
@@ -0,0 +1,320 @@
+"""
+Cache storage backends
+
+- MemoryCacheBackend: per-process OrderedDict LRU with TTL, bounded by entry
+  count and approximate byte size
+- SQLiteCacheBackend: on-disk WAL-mode database so several uvicorn workers
+  (or the server and offline scripts) share one cache
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+
+def _encode(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False)
+
+
+class CacheBackend(ABC):
+    """Base class for cache backends (values must be JSON-serialisable)"""
+
+    name = "unknown"
+
+    def __init__(self, max_entries: int, max_bytes: int, clock: Callable[[], float] = time.time):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self.evictions = 0
+        self.expirations = 0
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value or None if missing/expired"""
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: float):
+        """Store a value for ``ttl`` seconds, evicting LRU entries over budget"""
+        pass
+
+    @abstractmethod
+    def delete(self, key: str):
+        pass
+
+    @abstractmethod
+    def clear(self):
+        pass
+
+    @abstractmethod
+    def size(self) -> Dict[str, int]:
+        """{"entries": int, "bytes": int}"""
+        pass
+
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    In-process LRU + TTL cache
+
+    Expiry is O(1) per operation: entries are checked lazily on ``get`` and a
+    FIFO of (expires_at, key) is drained from the head on ``set``, so there is
+    never a full scan of the cache.
+    """
+
+    name = "memory"
+
+    def __init__(self, max_entries: int = 10000, max_bytes: int = 64 * 1024 * 1024,
+                 clock: Callable[[], float] = time.monotonic):
+        super().__init__(max_entries, max_bytes, clock)
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (value, expires_at, size)
+        self._expiry_queue: deque = deque()  # (expires_at, key) in insertion order
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires_at, _ = entry
+            if expires_at <= self.clock():
+                self._remove(key)
+                self.expirations += 1
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: float):
+        size = len(_encode(value).encode("utf-8"))
+        now = self.clock()
+        with self._lock:
+            self._drain_expired(now)
+
+            if key in self._data:
+                self._remove(key)
+
+            expires_at = now + ttl
+            self._data[key] = (value, expires_at, size)
+            self._bytes += size
+            self._expiry_queue.append((expires_at, key))
+
+            while self._data and (len(self._data) > self.max_entries or self._bytes > self.max_bytes):
+                oldest_key = next(iter(self._data))
+                self._remove(oldest_key)
+                self.evictions += 1
+
+            # Stale queue records (overwritten/evicted keys) are skipped when
+            # drained; compact if they pile up so the queue stays bounded
+            if len(self._expiry_queue) > 2 * max(len(self._data), 1) + 64:
+                self._expiry_queue = deque(sorted(
+                    (exp, k) for k, (_, exp, _) in self._data.items()
+                ))
+
+    def delete(self, key: str):
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._expiry_queue.clear()
+            self._bytes = 0
+
+    def size(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._data), "bytes": self._bytes}
+
+    def _remove(self, key: str):
+        _, _, size = self._data.pop(key)
+        self._bytes -= size
+
+    def _drain_expired(self, now: float):
+        while self._expiry_queue and self._expiry_queue[0][0] <= now:
+            expires_at, key = self._expiry_queue.popleft()
+            entry = self._data.get(key)
+            if entry is not None and entry[1] == expires_at:
+                self._remove(key)
+                self.expirations += 1
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """
+    Shared on-disk cache (SQLite in WAL mode)
+
+    Safe to use from several processes: each thread gets its own connection
+    and WAL lets readers proceed while one writer commits. Expired rows are
+    deleted through the ``expires_at`` index and LRU eviction through the
+    ``accessed_at`` index, so neither needs a table scan. Entry and byte
+    totals live in a one-row ``cache_meta`` table kept current by triggers
+    in the same transaction as the change.
+
+    A hit does not write: it queues its ``accessed_at`` touch in memory and
+    the next ``set`` (which holds the write lock anyway) applies the queued
+    touches before evicting. Touches from other processes reach the table
+    with their own next ``set``.
+    """
+
+    name = "sqlite"
+
+    # Bound on queued touches between two writes; further hits are not recorded
+    MAX_PENDING_TOUCHES = 10000
+
+    def __init__(self, path: Union[str, Path], max_entries: int = 10000,
+                 max_bytes: int = 256 * 1024 * 1024, clock: Callable[[], float] = time.time):
+        super().__init__(max_entries, max_bytes, clock)
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._touches: Dict[str, float] = {}
+        self._touch_lock = threading.Lock()
+
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS cache_entries (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    size INTEGER NOT NULL
+                )""")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_expires ON cache_entries(expires_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_accessed ON cache_entries(accessed_at)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS cache_meta (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    entries INTEGER NOT NULL,
+                    bytes INTEGER NOT NULL
+                )""")
+            # Seed the totals once (a cache file created before cache_meta existed)
+            conn.execute(
+                "INSERT OR IGNORE INTO cache_meta (id, entries, bytes) "
+                "SELECT 1, COUNT(*), COALESCE(SUM(size), 0) FROM cache_entries"
+            )
+            conn.execute("""
+                CREATE TRIGGER IF NOT EXISTS cache_meta_insert AFTER INSERT ON cache_entries BEGIN
+                    UPDATE cache_meta SET entries = entries + 1, bytes = bytes + NEW.size WHERE id = 1;
+                END""")
+            conn.execute("""
+                CREATE TRIGGER IF NOT EXISTS cache_meta_delete AFTER DELETE ON cache_entries BEGIN
+                    UPDATE cache_meta SET entries = entries - 1, bytes = bytes - OLD.size WHERE id = 1;
+                END""")
+            conn.execute("""
+                CREATE TRIGGER IF NOT EXISTS cache_meta_resize AFTER UPDATE OF size ON cache_entries BEGIN
+                    UPDATE cache_meta SET bytes = bytes - OLD.size + NEW.size WHERE id = 1;
+                END""")
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        logger.info(f"SQLite cache ready: {self.path}")
+
+    def _conn(self) -> sqlite3.Connection:
+        # Per-thread connection, never reused across fork (pre-fork workers)
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(str(self.path), timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key: str) -> Optional[Any]:
+        conn = self._conn()
+        now = self.clock()
+        row = conn.execute(
+            "SELECT value, expires_at FROM cache_entries WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        value, expires_at = row
+        if expires_at <= now:
+            conn.execute("DELETE FROM cache_entries WHERE key = ? AND expires_at = ?", (key, expires_at))
+            self.expirations += 1
+            return None
+        with self._touch_lock:
+            if key in self._touches or len(self._touches) < self.MAX_PENDING_TOUCHES:
+                self._touches[key] = now
+        return json.loads(value)
+
+    def _flush_touches(self, conn: sqlite3.Connection):
+        """Apply queued LRU touches (caller holds the write transaction)"""
+        with self._touch_lock:
+            touches, self._touches = self._touches, {}
+        if touches:
+            conn.executemany(
+                "UPDATE cache_entries SET accessed_at = MAX(accessed_at, ?) WHERE key = ?",
+                [(at, key) for key, at in touches.items()]
+            )
+
+    def set(self, key: str, value: Any, ttl: float):
+        conn = self._conn()
+        encoded = _encode(value)
+        size = len(encoded.encode("utf-8"))
+        now = self.clock()
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._flush_touches(conn)
+
+            expired = conn.execute(
+                "DELETE FROM cache_entries WHERE expires_at <= ?", (now,)
+            ).rowcount
+            self.expirations += max(expired, 0)
+
+            # Upsert rather than INSERT OR REPLACE: REPLACE's implicit delete
+            # does not fire the cache_meta triggers
+            conn.execute(
+                "INSERT INTO cache_entries (key, value, expires_at, accessed_at, size) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at, "
+                "accessed_at = excluded.accessed_at, size = excluded.size",
+                (key, encoded, now + ttl, now, size)
+            )
+
+            entries, total_bytes = conn.execute(
+                "SELECT entries, bytes FROM cache_meta WHERE id = 1"
+            ).fetchone()
+
+            while entries > self.max_entries or total_bytes > self.max_bytes:
+                excess = max(entries - self.max_entries, 1)
+                victims = conn.execute(
+                    "SELECT key, size FROM cache_entries ORDER BY accessed_at LIMIT ?", (excess,)
+                ).fetchall()
+                if not victims:
+                    break
+                conn.executemany("DELETE FROM cache_entries WHERE key = ?", [(k,) for k, _ in victims])
+                entries -= len(victims)
+                total_bytes -= sum(s for _, s in victims)
+                self.evictions += len(victims)
+
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def delete(self, key: str):
+        self._conn().execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+
+    def clear(self):
+        with self._touch_lock:
+            self._touches.clear()
+        self._conn().execute("DELETE FROM cache_entries")
+
+    def size(self) -> Dict[str, int]:
+        entries, total_bytes = self._conn().execute(
+            "SELECT entries, bytes FROM cache_meta WHERE id = 1"
+        ).fetchone()
+        return {"entries": entries, "bytes": total_bytes}
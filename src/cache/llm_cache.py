@@ -0,0 +1,63 @@
+"""
+Persistent content-addressed cache for raw LLM responses
+
+Shared by every ``BaseLLMClient`` (server, 2nd stage verifier, ensemble,
+benchmark scripts) through one on-disk SQLite file. The key is derived from
+(provider, model, prompt hash, normalized text), so editing a prompt
+template produces new keys and stale answers are never served; old entries
+simply age out through LRU eviction and the TTL.
+"""
+import hashlib
+import logging
+import re
+import threading
+import unicodedata
+from typing import Optional
+
+from .backends import SQLiteCacheBackend
+from .response_cache import ResponseCache
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+_llm_cache: Optional[ResponseCache] = None
+_llm_cache_lock = threading.Lock()
+
+
+def normalize_text(text: str) -> str:
+    """NFC + collapsed whitespace, so re-uploads that differ only in spacing share a key"""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+def llm_cache_key(provider: str, model: str, prompt: str, text: str) -> str:
+    return ResponseCache.make_key(
+        "llm",
+        normalize_text(text),
+        provider=provider,
+        model=model,
+        prompt=hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    )
+
+
+def get_llm_cache() -> Optional[ResponseCache]:
+    """Process-wide LLM response cache (``config.llm_cache``); None when disabled"""
+    global _llm_cache
+    from src.config import config
+
+    if not config.llm_cache.enabled:
+        return None
+    if _llm_cache is None:
+        with _llm_cache_lock:
+            if _llm_cache is None:
+                backend = SQLiteCacheBackend(
+                    config.llm_cache.path,
+                    max_entries=config.llm_cache.max_entries,
+                    max_bytes=config.llm_cache.max_bytes
+                )
+                _llm_cache = ResponseCache(backend, ttl_seconds=config.llm_cache.ttl_seconds)
+                logger.info(
+                    f"LLM response cache: {config.llm_cache.path}, max_entries={backend.max_entries}, "
+                    f"max_bytes={backend.max_bytes}, ttl={config.llm_cache.ttl_seconds}s"
+                )
+    return _llm_cache
@@ -0,0 +1,102 @@
+"""
+Analysis response cache with hit/miss accounting
+"""
+import hashlib
+import json
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+from .backends import CacheBackend, MemoryCacheBackend, SQLiteCacheBackend
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """
+    Bounded LRU+TTL cache in front of an analysis endpoint
+
+    Keys are derived from the input text *and* every parameter that changes
+    the result (filter on/off, model, prompt version), so a request with
+    ``enable_filter=False`` never receives a cached filtered verdict.
+    """
+
+    def __init__(self, backend: CacheBackend, ttl_seconds: float = 3600):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(namespace: str, text: str, **params) -> str:
+        """
+        Build a cache key from the endpoint namespace, text and parameters
+
+        Args:
+            namespace: Endpoint / result kind (e.g. "gemini")
+            text: Input text
+            **params: Anything that affects the result (enable_filter, prompt_version, ...)
+        """
+        material = json.dumps(
+            {"ns": namespace, "text": text, "params": params},
+            ensure_ascii=False,
+            sort_keys=True
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self.backend.get(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        self.backend.set(key, value, self.ttl_seconds if ttl is None else ttl)
+
+    def clear(self):
+        self.backend.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        size = self.backend.size()
+        return {
+            "backend": self.backend.name,
+            "cache_size": size["entries"],
+            "cache_bytes": size["bytes"],
+            "max_entries": self.backend.max_entries,
+            "max_bytes": self.backend.max_bytes,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": hits,
+            "misses": misses,
+            "evictions": self.backend.evictions,
+            "expirations": self.backend.expirations,
+            "cache_hit_rate": round(hits / lookups, 4) if lookups else 0.0
+        }
+
+
+def build_response_cache(cache_config) -> ResponseCache:
+    """Create a ResponseCache from ``config.cache``"""
+    if cache_config.backend == "sqlite":
+        backend = SQLiteCacheBackend(
+            cache_config.sqlite_path,
+            max_entries=cache_config.max_entries,
+            max_bytes=cache_config.max_bytes
+        )
+    else:
+        if cache_config.backend != "memory":
+            logger.warning(f"Unknown cache backend '{cache_config.backend}', using memory")
+        backend = MemoryCacheBackend(
+            max_entries=cache_config.max_entries,
+            max_bytes=cache_config.max_bytes
+        )
+    logger.info(
+        f"Response cache: backend={backend.name}, max_entries={backend.max_entries}, "
+        f"max_bytes={backend.max_bytes}, ttl={cache_config.ttl_seconds}s"
+    )
+    return ResponseCache(backend, ttl_seconds=cache_config.ttl_seconds)
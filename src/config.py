@@ -49,6 +49,200 @@ class RiskScoringConfig(BaseModel):
     risk_threshold: int = int(os.getenv("RISK_THRESHOLD", "70"))
 
 
+class PromptConfig(BaseModel):
+    """LLM prompt templates ("full" = original instructions, "compact" = same rules, ~1/3 the tokens)"""
+    gemini_variant: str = os.getenv("GEMINI_PROMPT_VARIANT", "full")
+    # Multi-agent detectors: "separate" = one call per agent, "combined" = one structured call per model
+    agent_mode: str = os.getenv("LLM_AGENT_MODE", "separate")
+
+
+class ExecutionConfig(BaseModel):
+    """Blocking-stage executor pool sizes (worker threads / max queued tasks)"""
+    stt_workers: int = int(os.getenv("STT_WORKERS", "1"))
+    stt_max_queue: int = int(os.getenv("STT_MAX_QUEUE", "8"))
+    embedding_workers: int = int(os.getenv("EMBEDDING_WORKERS", "2"))
+    embedding_max_queue: int = int(os.getenv("EMBEDDING_MAX_QUEUE", "64"))
+    llm_workers: int = int(os.getenv("LLM_WORKERS", "16"))
+    llm_max_queue: int = int(os.getenv("LLM_MAX_QUEUE", "128"))
+    # Long-lived pool shared by all MultiLLMEnsemble requests (sync path)
+    ensemble_workers: int = int(os.getenv("ENSEMBLE_WORKERS", "32"))
+    # Long-lived pool for the 3-agent detector's concurrent agent calls
+    multi_agent_workers: int = int(os.getenv("MULTI_AGENT_WORKERS", "12"))
+
+
+class EnsembleConfig(BaseModel):
+    """Multi-LLM ensemble: quorum early exit (0 = wait for every provider)"""
+    # Providers that must agree (score outside threshold ± margin, no dissent) before returning
+    quorum: int = int(os.getenv("ENSEMBLE_QUORUM", "0"))
+    quorum_margin: float = float(os.getenv("ENSEMBLE_QUORUM_MARGIN", "15"))
+    timeout_seconds: float = float(os.getenv("ENSEMBLE_TIMEOUT_SECONDS", "35"))
+
+
+class MultiAgentConfig(BaseModel):
+    """3-Agent detector: LLM client and per-agent timeout (agents run concurrently)"""
+    # "<provider>[:<model>]", e.g. clovax, gemini, gemini:gemini-2.5-flash-lite, openai
+    client: str = os.getenv("MULTI_AGENT_CLIENT", "clovax")
+    # Agents still running after this are dropped and the others' weights renormalized
+    agent_timeout_seconds: float = float(os.getenv("MULTI_AGENT_TIMEOUT_SECONDS", "20"))
+
+
+class CascadeConfig(BaseModel):
+    """
+    LLM cascade: one cheap Gemini call first, escalate only uncertain scores
+
+    Scores below ``safe_below`` or at/above ``phishing_at`` are final after the
+    first call; anything in between goes to ``escalation`` ("ensemble" or "multi_agent").
+    """
+    enabled: bool = os.getenv("CASCADE_ENABLED", "false").lower() == "true"
+    safe_below: float = float(os.getenv("CASCADE_SAFE_BELOW", "30"))
+    phishing_at: float = float(os.getenv("CASCADE_PHISHING_AT", "85"))
+    escalation: str = os.getenv("CASCADE_ESCALATION", "ensemble")
+
+
+class LLMHTTPConfig(BaseModel):
+    """LLM provider HTTP connection pool Configuration (one keep-alive pool per provider)"""
+    connect_timeout: float = float(os.getenv("LLM_CONNECT_TIMEOUT", "5"))
+    read_timeout: float = float(os.getenv("LLM_READ_TIMEOUT", "30"))
+    pool_maxsize: int = int(os.getenv("LLM_POOL_MAXSIZE", "32"))  # kept-alive connections per provider
+    pool_block: bool = os.getenv("LLM_POOL_BLOCK", "False").lower() == "true"
+    # aiohttp connections per provider host for the async clients (one event loop fans out)
+    async_pool_maxsize: int = int(os.getenv("LLM_ASYNC_POOL_MAXSIZE", "100"))
+    # Await LLM calls on the event loop (aiohttp) instead of the LLM executor threads
+    async_clients: bool = os.getenv("LLM_ASYNC_CLIENTS", "True").lower() == "true"
+
+
+class LLMLimitsConfig(BaseModel):
+    """Per-provider LLM limits, "<max concurrent>:<requests per minute>" (rpm 0 = no rate limit)"""
+    gemini: str = os.getenv("LLM_LIMIT_GEMINI", "16:600")
+    openai: str = os.getenv("LLM_LIMIT_OPENAI", "16:500")
+    deepseek: str = os.getenv("LLM_LIMIT_DEEPSEEK", "8:300")
+    perplexity: str = os.getenv("LLM_LIMIT_PERPLEXITY", "8:50")
+    clovax: str = os.getenv("LLM_LIMIT_CLOVAX", "4:60")
+    anthropic: str = os.getenv("LLM_LIMIT_ANTHROPIC", "8:50")
+    default: str = os.getenv("LLM_LIMIT_DEFAULT", "8:60")
+
+
+class LLMEndpointsConfig(BaseModel):
+    """
+    Per-provider API base URLs ("" = the provider's public endpoint)
+
+    Point them (or LLM_BASE_URL for all providers) at scripts/mock_llm_server.py
+    for offline load tests: LLM_BASE_URL=http://127.0.0.1:8090
+    """
+    gemini: str = os.getenv("LLM_BASE_URL_GEMINI", "")
+    openai: str = os.getenv("LLM_BASE_URL_OPENAI", "")
+    deepseek: str = os.getenv("LLM_BASE_URL_DEEPSEEK", "")
+    perplexity: str = os.getenv("LLM_BASE_URL_PERPLEXITY", "")
+    clovax: str = os.getenv("LLM_BASE_URL_CLOVAX", "")
+    anthropic: str = os.getenv("LLM_BASE_URL_ANTHROPIC", "")
+    default: str = os.getenv("LLM_BASE_URL", "")
+
+
+class LLMResilienceConfig(BaseModel):
+    """LLM call retries (jittered exponential backoff) and per-provider circuit breakers"""
+    retry_attempts: int = int(os.getenv("LLM_RETRY_ATTEMPTS", "3"))  # total attempts per call
+    retry_base_delay: float = float(os.getenv("LLM_RETRY_BASE_DELAY", "0.25"))
+    retry_max_delay: float = float(os.getenv("LLM_RETRY_MAX_DELAY", "4.0"))
+    breaker_failures: int = int(os.getenv("LLM_BREAKER_FAILURES", "5"))  # consecutive transient failures
+    breaker_reset_seconds: float = float(os.getenv("LLM_BREAKER_RESET_SECONDS", "30"))
+
+
+class SpeculationConfig(BaseModel):
+    """
+    Speculative second-stage verification: for texts a pre-LLM predictor expects
+    to land in the Rule 7 band (60-98), start the second-stage call together with
+    the first Gemini call; its answer is discarded if the first score falls outside
+    """
+    enabled: bool = os.getenv("SPECULATIVE_SECOND_STAGE", "false").lower() == "true"
+    # Max share of first-stage analyses (over the window) that may start a speculative call
+    budget: float = float(os.getenv("SPECULATIVE_BUDGET", "0.3"))
+    window: int = int(os.getenv("SPECULATIVE_WINDOW", "500"))
+
+
+class LLMHedgeConfig(BaseModel):
+    """
+    Hedged LLM requests: if the primary has not answered by its observed
+    latency quantile, send the same request to ``secondary`` and take the first answer
+    """
+    enabled: bool = os.getenv("LLM_HEDGE_ENABLED", "false").lower() == "true"
+    # "<provider>[:<model>]", e.g. gemini:gemini-2.5-flash-lite, openai, deepseek
+    secondary: str = os.getenv("LLM_HEDGE_SECONDARY", "gemini:gemini-2.5-flash-lite")
+    quantile: float = float(os.getenv("LLM_HEDGE_QUANTILE", "0.95"))
+    # Max share of calls that may be hedged (over the latency window)
+    budget: float = float(os.getenv("LLM_HEDGE_BUDGET", "0.05"))
+    window: int = int(os.getenv("LLM_HEDGE_WINDOW", "500"))
+    min_samples: int = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+    # Delay used until min_samples latencies were observed, and the lower bound afterwards
+    initial_delay: float = float(os.getenv("LLM_HEDGE_INITIAL_DELAY", "5.0"))
+    min_delay: float = float(os.getenv("LLM_HEDGE_MIN_DELAY", "0.25"))
+
+
+class CacheConfig(BaseModel):
+    """Response Cache Configuration"""
+    backend: str = os.getenv("CACHE_BACKEND", "memory")  # memory | sqlite
+    ttl_seconds: int = int(os.getenv("CACHE_TTL", "3600"))
+    max_entries: int = int(os.getenv("CACHE_MAX_ENTRIES", "10000"))
+    max_bytes: int = int(os.getenv("CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+    sqlite_path: str = os.getenv("CACHE_SQLITE_PATH", str(ROOT_DIR / "data" / "cache" / "response_cache.sqlite"))
+
+
+class LLMCacheConfig(BaseModel):
+    """Persistent LLM response cache shared by all clients (SQLite, content-addressed)"""
+    enabled: bool = os.getenv("LLM_CACHE_ENABLED", "True").lower() == "true"
+    path: str = os.getenv("LLM_CACHE_PATH", str(ROOT_DIR / "data" / "cache" / "llm_cache.sqlite"))
+    ttl_seconds: int = int(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600)))
+    max_entries: int = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "50000"))
+    max_bytes: int = int(os.getenv("LLM_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+
+
+class BatchConfig(BaseModel):
+    """Batch Analysis Configuration"""
+    max_items: int = int(os.getenv("BATCH_MAX_ITEMS", "500"))
+    llm_concurrency: int = int(os.getenv("BATCH_LLM_CONCURRENCY", "8"))
+    # Time budget for the whole batch; items without an LLM verdict by then are degraded
+    deadline_seconds: float = float(os.getenv("BATCH_DEADLINE_SECONDS", "60"))
+    # Transcripts packed into one Gemini request by GeminiPhishingDetector.analyze_batch (offline scoring)
+    llm_batch_size: int = int(os.getenv("BATCH_LLM_TRANSCRIPTS", "8"))
+
+
+class StreamingConfig(BaseModel):
+    """Live (WebSocket) call analysis Configuration"""
+    step_seconds: float = float(os.getenv("STREAM_STEP_SECONDS", "4"))
+    max_pending_seconds: float = float(os.getenv("STREAM_MAX_PENDING_SECONDS", "30"))
+    max_transcript_chars: int = int(os.getenv("STREAM_MAX_TRANSCRIPT_CHARS", "4000"))
+    max_encoded_bytes: int = int(os.getenv("STREAM_MAX_ENCODED_BYTES", str(4 * 1024 * 1024)))
+
+
+class JobConfig(BaseModel):
+    """Asynchronous job queue Configuration (long recordings)"""
+    db_path: str = os.getenv("JOB_DB_PATH", str(ROOT_DIR / "data" / "jobs" / "jobs.sqlite"))
+    upload_dir: str = os.getenv("JOB_UPLOAD_DIR", str(ROOT_DIR / "data" / "jobs" / "uploads"))
+    workers: int = int(os.getenv("JOB_WORKERS", "1"))  # in-process workers (0 = API only)
+    lease_seconds: float = float(os.getenv("JOB_LEASE_SECONDS", "300"))
+    max_attempts: int = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+    max_wait_seconds: float = float(os.getenv("JOB_MAX_WAIT_SECONDS", "30"))
+
+
+class WarmupConfig(BaseModel):
+    """Startup model warm-up Configuration"""
+    background: bool = os.getenv("WARMUP_BACKGROUND", "True").lower() == "true"
+    max_workers: int = int(os.getenv("WARMUP_MAX_WORKERS", "4"))
+
+
+class AdmissionConfig(BaseModel):
+    """Admission control Configuration (per-request deadline, in-flight limits per stage)"""
+    deadline_seconds: float = float(os.getenv("ADMISSION_DEADLINE_SECONDS", "10"))
+    audio_deadline_seconds: float = float(os.getenv("ADMISSION_AUDIO_DEADLINE_SECONDS", "60"))
+    max_deadline_seconds: float = float(os.getenv("ADMISSION_MAX_DEADLINE_SECONDS", "120"))
+    stt_inflight: int = int(os.getenv("ADMISSION_STT_INFLIGHT", "8"))
+    embedding_inflight: int = int(os.getenv("ADMISSION_EMBEDDING_INFLIGHT", "64"))
+    llm_inflight: int = int(os.getenv("ADMISSION_LLM_INFLIGHT", "64"))
+    # Minimum remaining budget (seconds) needed to start a stage
+    stt_min_budget: float = float(os.getenv("ADMISSION_STT_MIN_BUDGET", "2"))
+    embedding_min_budget: float = float(os.getenv("ADMISSION_EMBEDDING_MIN_BUDGET", "0.05"))
+    llm_min_budget: float = float(os.getenv("ADMISSION_LLM_MIN_BUDGET", "1"))
+
+
 class Config:
     """Main Configuration"""
     def __init__(self):
@@ -57,6 +251,24 @@ class Config:
         self.server = ServerConfig()
         self.security = SecurityConfig()
         self.risk_scoring = RiskScoringConfig()
+        self.prompt = PromptConfig()
+        self.execution = ExecutionConfig()
+        self.ensemble = EnsembleConfig()
+        self.multi_agent = MultiAgentConfig()
+        self.cascade = CascadeConfig()
+        self.llm_http = LLMHTTPConfig()
+        self.llm_limits = LLMLimitsConfig()
+        self.llm_endpoints = LLMEndpointsConfig()
+        self.llm_hedge = LLMHedgeConfig()
+        self.speculation = SpeculationConfig()
+        self.llm_resilience = LLMResilienceConfig()
+        self.cache = CacheConfig()
+        self.llm_cache = LLMCacheConfig()
+        self.batch = BatchConfig()
+        self.streaming = StreamingConfig()
+        self.jobs = JobConfig()
+        self.warmup = WarmupConfig()
+        self.admission = AdmissionConfig()
 
     @property
     def data_dir(self) -> Path:
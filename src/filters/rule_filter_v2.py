@@ -1,15 +1,25 @@
 """
 Rule-based Filter v2 - 명확한 우선순위와 로직
 """
+import asyncio
+import contextvars
 import logging
-from typing import Dict, Optional
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Tuple, Union
 import re
 
+from src.config import config
+from src.filters.speculation import (
+    NOT_PREDICTED, SPECULATIONS, SpeculationBudget, is_speculating, predict_second_stage, shared_executor
+)
+from src.monitoring import timed_llm
+
 logger = logging.getLogger(__name__)
 
 # 2차 LLM 검증용
 try:
     from src.llm.llm_clients.gemini_client import GeminiClient
+    from src.llm.llm_clients.hedged_client import with_hedging
     GEMINI_AVAILABLE = True
 except ImportError:
     GEMINI_AVAILABLE = False
@@ -54,7 +64,7 @@ class RuleBasedFilterV2:
         # 2차 LLM 초기화
         if GEMINI_AVAILABLE:
             try:
-                self.second_stage_llm = GeminiClient()
+                self.second_stage_llm = with_hedging(GeminiClient(), "gemini_second_stage")
                 logger.info("✓ 2nd stage LLM verification enabled (Gemini Flash)")
             except Exception as e:
                 self.second_stage_llm = None
@@ -62,118 +72,276 @@ class RuleBasedFilterV2:
         else:
             self.second_stage_llm = None
 
-    def filter(self, text: str, llm_score: float, llm_reasoning: str = "") -> Dict:
+        # 투기적 2차 검증 (1차 LLM 호출과 동시에 시작) 예산
+        self.speculation_budget = SpeculationBudget(config.speculation.window, config.speculation.budget)
+
+    def extract_features(self, text: str) -> Dict:
+        """
+        LLM 점수와 무관한 텍스트 기반 Rule 특징 추출
+
+        LLM 호출 전에 미리 계산해 두었다가 filter(features=...)로 재사용할 수 있음
+        """
+        text_lower = text.lower()
+        return {
+            "keyword_analysis": self._analyze_keywords(text_lower, ""),
+            "user_complaint": self._is_user_complaint(text_lower),
+            "financial_phone_scam": self._is_financial_institution_phone_scam(text_lower),
+            "debt_collection": self._is_debt_collection(text_lower),
+            "commerce_fraud": self._is_commerce_fraud(text_lower),
+            "web3_scam": self._detect_web3_scam(text_lower),
+            "ceo_fraud": self._is_ceo_fraud(text_lower),
+            "internal_instruction": self._is_internal_instruction(text_lower)
+        }
+
+    def extract_features_batch(self, texts: List[str]) -> List[Dict]:
+        """
+        여러 텍스트의 Rule 특징 계산 (LLM 호출 전에 미리)
+
+        텍스트별 정규식/키워드 검사라 배치 전체가 공유하는 계산은 없음 -
+        텍스트마다 extract_features()를 한 번씩 호출한 것과 같음
+        """
+        return [self.extract_features(text) for text in texts]
+
+    def speculate(self, text: str, features: Dict) -> Union[Future, object, None]:
+        """
+        Rule 7 2차 검증을 1차 LLM 호출 전에 시작 (예측기가 60-98점 구간을 예상하고 예산 이내일 때)
+
+        반환값을 filter(speculative=...)에 넘기면 필요할 때 그 결과를 쓰고, 아니면 버림.
+        예측기가 Rule 7이 없다고 판단하면 NOT_PREDICTED (그래도 Rule 7이 실행되면 "missed"),
+        투기 비활성/예산 초과면 None
+        """
+        admitted, refused = self._admit_speculation(features)
+        if not admitted:
+            return refused
+        SPECULATIONS.inc(outcome="started")
+        return shared_executor().submit(
+            contextvars.copy_context().run, self._second_stage_verification, text, None, None
+        )
+
+    def speculate_async(self, text: str, features: Dict) -> Union[asyncio.Task, object, None]:
+        """speculate()와 동일, 이벤트 루프의 Task로 시작 (filter_async(speculative=...))"""
+        admitted, refused = self._admit_speculation(features)
+        if not admitted:
+            return refused
+        SPECULATIONS.inc(outcome="started")
+        return asyncio.ensure_future(self._second_stage_verification_async(text, None, None))
+
+    def discard_speculation(self, speculative: Union[Future, asyncio.Task, object, None]):
+        """필요 없어진 투기적 2차 검증 취소 (이미 실행 중이면 결과 무시)"""
+        if is_speculating(speculative):
+            speculative.cancel()
+            SPECULATIONS.inc(outcome="wasted")
+
+    def _admit_speculation(self, features: Dict) -> Tuple[bool, Optional[object]]:
+        """(투기 시작 여부, 시작하지 않을 때 speculate()의 반환값: None 또는 NOT_PREDICTED)"""
+        if not config.speculation.enabled or self.second_stage_llm is None:
+            return False, None
+        wanted = predict_second_stage(features)
+        if self.speculation_budget.admit(wanted):
+            return True, None
+        return False, (None if wanted else NOT_PREDICTED)
+
+    def filter(self, text: str, llm_score: float, llm_reasoning: str = "",
+               features: Optional[Dict] = None, allow_second_stage: bool = True,
+               speculative: Union[Future, object, None] = None) -> Dict:
         """
         LLM 판정 결과를 Rule 기반으로 2차 검증
 
+        Args:
+            text: 통화 내용
+            llm_score: 1차 LLM 점수
+            llm_reasoning: 1차 LLM 판정 이유
+            features: extract_features() 결과 (없으면 여기서 계산)
+            allow_second_stage: False면 Rule 7 (2차 LLM 검증) 생략 (degrade 모드)
+            speculative: speculate() 결과 (미리 시작한 2차 검증은 Rule 7이 필요 없으면 버림)
+
         Returns:
             {
                 "final_score": 최종 점수,
                 "risk_level": 위험도,
                 "reason": 필터 적용 이유,
                 "filter_applied": 필터 적용 여부,
+                "rule": 판정을 결정한 규칙 (예: "rule1_financial_phone_scam", "passed"),
                 "keyword_analysis": {...}
             }
         """
         self.stats["total_filtered"] += 1
-        text_lower = text.lower()
 
-        # 키워드 분석 (모든 규칙에서 사용)
-        keyword_analysis = self._analyze_keywords(text_lower, llm_reasoning.lower())
+        # 텍스트 기반 특징 (키워드 분석은 모든 규칙에서 사용)
+        if features is None:
+            features = self.extract_features(text)
+
+        response = self._apply_text_rules(llm_score, features)
+        if response is not None:
+            self.discard_speculation(speculative)
+            return response
+
+        # ===== Rule 7: 2차 LLM 검증 (60-98점 애매한 케이스) =====
+        if self._needs_second_stage(llm_score, allow_second_stage):
+            if is_speculating(speculative):
+                SPECULATIONS.inc(outcome="used")
+                second_check = speculative.result()
+            else:
+                self._record_missed_speculation(speculative)
+                second_check = self._second_stage_verification(text, llm_score, llm_reasoning)
+            response = self._second_stage_response(second_check, llm_score, features["keyword_analysis"])
+            if response is not None:
+                return response
+        else:
+            self.discard_speculation(speculative)
+
+        return self._apply_score_rules(text, llm_score, llm_reasoning, features["keyword_analysis"])
+
+    async def filter_async(self, text: str, llm_score: float, llm_reasoning: str = "",
+                           features: Optional[Dict] = None, allow_second_stage: bool = True,
+                           speculative: Union[asyncio.Task, object, None] = None) -> Dict:
+        """filter()와 동일, Rule 7 (2차 LLM 검증)을 이벤트 루프에서 비동기로 호출"""
+        self.stats["total_filtered"] += 1
+
+        if features is None:
+            features = self.extract_features(text)
+
+        response = self._apply_text_rules(llm_score, features)
+        if response is not None:
+            self.discard_speculation(speculative)
+            return response
+
+        if self._needs_second_stage(llm_score, allow_second_stage):
+            if is_speculating(speculative):
+                SPECULATIONS.inc(outcome="used")
+                second_check = await speculative
+            else:
+                self._record_missed_speculation(speculative)
+                second_check = await self._second_stage_verification_async(text, llm_score, llm_reasoning)
+            response = self._second_stage_response(second_check, llm_score, features["keyword_analysis"])
+            if response is not None:
+                return response
+        else:
+            self.discard_speculation(speculative)
+
+        return self._apply_score_rules(text, llm_score, llm_reasoning, features["keyword_analysis"])
+
+    def _apply_text_rules(self, llm_score: float, features: Dict) -> Optional[Dict]:
+        """Rule 0-6: 텍스트 특징으로 결정되는 규칙 (2차 LLM 호출 전)"""
+        keyword_analysis = features["keyword_analysis"]
 
         # ===== Rule 0: 사용자 항의/민원 (최우선 정상 판정) =====
-        if self._is_user_complaint(text_lower):
+        if features["user_complaint"]:
             self.stats["rule0_user_complaint"] += 1
             return self._make_response(
                 score=20,
                 reason="사용자가 항의/민원을 제기하는 상황 (피싱 피해자 아님)",
                 filter_applied=True,
                 original_score=llm_score,
-                keyword_analysis=keyword_analysis
+                keyword_analysis=keyword_analysis,
+                rule="rule0_user_complaint"
             )
 
         # ===== Rule 1: 금융/공공기관의 전화 개인정보 요구 → 피싱 확정 =====
-        if self._is_financial_institution_phone_scam(text_lower):
+        if features["financial_phone_scam"]:
             self.stats["rule1_financial_phone_scam"] += 1
             return self._make_response(
                 score=max(95, llm_score),  # 최소 95점 보장
                 reason="금융/공공기관이 전화로 개인정보/인증서/앱 설치를 요구함 (실제 기관은 전화로 요구하지 않음)",
                 filter_applied=True,
                 original_score=llm_score,
-                keyword_analysis=keyword_analysis
+                keyword_analysis=keyword_analysis,
+                rule="rule1_financial_phone_scam"
             )
 
         # ===== Rule 2: 채권 추심 → 중위험 =====
-        if self._is_debt_collection(text_lower):
+        if features["debt_collection"]:
             self.stats["rule2_debt_collection"] += 1
             return self._make_response(
                 score=50,
                 reason="불법 채권 추심으로 판단 (피싱은 아니지만 경고 필요)",
                 filter_applied=True,
                 original_score=llm_score,
-                keyword_analysis=keyword_analysis
+                keyword_analysis=keyword_analysis,
+                rule="rule2_debt_collection"
             )
 
         # ===== Rule 3: 중고거래 사기 → 중위험 =====
-        if self._is_commerce_fraud(text_lower):
+        if features["commerce_fraud"]:
             self.stats["rule3_commerce_fraud"] += 1
             return self._make_response(
                 score=50,
                 reason="중고거래 사기 패턴 감지 (안전결제 거부)",
                 filter_applied=True,
                 original_score=llm_score,
-                keyword_analysis=keyword_analysis
+                keyword_analysis=keyword_analysis,
+                rule="rule3_commerce_fraud"
             )
 
         # ===== Rule 4: Web3 스캠 → 고위험 유지 =====
-        web3_risk = self._detect_web3_scam(text_lower)
-        if web3_risk:
+        if features["web3_scam"]:
             self.stats["rule4_web3_scam"] += 1
             return self._make_response(
                 score=max(85, llm_score),
                 reason="Web3/암호화폐 스캠 패턴 감지 (지갑 연결/트랜잭션 서명 요구)",
                 filter_applied=True,
                 original_score=llm_score,
-                keyword_analysis=keyword_analysis
+                keyword_analysis=keyword_analysis,
+                rule="rule4_web3_scam"
             )
 
         # ===== Rule 5: CEO Fraud 체크 (개인 계좌 = 피싱 유지) =====
         # 내부 업무 패턴이지만 개인 계좌 송금은 제외
-        if self._is_ceo_fraud(text_lower):
+        if features["ceo_fraud"]:
             self.stats["rule5_ceo_fraud"] += 1
             # CEO Fraud는 LLM 점수 유지 (필터로 격하하지 않음)
             logger.info(f"Rule 4: CEO Fraud detected - maintaining LLM score {llm_score}")
             # 다음 규칙으로 넘어가도록 아무것도 반환하지 않음
 
         # ===== Rule 6: 내부 업무 지시 (헤드헌터 제외) → 중위험 =====
-        if self._is_internal_instruction(text_lower) and 70 <= llm_score <= 95:
+        if features["internal_instruction"] and 70 <= llm_score <= 95:
             # CEO Fraud가 아닌 경우에만 적용
-            if not self._is_ceo_fraud(text_lower):
+            if not features["ceo_fraud"]:
                 self.stats["rule6_headhunter"] += 1
                 return self._make_response(
                     score=50,
                     reason="내부 업무 지시 패턴 (CEO Fraud 가능성 있으나 정상 업무일 수도 있음)",
                     filter_applied=True,
                     original_score=llm_score,
-                    keyword_analysis=keyword_analysis
+                    keyword_analysis=keyword_analysis,
+                    rule="rule6_headhunter"
                 )
 
-        # ===== Rule 7: 2차 LLM 검증 (60-98점 애매한 케이스) =====
-        if 60 <= llm_score <= 98 and self.second_stage_llm:
-            second_check = self._second_stage_verification(text, llm_score, llm_reasoning)
-            if second_check["is_safe"]:
-                self.stats["rule7_second_stage"] += 1
-                logger.info(
-                    f"Rule 7: 2차 LLM 검증 완료 - 정상 판정 "
-                    f"(원점수:{llm_score})"
-                )
-                return self._make_response(
-                    score=20,
-                    reason=f"2차 LLM 검증: {second_check['reasoning']}",
-                    filter_applied=True,
-                    original_score=llm_score,
-                    keyword_analysis=keyword_analysis
-                )
+        return None
+
+    def _needs_second_stage(self, llm_score: float, allow_second_stage: bool) -> bool:
+        return 60 <= llm_score <= 98 and self.second_stage_llm is not None and allow_second_stage
+
+    @staticmethod
+    def _record_missed_speculation(speculative):
+        """Rule 7이 투기 없이 실행됨: 예측기가 아니라고 했을 때만 "missed" (예산 초과는 budget_denied)"""
+        if speculative is NOT_PREDICTED:
+            SPECULATIONS.inc(outcome="missed")
+
+    def _second_stage_response(self, second_check: Dict, llm_score: float,
+                               keyword_analysis: Dict) -> Optional[Dict]:
+        """Rule 7: 2차 LLM이 정상으로 판정하면 20점"""
+        if not second_check["is_safe"]:
+            return None
+
+        self.stats["rule7_second_stage"] += 1
+        logger.info(
+            f"Rule 7: 2차 LLM 검증 완료 - 정상 판정 "
+            f"(원점수:{llm_score})"
+        )
+        return self._make_response(
+            score=20,
+            reason=f"2차 LLM 검증: {second_check['reasoning']}",
+            filter_applied=True,
+            original_score=llm_score,
+            keyword_analysis=keyword_analysis,
+            rule="rule7_second_stage"
+        )
+
+    def _apply_score_rules(self, text: str, llm_score: float, llm_reasoning: str,
+                           keyword_analysis: Dict) -> Dict:
+        """Rule 8-10 및 통과: LLM 점수/판정 이유와 키워드를 함께 보는 규칙"""
+        text_lower = text.lower()
 
         # ===== Rule 8: 원격 제어 + 정상 서비스 패턴 =====
         if self._is_remote_legit_service(text_lower, llm_reasoning.lower(), llm_score, keyword_analysis):
@@ -183,7 +351,8 @@ class RuleBasedFilterV2:
                 reason="원격 지원 요청이지만 정상 서비스로 판단됨 (예약된 일정, 공식 채널)",
                 filter_applied=True,
                 original_score=llm_score,
-                keyword_analysis=keyword_analysis
+                keyword_analysis=keyword_analysis,
+                rule="rule8_remote_legit"
             )
 
         # ===== Rule 9: 낮은 점수 + 고위험 키워드 많음 → 상향 =====
@@ -194,7 +363,8 @@ class RuleBasedFilterV2:
                 reason="LLM 점수는 낮지만 다수의 피싱 키워드 감지됨",
                 filter_applied=True,
                 original_score=llm_score,
-                keyword_analysis=keyword_analysis
+                keyword_analysis=keyword_analysis,
+                rule="rule9_keyword_upgrade"
             )
 
         # ===== Rule 10: 긴급성 + 금융 키워드 → 상향 =====
@@ -208,7 +378,8 @@ class RuleBasedFilterV2:
                 reason="긴급성 압박 + 금융/수사 키워드 조합 (전형적 피싱 패턴)",
                 filter_applied=True,
                 original_score=llm_score,
-                keyword_analysis=keyword_analysis
+                keyword_analysis=keyword_analysis,
+                rule="rule10_urgency_upgrade"
             )
 
         # ===== Rule 통과: LLM 판정 유지 =====
@@ -218,7 +389,8 @@ class RuleBasedFilterV2:
             reason="Rule filter passed - LLM 판정 유지",
             filter_applied=False,
             original_score=llm_score,
-            keyword_analysis=keyword_analysis
+            keyword_analysis=keyword_analysis,
+            rule="passed"
         )
 
     # ========== 개별 패턴 감지 함수 ==========
@@ -404,16 +576,52 @@ class RuleBasedFilterV2:
             "urgency": urgency_count
         }
 
-    def _second_stage_verification(self, text: str, first_score: float, first_reasoning: str) -> Dict:
-        """2차 LLM 검증"""
+    def _second_stage_verification(self, text: str, first_score: Optional[float],
+                                   first_reasoning: Optional[str]) -> Dict:
+        """2차 LLM 검증 (first_score가 None이면 1차 결과 없이 시작한 투기적 검증)"""
         if not self.second_stage_llm:
             return {"is_safe": False, "reasoning": "2nd stage LLM not available"}
 
-        verification_prompt = f"""당신은 보이스피싱 2차 검증 전문가입니다.
+        try:
+            with timed_llm("gemini_second_stage") as call:
+                result = call.check(self.second_stage_llm.analyze_phishing(
+                    text, self._verification_prompt(first_score, first_reasoning)
+                ))
+            return self._second_stage_result(result, first_score)
+
+        except Exception as e:
+            logger.error(f"2nd stage verification failed: {e}")
+            return {"is_safe": False, "reasoning": f"Error: {str(e)}"}
+
+    async def _second_stage_verification_async(self, text: str, first_score: Optional[float],
+                                               first_reasoning: Optional[str]) -> Dict:
+        """2차 LLM 검증 (비동기 HTTP)"""
+        if not self.second_stage_llm:
+            return {"is_safe": False, "reasoning": "2nd stage LLM not available"}
+
+        try:
+            with timed_llm("gemini_second_stage") as call:
+                result = call.check(await self.second_stage_llm.analyze_phishing_async(
+                    text, self._verification_prompt(first_score, first_reasoning)
+                ))
+            return self._second_stage_result(result, first_score)
+
+        except Exception as e:
+            logger.error(f"2nd stage verification failed: {e}")
+            return {"is_safe": False, "reasoning": f"Error: {str(e)}"}
+
+    def _verification_prompt(self, first_score: Optional[float], first_reasoning: Optional[str]) -> str:
+        """2차 검증 프롬프트 (투기적 검증은 1차 결과 전에 보내므로 1차 점수/이유 없이)"""
+        if first_score is None:
+            background = "- 1차 AI 판정: 피싱 의심 구간 (60-98점) 예상, 1차 판정과 동시에 재검증"
+            phishing_score = "70-100"
+        else:
+            background = f"- 1차 AI 판정: {first_score}점 (피싱 의심)\n- 1차 판정 이유: {first_reasoning}"
+            phishing_score = first_score
+        return f"""당신은 보이스피싱 2차 검증 전문가입니다.
 
 **배경**:
-- 1차 AI 판정: {first_score}점 (피싱 의심)
-- 1차 판정 이유: {first_reasoning}
+{background}
 
 **재검증 임무**: 3단계 체계적 분석을 수행하세요.
 
@@ -453,36 +661,37 @@ class RuleBasedFilterV2:
 
 **핵심 로직**:
 - 예외 해당 ✅ + 함정 없음 ✅ → 정상 (score: 0-30, is_phishing: false)
-- 예외 해당 ✅ + 함정 있음 ❌ → 피싱 (score: {first_score}, is_phishing: true)
-- 예외 해당 없음 ❌ → 피싱 (score: {first_score}, is_phishing: true)"""
+- 예외 해당 ✅ + 함정 있음 ❌ → 피싱 (score: {phishing_score}, is_phishing: true)
+- 예외 해당 없음 ❌ → 피싱 (score: {phishing_score}, is_phishing: true)"""
 
-        try:
-            result = self.second_stage_llm.analyze_phishing(text, verification_prompt)
-            is_phishing = result.get("is_phishing", True)
-            second_score = result.get("score", first_score)
-            reasoning_text = result.get("reasoning", "2차 검증 완료")
+    def _second_stage_result(self, result: Dict, first_score: Optional[float]) -> Dict:
+        """2차 LLM 응답 → 정상 여부"""
+        if "error" in result:
+            # 호출 실패의 placeholder 점수로 하향 조정하지 않음
+            return {"is_safe": False, "reasoning": f"2nd stage LLM unavailable: {result['error']}"}
 
-            is_safe = not is_phishing or second_score <= 30
+        is_phishing = result.get("is_phishing", True)
+        second_score = result.get("score", 100 if first_score is None else first_score)
+        reasoning_text = result.get("reasoning", "2차 검증 완료")
 
-            return {
-                "is_safe": is_safe,
-                "reasoning": reasoning_text,
-                "second_score": second_score
-            }
+        is_safe = not is_phishing or second_score <= 30
 
-        except Exception as e:
-            logger.error(f"2nd stage verification failed: {e}")
-            return {"is_safe": False, "reasoning": f"Error: {str(e)}"}
+        return {
+            "is_safe": is_safe,
+            "reasoning": reasoning_text,
+            "second_score": second_score
+        }
 
     def _make_response(self, score: float, reason: str, filter_applied: bool,
-                      original_score: float, keyword_analysis: Dict) -> Dict:
-        """응답 생성"""
+                      original_score: float, keyword_analysis: Dict, rule: str = "passed") -> Dict:
+        """응답 생성 (rule: 판정을 결정한 규칙, stats 키와 동일)"""
         risk_level = self._get_risk_level(score)
         return {
             "final_score": score,
             "risk_level": risk_level,
             "reason": reason,
             "filter_applied": filter_applied,
+            "rule": rule,
             "original_score": original_score,
             "keyword_analysis": keyword_analysis,
             "detected_techniques": []
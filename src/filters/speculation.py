@@ -0,0 +1,106 @@
+"""
+Speculative second-stage verification (Rule 7)
+
+Rule 7 re-checks first-stage Gemini scores of 60-98 with a second LLM call,
+so those cases pay two round trips in series. With
+``SPECULATIVE_SECOND_STAGE=true`` a cheap predictor looks at the rule
+features before the first call (``predict_second_stage``). Texts it expects
+to land in the band start the second-stage call at the same time as the
+first one. If the first score lands outside the band, the speculative
+answer is discarded.
+
+Speculative calls are capped at ``SPECULATIVE_BUDGET`` of the analyses in
+the last ``SPECULATIVE_WINDOW``. Outcomes are exported as
+``sentinel_speculative_second_stage_total``:
+
+- ``used``: the speculation saved a round trip
+- ``wasted``: the second stage was not needed
+- ``missed``: the second stage ran although the predictor said it would not
+- ``budget_denied``: predicted, but over the budget
+"""
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+
+from src.config import config
+from src.monitoring import REGISTRY, Counter
+
+SPECULATIONS = REGISTRY.register(Counter(
+    "sentinel_speculative_second_stage_total",
+    "Speculative second-stage LLM calls by outcome (started, used, wasted, missed, budget_denied)",
+    ["outcome"]
+))
+
+# speculate() result when the predictor expected no Rule 7 (a Rule 7 run after it is "missed")
+NOT_PREDICTED = object()
+
+# Text rules that decide the verdict before Rule 7 whatever the first score is
+DECISIVE_FEATURES = ("user_complaint", "financial_phone_scam", "debt_collection", "commerce_fraud", "web3_scam")
+
+# Runs the blocking speculative calls (created lazily, so forked workers get their own)
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def shared_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=config.execution.llm_workers,
+                                               thread_name_prefix="speculation")
+    return _executor
+
+
+def is_speculating(speculative) -> bool:
+    """Is ``speculative`` (a speculate() result) a running second-stage call?"""
+    return speculative is not None and speculative is not NOT_PREDICTED
+
+
+def predict_second_stage(features: Dict) -> bool:
+    """
+    Will Rule 7 run for this text? (RuleBasedFilterV2.extract_features, before any LLM call)
+
+    No crime keyword → the first score is usually below 60. Many crime keywords
+    plus urgency → usually 99+. Mixed signals in between are the mid-band cases.
+    """
+    if any(features.get(name) for name in DECISIVE_FEATURES):
+        return False
+    keywords = features["keyword_analysis"]
+    if keywords["crime"] == 0:
+        return False
+    return not (keywords["crime"] >= 4 and keywords["urgency"] >= 1 and keywords["legit"] == 0)
+
+
+class SpeculationBudget:
+    """
+    Rolling share of analyses that started a speculative call
+
+    Args:
+        window: Number of recent analyses the budget is measured over
+        budget: Max share of them that may speculate (``budget × window`` calls)
+    """
+
+    def __init__(self, window: int = 500, budget: float = 0.3):
+        self.budget = budget
+        self._calls = deque(maxlen=window)  # True for analyses that speculated
+        self._speculated = 0
+        self._lock = threading.Lock()
+
+    def admit(self, wanted: bool) -> bool:
+        """Record one analysis; True if it may speculate (``wanted`` and within the budget)"""
+        with self._lock:
+            # budget × window speculative calls per window (a cold start may speculate right away)
+            allowed = wanted and self._speculated + 1 <= self.budget * self._calls.maxlen
+            if len(self._calls) == self._calls.maxlen and self._calls[0]:
+                self._speculated -= 1
+            self._calls.append(allowed)
+            self._speculated += allowed
+        if wanted and not allowed:
+            SPECULATIONS.inc(outcome="budget_denied")
+        return allowed
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {"window_calls": len(self._calls), "window_speculated": self._speculated, "budget": self.budget}
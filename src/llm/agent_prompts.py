@@ -0,0 +1,119 @@
+"""
+Multi-agent prompting modes (context / psychological / financial)
+
+"separate": one LLM call per agent (3 calls, the transcript sent 3 times)
+"combined": one structured-JSON call per model that returns every agent's
+            verdict under its name; split back into per-agent results so the
+            agent_weights combination is unchanged. The call gets a larger
+            output-token limit (three reasonings) and its answer is cached only
+            if every agent has a score (``combined_call_options``)
+"""
+import logging
+from typing import Dict, Iterable, List, Optional
+
+from src.llm.llm_clients.base_client import split_usage
+from src.llm.llm_clients.errors import LLMPermanentError
+
+logger = logging.getLogger(__name__)
+
+AGENTS = ("context", "psychological", "financial")
+AGENT_MODES = ("separate", "combined")
+COMBINED_AGENT = "combined"
+
+RESPONSE_MARKER = "**응답 (JSON):**"
+
+# Three agents' reasonings in Korean do not fit the clients' default 800 output tokens
+COMBINED_MAX_OUTPUT_TOKENS = 2048
+
+COMBINED_HEADER = """당신은 보이스피싱 분석팀입니다. 아래 {count}개 분석을 같은 통화에 대해 **각각 독립적으로** 수행하세요.
+각 분석은 자기 기준으로만 점수를 매기고, 다른 분석의 결론에 영향을 받지 마세요.
+
+"""
+
+
+def check_agent_mode(agent_mode: str) -> str:
+    if agent_mode not in AGENT_MODES:
+        raise ValueError(f"Unknown agent mode '{agent_mode}' (choose from {list(AGENT_MODES)})")
+    return agent_mode
+
+
+def combine_agent_prompts(prompts: Dict[str, str], transcript_block: Optional[str] = None) -> str:
+    """
+    Separate agent prompts → one prompt asking for ``{"<agent>": {...}, ...}``
+
+    Each agent keeps its own instructions and response fields (the part after
+    ``**응답 (JSON):**``), so a combined answer parses like the separate ones.
+
+    Args:
+        prompts: {agent name: prompt} in output order
+        transcript_block: Transcript text embedded in the prompts, removed so the
+            transcript is sent once (by the client) instead of once per agent
+    """
+    sections, fields = [], []
+    for i, (agent, prompt) in enumerate(prompts.items(), 1):
+        body, _, response = prompt.partition(RESPONSE_MARKER)
+        if transcript_block:
+            body = body.replace(transcript_block, "")
+        schema = response.strip()
+        if schema.endswith("JSON:"):
+            schema = schema[:-len("JSON:")].rstrip()
+        sections.append(f"### 분석 {i}: \"{agent}\"\n\n{body.strip()}")
+        fields.append(f'  "{agent}": ' + schema.replace("\n", "\n  "))
+
+    return (
+        COMBINED_HEADER.format(count=len(prompts))
+        + "\n\n".join(sections)
+        + f"\n\n**응답 (JSON, {len(prompts)}개 분석 모두 포함):**\n{{\n"
+        + ",\n".join(fields)
+        + "\n}\n\nJSON:"
+    )
+
+
+def _has_score(item) -> bool:
+    return isinstance(item, dict) and isinstance(item.get("score"), (int, float))
+
+
+def combined_answer_complete(result: Dict, agents: Iterable[str] = AGENTS) -> bool:
+    """Every agent's verdict is in the answer (a truncated or partial answer must not be cached)"""
+    return all(_has_score(result.get(agent)) for agent in agents)
+
+
+def combined_call_options(agents: Iterable[str] = AGENTS) -> Dict:
+    """``analyze_phishing`` keyword arguments for a combined call"""
+    agents = tuple(agents)
+    return {
+        "max_output_tokens": COMBINED_MAX_OUTPUT_TOKENS,
+        "validate": lambda result: combined_answer_complete(result, agents)
+    }
+
+
+def split_combined_result(result: Dict, agents: Iterable[str] = AGENTS) -> Dict[str, Dict]:
+    """
+    One combined answer → {agent: result shaped like a separate call}
+
+    The call's token usage is split across the agents (shares add up to the
+    total). An agent missing from the answer gets an error response, like a
+    failed separate call.
+    """
+    agents = list(agents)
+    shares: List[Optional[Dict[str, int]]] = (
+        split_usage(result["usage"], len(agents)) if result.get("usage") else [None] * len(agents)
+    )
+    split = {}
+    for agent, usage in zip(agents, shares):
+        item = result.get(agent)
+        if _has_score(item):
+            item = dict(item)
+        else:
+            logger.warning(f"Combined agent response has no '{agent}' verdict")
+            error = f"combined response missing '{agent}'"
+            item = {"score": 50, "reasoning": f"Error: {error}", "error": error,
+                    "error_type": LLMPermanentError.kind}
+        item["model"] = result.get("model")
+        item["agent_mode"] = COMBINED_AGENT
+        if result.get("cached"):
+            item["cached"] = True
+        if usage:
+            item["usage"] = usage
+        split[agent] = item
+    return split
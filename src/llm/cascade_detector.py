@@ -0,0 +1,206 @@
+"""
+Cost/latency-aware LLM cascade
+1단계: Gemini 단일 호출 + Rule Filter (2차 LLM 검증 없이)
+2단계: 점수가 불확실 구간에 있을 때만 3-Agent 분석으로 확대
+       (MultiLLMEnsemble 또는 MultiAgentPhishingDetector)
+
+명백한 검찰 사칭 / 명백한 정상 통화는 1회 호출로 끝나고,
+애매한 통화만 비싼 다중 호출 분석을 거친다.
+"""
+import asyncio
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from src.config import config
+
+logger = logging.getLogger(__name__)
+
+
+class CascadeDetector:
+    """
+    Gemini 1차 판정 → 불확실 구간만 확대 분석
+
+    Args:
+        first_stage: GeminiPhishingDetector (1회 호출)
+        escalation: MultiLLMEnsemble 또는 MultiAgentPhishingDetector (3-Agent)
+        safe_below: 이 점수 미만이면 1차 결과로 정상 확정
+        phishing_at: 이 점수 이상이면 1차 결과로 피싱 확정
+    """
+
+    def __init__(
+        self,
+        first_stage=None,
+        escalation=None,
+        safe_below: Optional[float] = None,
+        phishing_at: Optional[float] = None
+    ):
+        if first_stage is None:
+            from src.llm.gemini_detector import GeminiPhishingDetector
+            first_stage = GeminiPhishingDetector()
+        if escalation is None:
+            escalation = self._default_escalation(config.cascade.escalation)
+
+        self.first_stage = first_stage
+        self.escalation = escalation
+        self.safe_below = config.cascade.safe_below if safe_below is None else safe_below
+        self.phishing_at = config.cascade.phishing_at if phishing_at is None else phishing_at
+
+        if self.safe_below > self.phishing_at:
+            raise ValueError(
+                f"CASCADE_SAFE_BELOW ({self.safe_below}) must not exceed CASCADE_PHISHING_AT ({self.phishing_at})"
+            )
+
+        logger.info(
+            f"✓ LLM cascade: Gemini first, {type(self.escalation).__name__ if self.escalation else 'no escalation'} "
+            f"for scores in [{self.safe_below:g}, {self.phishing_at:g})"
+        )
+
+    @staticmethod
+    def _default_escalation(kind: str):
+        if kind == "multi_agent":
+            from src.llm.multi_agent_detector import MultiAgentPhishingDetector
+            return MultiAgentPhishingDetector()
+        if kind != "ensemble":
+            raise ValueError(f"Unknown CASCADE_ESCALATION: {kind} (ensemble | multi_agent)")
+        from src.llm.multi_llm_ensemble import MultiLLMEnsemble
+        return MultiLLMEnsemble()
+
+    def is_available(self) -> bool:
+        return self.first_stage.is_available()
+
+    def band(self, score: float) -> str:
+        """1차 점수 구간: "safe" | "phishing" | "uncertain" """
+        if score < self.safe_below:
+            return "safe"
+        if score >= self.phishing_at:
+            return "phishing"
+        return "uncertain"
+
+    def analyze(
+        self,
+        conversation_text: str,
+        similar_cases: Optional[List[Tuple[str, float, Dict]]] = None
+    ) -> Dict:
+        """
+        MultiLLMEnsemble.analyze()와 같은 형식의 결과 + "cascade" 정보
+
+        Returns:
+            {..., "cascade": {"stage", "band", "first_score", "escalated_to", "llm_calls"}}
+            1차 호출이 실패했고 확대 분석도 답하지 못하면 error/error_type 포함 (50점은 판정이 아님)
+        """
+        first = self._first_stage(conversation_text, self.first_stage.query_llm(conversation_text))
+        if not self._should_escalate(first):
+            return self._first_stage_result(first)
+
+        escalated = self.escalation.analyze(conversation_text, similar_cases)
+        return self._escalated_result(first, escalated)
+
+    async def analyze_async(
+        self,
+        conversation_text: str,
+        similar_cases: Optional[List[Tuple[str, float, Dict]]] = None
+    ) -> Dict:
+        """analyze()와 동일 (Gemini는 비동기 HTTP, 비동기 API가 없는 확대 분석은 스레드에서 실행)"""
+        first = self._first_stage(conversation_text, await self.first_stage.query_llm_async(conversation_text))
+        if not self._should_escalate(first):
+            return self._first_stage_result(first)
+
+        if hasattr(self.escalation, "analyze_async"):
+            escalated = await self.escalation.analyze_async(conversation_text, similar_cases)
+        else:
+            escalated = await asyncio.to_thread(self.escalation.analyze, conversation_text, similar_cases)
+        return self._escalated_result(first, escalated)
+
+    def _first_stage(self, text: str, gemini_result: Dict) -> Dict:
+        """Gemini 결과 → Rule Filter 적용 (호출 실패는 Rule Filter 없이 에러 그대로)"""
+        if "error" in gemini_result:
+            return self.first_stage._llm_failed(gemini_result)
+        return self.first_stage.finalize(text, gemini_result, allow_second_stage=False)
+
+    def _should_escalate(self, first: Dict) -> bool:
+        if "error" in first:
+            # 1차 호출 실패(중립 50점)는 밴드와 무관하게 확정할 수 없으므로 확대
+            logger.warning(f"Cascade first stage failed ({first.get('error_type')}: {first['error']}), escalating")
+        elif self.band(first["score"]) != "uncertain":
+            return False
+        if self.escalation is None or not self.escalation.is_available():
+            logger.warning("Cascade escalation unavailable, keeping first-stage result")
+            return False
+        return True
+
+    def _first_stage_result(self, first: Dict, llm_calls: int = 1) -> Dict:
+        if "error" in first:
+            return self._failed_result(first, escalated_to=None, llm_calls=llm_calls)
+        score = first["score"]
+        logger.info(f"✓ Cascade decided at first stage: {score}/100 ({self.band(score)})")
+        return {
+            "risk_score": score,
+            "is_phishing": first["is_phishing"],
+            "confidence": 80,
+            "llm_scores": {"Gemini": score},
+            "reasoning": first.get("reasoning", ""),
+            "recommendation": _recommendation(score),
+            "techniques": first.get("key_points", []),
+            "red_flags": [],
+            "rule": first.get("rule"),
+            "cascade": self._info("first", first, escalated_to=None, llm_calls=llm_calls)
+        }
+
+    def _failed_result(self, first: Dict, escalated_to: Optional[str], llm_calls: int) -> Dict:
+        """1차 실패 + 확대 분석 없음/실패: 에러 결과 (호출자가 Rule 기반 판정으로 대체)"""
+        logger.warning(f"✗ Cascade failed: {first['error']}")
+        return {
+            "risk_score": 50,
+            "is_phishing": False,
+            "confidence": 0,
+            "llm_scores": {},
+            "reasoning": f"Error: {first['error']}",
+            "recommendation": "LLM 분석에 실패했습니다.",
+            "techniques": [],
+            "red_flags": [],
+            "error": first["error"],
+            "error_type": first.get("error_type", "permanent"),
+            "cascade": self._info("failed", first, escalated_to=escalated_to, llm_calls=llm_calls)
+        }
+
+    def _escalated_result(self, first: Dict, escalated: Dict) -> Dict:
+        name = type(self.escalation).__name__
+        # 두 탐지기 모두 llm_calls 기록 (combined 모드는 모델당 1회)
+        calls = 1 + escalated.get("llm_calls", 3)
+        if "error" in escalated:
+            # 확대 분석 실패(중립 50점)는 판정이 아님: 1차 판정 유지, 1차도 실패면 에러
+            logger.warning(
+                f"Cascade escalation to {name} failed ({escalated.get('error_type')}: {escalated['error']})"
+            )
+            result = self._first_stage_result(first, llm_calls=calls)
+            result["cascade"].update(escalated_to=name, escalation_error=escalated["error"])
+            return result
+        logger.info(
+            f"✓ Cascade escalated to {name}: {first['score']} → {escalated.get('risk_score')}/100 ({calls} calls)"
+        )
+        result = dict(escalated)
+        result["llm_scores"] = {"Gemini (1st)": first["score"], **escalated.get("llm_scores", {})}
+        result["cascade"] = self._info("escalated", first, escalated_to=name, llm_calls=calls)
+        return result
+
+    def _info(self, stage: str, first: Dict, escalated_to: Optional[str], llm_calls: int) -> Dict:
+        return {
+            "stage": stage,
+            "band": self.band(first["score"]),
+            "first_score": first["score"],
+            "first_rule": first.get("rule"),
+            "escalated_to": escalated_to,
+            "llm_calls": llm_calls,
+            "bands": {"safe_below": self.safe_below, "phishing_at": self.phishing_at}
+        }
+
+
+def _recommendation(score: float) -> str:
+    """multi_agent_detector와 동일한 안내 문구"""
+    if score >= 90:
+        return "⚠️ 매우 높은 위험! 즉시 통화를 종료하고 112에 신고하세요!"
+    elif score >= 70:
+        return "⚠️ 보이스피싱 의심! 개인정보나 금전 제공을 절대 하지 마세요."
+    elif score >= 50:
+        return "⚠️ 의심스러운 통화입니다. 상대방의 신원을 직접 확인하세요."
+    return "정상 통화로 판단되지만, 항상 주의하세요."
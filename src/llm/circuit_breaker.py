@@ -0,0 +1,141 @@
+"""
+Per-provider circuit breakers for LLM calls
+
+After ``LLM_BREAKER_FAILURES`` consecutive transient failures (timeouts,
+connection errors, 429/5xx) a provider's breaker opens and calls fail
+immediately with ``CircuitOpenError`` instead of waiting out timeouts. After
+``LLM_BREAKER_RESET_SECONDS`` one trial call is let through (half-open): a
+success closes the breaker, a failure opens it again.
+
+Like the rate limiters, one breaker per provider model (``gemini:gemini-2.5-flash``;
+just the provider for fixed-model clients) is shared by every client in the
+process, so a hedge to another model of the same provider has its own breaker.
+"""
+import logging
+import threading
+import time
+from typing import Callable, Dict
+
+from src.config import config
+from src.monitoring import REGISTRY, CallbackGauge, Counter
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+BREAKER_TRANSITIONS = REGISTRY.register(Counter(
+    "sentinel_llm_circuit_transitions_total",
+    "LLM circuit breaker state changes",
+    ["provider", "state"]
+))
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker (closed → open → half-open → closed)"""
+
+    def __init__(self, provider: str, failure_threshold: int = 5, reset_seconds: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.provider = provider
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_seconds = reset_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self.rejected = 0
+
+    def allow(self) -> bool:
+        """May a call be sent now? (half-open lets exactly one trial through)"""
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            if self._state == OPEN and self._clock() - self._opened_at >= self.reset_seconds:
+                self._transition(HALF_OPEN)
+            if self._state == HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._trial_in_flight = False
+            if self._state != CLOSED:
+                self._transition(CLOSED)
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                self._opened_at = self._clock()
+                if self._state != OPEN:
+                    self._transition(OPEN)
+
+    def release(self):
+        """The call ended without a provider verdict either way (e.g. cancelled, 4xx)"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "state": self._state,
+                "consecutive_failures": self._failures,
+                "rejected": self.rejected
+            }
+
+    def _transition(self, state: str):
+        # Caller holds the lock
+        logger.warning(f"LLM circuit {self.provider}: {self._state} → {state}")
+        self._state = state
+        BREAKER_TRANSITIONS.inc(provider=self.provider, state=state)
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(provider: str) -> CircuitBreaker:
+    """Process-wide circuit breaker for ``provider`` (a client's ``endpoint_key``)"""
+    breaker = _breakers.get(provider)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.get(provider)
+            if breaker is None:
+                breaker = _breakers[provider] = CircuitBreaker(
+                    provider,
+                    failure_threshold=config.llm_resilience.breaker_failures,
+                    reset_seconds=config.llm_resilience.breaker_reset_seconds
+                )
+    return breaker
+
+
+def reset_breakers():
+    """Forget every process-wide breaker (tests; a fresh breaker starts closed)"""
+    with _breakers_lock:
+        _breakers.clear()
+
+
+def breaker_stats() -> Dict[str, Dict]:
+    with _breakers_lock:
+        breakers = dict(_breakers)
+    return {provider: breaker.stats() for provider, breaker in breakers.items()}
+
+
+REGISTRY.register(CallbackGauge(
+    "sentinel_llm_circuit_state", "LLM circuit breaker state (0 closed, 1 half-open, 2 open)", ["provider"],
+    lambda: [({"provider": name}, _STATE_VALUES[s["state"]]) for name, s in breaker_stats().items()]
+))
@@ -4,10 +4,12 @@ ClovaX API Client for LLM-based phishing detection
 """
 import os
 import json
-import requests
 from typing import Dict, List, Optional, Tuple
 import logging
 
+from src.llm.llm_clients.base_client import api_base_url, get_session, http_timeout
+from src.llm.rate_limit import get_limiter
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -36,7 +38,10 @@ class ClovaXClient:
         self.request_id = request_id or "sentinel-voice-001"
 
         # ClovaX API endpoint
-        self.api_url = "https://clovastudio.stream.ntruss.com/testapp/v1/chat-completions/HCX-003"
+        self.api_url = (
+            f"{api_base_url('clovax', 'https://clovastudio.stream.ntruss.com')}"
+            "/testapp/v1/chat-completions/HCX-003"
+        )
 
         if not self.api_key:
             logger.warning("ClovaX API key not configured. LLM features will be disabled.")
@@ -165,12 +170,13 @@ JSON 응답:"""
         }
 
         logger.info("Calling ClovaX API...")
-        response = requests.post(
-            self.api_url,
-            headers=headers,
-            json=payload,
-            timeout=30
-        )
+        with get_limiter("clovax").limit():
+            response = get_session(self.api_url).post(
+                self.api_url,
+                headers=headers,
+                json=payload,
+                timeout=http_timeout()
+            )
 
         response.raise_for_status()
         return response.json()
@@ -2,144 +2,21 @@
 Gemini 2.5 Flash + Rule-based Filter 통합 시스템
 빠르고 저렴하며 정확한 단일 LLM 솔루션
 """
+import asyncio
+import hashlib
 import logging
-from typing import Dict, Optional
+from typing import Dict, List, Optional
+from src.config import config
+from src.llm.llm_clients.errors import BatchParseError
 from src.llm.llm_clients.gemini_client import GeminiClient
+from src.llm.llm_clients.hedged_client import with_hedging
 from src.filters.rule_filter_v2 import RuleBasedFilterV2 as RuleBasedFilter
+from src.monitoring import record_rule_outcome, timed, timed_llm
 
 logger = logging.getLogger(__name__)
 
-
-class GeminiPhishingDetector:
-    """
-    Gemini 2.5 Flash + Rule-based Filter 조합
-    - 빠른 응답 속도
-    - 저렴한 비용 (무료 티어)
-    - 96.3% 기본 정확도 + Rule Filter로 98%+ 목표
-    """
-
-    def __init__(self):
-        self.gemini = GeminiClient()
-        self.rule_filter = RuleBasedFilter()
-        self.model_name = "Gemini 2.5 Flash + Rule Filter"
-
-        if not self.gemini.is_available():
-            logger.warning("Gemini API key not configured")
-        else:
-            logger.info("✓ Gemini Phishing Detector initialized")
-
-    def is_available(self) -> bool:
-        """Gemini API 사용 가능 여부"""
-        return self.gemini.is_available()
-
-    def analyze(self, text: str, enable_filter: bool = True) -> Dict:
-        """
-        보이스피싱 분석 (Gemini + Rule Filter)
-
-        Args:
-            text: 통화 내용
-            enable_filter: Rule Filter 적용 여부 (기본: True)
-
-        Returns:
-            {
-                "score": 최종 점수 (0-100),
-                "risk_level": 위험도,
-                "is_phishing": 피싱 여부,
-                "reasoning": 판정 이유,
-                "model": 모델명,
-                "filter_applied": 필터 적용 여부,
-                "llm_score": 원본 LLM 점수,
-                "keyword_analysis": 키워드 분석
-            }
-        """
-        if not self.is_available():
-            return self._error_response("Gemini API not configured")
-
-        try:
-            # Step 1: Gemini 분석
-            logger.info(f"🔍 Gemini analyzing: {text[:50]}...")
-
-            prompt = self._build_prompt()
-            gemini_result = self.gemini.analyze_phishing(text, prompt)
-
-            llm_score = gemini_result.get("score", 50)
-            llm_reasoning = gemini_result.get("reasoning", "")
-
-            # Step 2: Rule Filter 적용 (항상 실행해서 키워드 분석 얻기)
-            filter_result = None
-            if enable_filter:
-                logger.info("⚙️ Applying Rule-based Filter...")
-                filter_result = self.rule_filter.filter(
-                    text=text,
-                    llm_score=llm_score,
-                    llm_reasoning=llm_reasoning
-                )
-
-                final_score = filter_result["final_score"]
-                filter_applied = filter_result["filter_applied"]
-                # 항상 keyword_analysis 가져옴 (필터 적용 여부와 무관)
-                keyword_analysis = filter_result.get("keyword_analysis", {})
-
-                # 필터가 적용되었으면 로그
-                if filter_applied:
-                    logger.info(
-                        f"✓ Rule Filter {'downgraded' if final_score < llm_score else 'upgraded'}: "
-                        f"{llm_score} → {final_score} ({filter_result['reason']})"
-                    )
-            else:
-                final_score = llm_score
-                filter_applied = False
-                keyword_analysis = {}
-
-            # Step 3: 최종 위험도 판정
-            risk_level, is_phishing = self._calculate_risk(final_score)
-
-            # 탐지된 피싱 기법 추출 (항상 표시)
-            detected_techniques = filter_result.get("detected_techniques", []) if filter_result else []
-
-            # Component scores 계산 (원래 시스템 점수 복원)
-            component_scores = {}
-            if keyword_analysis:
-                # 범죄 키워드 점수: 0-10개 기준 → 0-100
-                crime_score = min(keyword_analysis.get("crime", 0) * 10, 100)
-                # 정상 키워드 점수: 많을수록 안전 → 역산 (10개 기준)
-                legit_score = max(100 - keyword_analysis.get("legit", 0) * 10, 0)
-                # 긴급성 키워드 점수: 0-10개 기준 → 0-100
-                urgency_score = min(keyword_analysis.get("urgency", 0) * 10, 100)
-
-                component_scores = {
-                    "keyword": crime_score,
-                    "sentiment": urgency_score,
-                    "similarity": legit_score
-                }
-
-            # Reasoning 결정: Rule Filter가 점수를 변경했으면 Filter의 reason만 사용
-            final_reasoning = gemini_result.get("reasoning", "")
-            if filter_applied and filter_result and final_score != llm_score:
-                # 점수가 변경되었으면 Filter reason만 표시 (Gemini 원본은 숨김)
-                final_reasoning = filter_result.get("reason", "")
-
-            return {
-                "score": final_score,
-                "risk_level": risk_level,
-                "is_phishing": is_phishing,
-                "reasoning": final_reasoning,
-                "model": self.model_name,
-                "filter_applied": filter_applied,
-                "llm_score": llm_score,
-                "keyword_analysis": keyword_analysis,
-                "component_scores": component_scores,
-                "key_points": gemini_result.get("key_points", []),
-                "detected_techniques": detected_techniques
-            }
-
-        except Exception as e:
-            logger.error(f"Gemini Detector error: {e}")
-            return self._error_response(str(e))
-
-    def _build_prompt(self) -> str:
-        """Gemini용 프롬프트 생성"""
-        return """당신은 보이스피싱 탐지 전문가입니다. 다음 통화 내용을 분석하세요.
+# 프롬프트 템플릿 (모듈 로드 시 한 번 생성, GEMINI_PROMPT_VARIANT로 선택)
+FULL_PROMPT = """당신은 보이스피싱 탐지 전문가입니다. 다음 통화 내용을 분석하세요.
 
 **1단계: 화자 역할 및 금전 흐름 분석 (가장 중요!)**
 
@@ -234,6 +111,346 @@ class GeminiPhishingDetector:
 
 위 형식을 정확히 따라 JSON만 출력하세요:"""
 
+# FULL_PROMPT와 같은 판단 기준을 약 1/3 길이로 압축 (scripts/benchmark_prompts.py로 검증)
+COMPACT_PROMPT = """보이스피싱 탐지 전문가로서 통화 내용을 분석해 0~100점(높을수록 피싱)을 매기세요.
+
+판단 순서:
+1. 주도권: 발신자가 송금/정보/앱 설치를 요구하거나 압박 → 피싱 의심. 수신자가 항의·환불·민원 제기 → 정상.
+2. 금전 흐름: 사용자가 돈을 보냄 → 피싱 의심. 사용자가 돈을 받음(지급/환급/송금해드림) → 정상. 단, 돈을 준다며 URL 접속·앱 설치·비밀번호·선입금을 요구하면 무조건 피싱(95점 이상).
+3. 장소 이동: 모텔·숙박업소·독립 공간 → 피싱 의심. 경찰서·병원·지구대 방문 → 정상(금전 요구 없을 때).
+
+피싱 유형 (하나라도 해당하면 피싱):
+A. 기관/기업/금융사 사칭 + 금융정보 요구, 앱 설치·원격 제어, 가짜 URL, 개인정보 요구, 긴급·위협, 장소 이동 중 하나 이상
+B. 가족/지인 사칭 + 급전 요구, 친구/타인 계좌 송금(소액이라도 100% 피싱), 번호 변경·연락 두절 핑계, 계좌번호 전달
+C. 투자/대출: 과도한 수익 보장 + 선납금, 원금 보장, 환불 거부
+D. 모르는 사람의 과도한 친근감(잘못 건 전화, 인연, 카톡 추가 유도) → 향후 금전 요구를 위한 사전 작업으로 피싱
+
+점수: 90~100 결정적 요구(앱/URL/송금/개인정보)가 명확 | 70~89 징후 뚜렷, 요구 모호 | 30~69 혼재·판단 어려움 | 0~20 명확한 정상.
+
+정상(20점 이하): 기관 이름만 언급, 예약·안내·문의 업무 통화("예약하신", "말씀하신"), 예약된 (비대면) 진료, 금전 언급 없는 기술지원 설정 안내, 채용 안내(웹캠·마이페이지 접속은 정상 절차, 모텔 이동·보안 앱·원격 제어는 피싱), URL/앱 없는 보험금·합의금 지급, 경찰서·지구대 방문 요청, 월세·관리비 독촉, 중고거래 상호 인증.
+부동산 거래는 거액 송금이 있어도 계약서·집주인·매도인 언급, 키 불출·법무사·등기·잔금 용어, 법무사→신분증→등기 절차가 보이면 정상(약 15점).
+
+reasoning에는 줄바꿈이나 특수문자를 쓰지 말고, 유효한 JSON만 출력하세요:
+{"score": 95, "is_phishing": true, "reasoning": "금융감독원을 사칭하며 앱 설치를 유도하고 개인정보를 요구함"}"""
+
+PROMPTS = {
+    "full": FULL_PROMPT,
+    "compact": COMPACT_PROMPT
+}
+
+# analyze_batch(): 선택된 프롬프트 뒤에 붙여 통화 여러 개를 한 번에 판정
+BATCH_INSTRUCTIONS = """
+
+**여러 통화 일괄 판정:** 아래에는 [통화 1], [통화 2], ... 로 번호가 매겨진 통화가 여러 개 있습니다. 각 통화를 서로 독립적으로 위 기준에 따라 판정하고, 위의 단일 JSON 대신 통화마다 하나씩 입력 순서대로 JSON 배열만 출력하세요:
+[{"index": 1, "score": 95, "is_phishing": true, "reasoning": "..."}, {"index": 2, "score": 10, "is_phishing": false, "reasoning": "..."}]"""
+
+
+class GeminiPhishingDetector:
+    """
+    Gemini 2.5 Flash + Rule-based Filter 조합
+    - 빠른 응답 속도
+    - 저렴한 비용 (무료 티어)
+    - 96.3% 기본 정확도 + Rule Filter로 98%+ 목표
+    """
+
+    def __init__(self, prompt_variant: Optional[str] = None):
+        """
+        Args:
+            prompt_variant: "full" 또는 "compact" (기본값: GEMINI_PROMPT_VARIANT)
+        """
+        self.gemini = with_hedging(GeminiClient(), "gemini")
+        self.rule_filter = RuleBasedFilter()
+        self.model_name = "Gemini 2.5 Flash + Rule Filter"
+        self.prompt_variant = prompt_variant or config.prompt.gemini_variant
+        if self.prompt_variant not in PROMPTS:
+            raise ValueError(f"Unknown Gemini prompt variant '{self.prompt_variant}' (choose from {sorted(PROMPTS)})")
+        self.prompt = PROMPTS[self.prompt_variant]
+        self.batch_prompt = self.prompt + BATCH_INSTRUCTIONS
+        # Cache keys include this so results are invalidated when the prompt changes
+        self.prompt_version = hashlib.sha256(self.prompt.encode("utf-8")).hexdigest()[:12]
+
+        if not self.gemini.is_available():
+            logger.warning("Gemini API key not configured")
+        else:
+            logger.info("✓ Gemini Phishing Detector initialized")
+
+    def is_available(self) -> bool:
+        """Gemini API 사용 가능 여부"""
+        return self.gemini.is_available()
+
+    def analyze(self, text: str, enable_filter: bool = True, features: Optional[Dict] = None) -> Dict:
+        """
+        보이스피싱 분석 (Gemini + Rule Filter)
+
+        Args:
+            text: 통화 내용
+            enable_filter: Rule Filter 적용 여부 (기본: True)
+            features: 미리 계산된 Rule 특징 (RuleBasedFilterV2.extract_features)
+
+        Returns:
+            {
+                "score": 최종 점수 (0-100),
+                "risk_level": 위험도,
+                "is_phishing": 피싱 여부,
+                "reasoning": 판정 이유,
+                "model": 모델명,
+                "filter_applied": 필터 적용 여부,
+                "rule": 판정을 결정한 Rule ("passed", "disabled", "rule1_..." 등),
+                "llm_score": 원본 LLM 점수,
+                "keyword_analysis": 키워드 분석
+            }
+        """
+        if not self.is_available():
+            return self._error_response("Gemini API not configured")
+
+        speculative = None
+        try:
+            if enable_filter:
+                if features is None:
+                    features = self.rule_filter.extract_features(text)
+                # 60-98점이 예상되면 2차 검증을 1차 호출과 동시에 시작 (SPECULATIVE_SECOND_STAGE)
+                speculative = self.rule_filter.speculate(text, features)
+
+            gemini_result = self.query_llm(text)
+            if "error" in gemini_result:
+                self.rule_filter.discard_speculation(speculative)
+                return self._llm_failed(gemini_result)
+            return self.finalize(
+                text, gemini_result, enable_filter=enable_filter, features=features, speculative=speculative
+            )
+
+        except Exception as e:
+            logger.error(f"Gemini Detector error: {e}")
+            self.rule_filter.discard_speculation(speculative)
+            record_rule_outcome("error")
+            return self._error_response(str(e))
+
+    def query_llm(self, text: str) -> Dict:
+        """Step 1: Gemini 1차 분석 (원본 LLM 결과)"""
+        logger.info(f"🔍 Gemini analyzing: {text[:50]}...")
+        prompt = self._build_prompt()
+        with timed_llm("gemini") as call:
+            return call.check(self.gemini.analyze_phishing(text, prompt))
+
+    def analyze_batch(
+        self,
+        texts: List[str],
+        enable_filter: bool = True,
+        batch_size: Optional[int] = None,
+        allow_second_stage: bool = False
+    ) -> List[Dict]:
+        """
+        여러 통화를 Gemini 요청 하나에 묶어 판정 (야간 재채점 등 오프라인 대량 처리)
+
+        ``batch_size``개(기본값 BATCH_LLM_TRANSCRIPTS)씩 한 요청으로 보내고, 응답이
+        통화별 판정 배열로 파싱되지 않은 묶음은 반으로 나눠 다시 요청 (1개면 단건 호출).
+        Rule Filter는 통화별로 적용하며, 2차 LLM 검증은 기본적으로 생략.
+
+        Returns:
+            입력 순서대로 analyze()와 같은 형식의 결과
+            (+ 해당 요청의 "batch_size", 통화별로 나눈 토큰 "usage")
+        """
+        if not self.is_available():
+            return [self._error_response("Gemini API not configured") for _ in texts]
+
+        batch_size = max(1, batch_size or config.batch.llm_batch_size)
+        results = []
+        for start in range(0, len(texts), batch_size):
+            chunk = texts[start:start + batch_size]
+            for text, gemini_result in zip(chunk, self._query_batch(chunk)):
+                if "error" in gemini_result:
+                    results.append(self._llm_failed(gemini_result))
+                    continue
+                result = self.finalize(
+                    text, gemini_result, enable_filter=enable_filter, allow_second_stage=allow_second_stage
+                )
+                result.update(batch_size=gemini_result.get("batch_size", 1), usage=gemini_result.get("usage"))
+                results.append(result)
+        return results
+
+    def _query_batch(self, texts: List[str]) -> List[Dict]:
+        """묶음 요청; 파싱 실패 시 반으로 나눠 재시도"""
+        if len(texts) == 1:
+            return [self.query_llm(texts[0])]
+        try:
+            with timed_llm("gemini_batch") as call:
+                return call.check(self.gemini.analyze_batch(texts, self.batch_prompt))
+        except BatchParseError as e:
+            logger.warning(f"Gemini batch of {len(texts)} unusable ({e}), splitting")
+            middle = len(texts) // 2
+            return self._query_batch(texts[:middle]) + self._query_batch(texts[middle:])
+
+    def finalize(
+        self,
+        text: str,
+        gemini_result: Dict,
+        enable_filter: bool = True,
+        features: Optional[Dict] = None,
+        allow_second_stage: bool = True,
+        speculative=None
+    ) -> Dict:
+        """Step 2-3: Rule Filter 적용 및 최종 위험도 판정 (speculative: rule_filter.speculate() 결과)"""
+        # Step 2: Rule Filter 적용 (항상 실행해서 키워드 분석 얻기)
+        filter_result = None
+        if enable_filter:
+            logger.info("⚙️ Applying Rule-based Filter...")
+            with timed("rule_filter"):
+                filter_result = self.rule_filter.filter(
+                    text=text,
+                    llm_score=gemini_result.get("score", 50),
+                    llm_reasoning=gemini_result.get("reasoning", ""),
+                    features=features,
+                    allow_second_stage=allow_second_stage,
+                    speculative=speculative
+                )
+        return self._build_result(gemini_result, filter_result)
+
+    async def analyze_async(self, text: str, enable_filter: bool = True, features: Optional[Dict] = None) -> Dict:
+        """analyze()와 동일, Gemini 1차/2차 호출을 비동기 HTTP로 수행 (이벤트 루프에서 직접 await)"""
+        if not self.is_available():
+            return self._error_response("Gemini API not configured")
+
+        speculative = None
+        try:
+            if enable_filter:
+                if features is None:
+                    features = self.rule_filter.extract_features(text)
+                speculative = self.rule_filter.speculate_async(text, features)
+
+            gemini_result = await self.query_llm_async(text)
+            if "error" in gemini_result:
+                self.rule_filter.discard_speculation(speculative)
+                return self._llm_failed(gemini_result)
+            return await self.finalize_async(
+                text, gemini_result, enable_filter=enable_filter, features=features, speculative=speculative
+            )
+
+        except asyncio.CancelledError:
+            self.rule_filter.discard_speculation(speculative)
+            raise
+        except Exception as e:
+            logger.error(f"Gemini Detector error: {e}")
+            self.rule_filter.discard_speculation(speculative)
+            record_rule_outcome("error")
+            return self._error_response(str(e))
+
+    async def query_llm_async(self, text: str) -> Dict:
+        """Step 1: Gemini 1차 분석 (비동기)"""
+        logger.info(f"🔍 Gemini analyzing (async): {text[:50]}...")
+        with timed_llm("gemini") as call:
+            return call.check(await self.gemini.analyze_phishing_async(text, self._build_prompt()))
+
+    async def finalize_async(
+        self,
+        text: str,
+        gemini_result: Dict,
+        enable_filter: bool = True,
+        features: Optional[Dict] = None,
+        speculative=None
+    ) -> Dict:
+        """Step 2-3 (비동기): 2차 LLM 검증이 필요하면 이벤트 루프에서 await"""
+        filter_result = None
+        if enable_filter:
+            with timed("rule_filter"):
+                filter_result = await self.rule_filter.filter_async(
+                    text=text,
+                    llm_score=gemini_result.get("score", 50),
+                    llm_reasoning=gemini_result.get("reasoning", ""),
+                    features=features,
+                    speculative=speculative
+                )
+        return self._build_result(gemini_result, filter_result)
+
+    def _build_result(self, gemini_result: Dict, filter_result: Optional[Dict]) -> Dict:
+        """Rule Filter 결과 반영 → 최종 응답"""
+        llm_score = gemini_result.get("score", 50)
+
+        if filter_result is not None:
+            rule = filter_result.get("rule", "passed")
+
+            final_score = filter_result["final_score"]
+            filter_applied = filter_result["filter_applied"]
+            # 항상 keyword_analysis 가져옴 (필터 적용 여부와 무관)
+            keyword_analysis = filter_result.get("keyword_analysis", {})
+
+            # 필터가 적용되었으면 로그
+            if filter_applied:
+                logger.info(
+                    f"✓ Rule Filter {'downgraded' if final_score < llm_score else 'upgraded'}: "
+                    f"{llm_score} → {final_score} ({filter_result['reason']})"
+                )
+        else:
+            final_score = llm_score
+            filter_applied = False
+            keyword_analysis = {}
+            rule = "disabled"
+
+        record_rule_outcome(rule)
+
+        # Step 3: 최종 위험도 판정
+        risk_level, is_phishing = self._calculate_risk(final_score)
+
+        # 탐지된 피싱 기법 추출 (항상 표시)
+        detected_techniques = filter_result.get("detected_techniques", []) if filter_result else []
+
+        # Component scores 계산 (원래 시스템 점수 복원)
+        component_scores = {}
+        if keyword_analysis:
+            # 범죄 키워드 점수: 0-10개 기준 → 0-100
+            crime_score = min(keyword_analysis.get("crime", 0) * 10, 100)
+            # 정상 키워드 점수: 많을수록 안전 → 역산 (10개 기준)
+            legit_score = max(100 - keyword_analysis.get("legit", 0) * 10, 0)
+            # 긴급성 키워드 점수: 0-10개 기준 → 0-100
+            urgency_score = min(keyword_analysis.get("urgency", 0) * 10, 100)
+
+            component_scores = {
+                "keyword": crime_score,
+                "sentiment": urgency_score,
+                "similarity": legit_score
+            }
+
+        # Reasoning 결정: Rule Filter가 점수를 변경했으면 Filter의 reason만 사용
+        final_reasoning = gemini_result.get("reasoning", "")
+        if filter_applied and filter_result and final_score != llm_score:
+            # 점수가 변경되었으면 Filter reason만 표시 (Gemini 원본은 숨김)
+            final_reasoning = filter_result.get("reason", "")
+
+        return {
+            "score": final_score,
+            "risk_level": risk_level,
+            "is_phishing": is_phishing,
+            "reasoning": final_reasoning,
+            "model": self.model_name,
+            "filter_applied": filter_applied,
+            "rule": rule,
+            "llm_score": llm_score,
+            "keyword_analysis": keyword_analysis,
+            "component_scores": component_scores,
+            "key_points": gemini_result.get("key_points", []),
+            "detected_techniques": detected_techniques
+        }
+
+    def rule_only(self, text: str, base_score: float, features: Optional[Dict] = None) -> Dict:
+        """
+        LLM 없이 Rule Filter만으로 판정 (degrade 모드)
+
+        마감 시간 안에 LLM 응답을 받을 수 없을 때 사용. ``base_score``
+        (RiskScorer 점수)를 1차 점수 대신 Rule Filter에 넣고, 2차 LLM 검증은 생략.
+        """
+        result = self.finalize(
+            text,
+            {"score": base_score, "reasoning": "LLM 응답 지연 - Rule 기반 판정"},
+            enable_filter=True,
+            features=features,
+            allow_second_stage=False
+        )
+        result.update(model="Rule Filter (degraded)", llm_score=None, base_score=base_score)
+        return result
+
+    def _build_prompt(self) -> str:
+        """Gemini용 프롬프트 (시작 시 한 번 선택된 템플릿)"""
+        return self.prompt
+
     def _calculate_risk(self, score: float) -> tuple:
         """
         점수를 위험도로 변환
@@ -252,8 +469,13 @@ class GeminiPhishingDetector:
         else:
             return ("안전", False)
 
-    def _error_response(self, error: str) -> Dict:
-        """에러 응답"""
+    def _llm_failed(self, gemini_result: Dict) -> Dict:
+        """Gemini 호출 실패: 50점 placeholder를 Rule Filter에 넣지 않고 에러로 반환"""
+        record_rule_outcome("error")
+        return self._error_response(gemini_result["error"], gemini_result.get("error_type", "permanent"))
+
+    def _error_response(self, error: str, error_type: str = "permanent") -> Dict:
+        """에러 응답 (error_type: transient / permanent / circuit_open)"""
         return {
             "score": 50,
             "risk_level": "알 수 없음",
@@ -261,9 +483,12 @@ class GeminiPhishingDetector:
             "reasoning": f"Error: {error}",
             "model": self.model_name,
             "filter_applied": False,
+            "rule": "error",
             "llm_score": 50,
             "keyword_analysis": {},
-            "key_points": []
+            "key_points": [],
+            "error": error,
+            "error_type": error_type
         }
 
     def get_filter_statistics(self) -> Dict:
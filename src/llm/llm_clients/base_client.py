@@ -1,33 +1,167 @@
 """
 Base LLM Client interface
+
+All providers share one keep-alive connection pool per API host
+(``get_session``), so repeated calls skip the TCP + TLS handshake. Clients
+only describe the request (``_build_request``) and where the answer text is
+in the response (``_extract_content``); ``analyze_phishing`` does the rest.
+
+``analyze_phishing_async`` sends the same request over aiohttp, with one
+pooled ``ClientSession`` per event loop, so async callers (ensemble, 2nd
+stage verifier, server) can fan out many calls without a thread per call.
+
+Successful answers are stored in the persistent LLM cache
+(``src.cache.llm_cache``) under (provider, model, prompt hash, normalized
+text); a hit skips the HTTP call and is marked ``"cached": True``.
+
+Transient failures (timeouts, connection errors, 429/5xx) are retried with
+jittered exponential backoff within the request deadline, behind a
+per-model circuit breaker (``src.llm.circuit_breaker``, keyed by
+``endpoint_key``). A call that
+still fails returns ``_error_response`` with ``error`` and ``error_type``
+set; its neutral score is a placeholder, never a verdict, so callers check
+``"error"`` before using it.
 """
 from abc import ABC, abstractmethod
-from typing import Dict, Optional
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+import asyncio
+import json
 import logging
+import os
+import random
+import threading
+import time
+import weakref
+
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.cache import get_llm_cache, llm_cache_key
+from src.config import config
+from src.llm.circuit_breaker import get_breaker
+from src.llm.rate_limit import get_limiter
+from src.monitoring import record_llm_tokens
+from src.server.admission import current_deadline, deadline_timeout
+
+from .errors import BatchParseError, CircuitOpenError, LLMError, LLMPermanentError, classify_exception
 
 logger = logging.getLogger(__name__)
 
+# (pid, host) -> Session; keyed by pid so forked workers never share sockets
+_sessions: Dict[Tuple[int, str], requests.Session] = {}
+_sessions_lock = threading.Lock()
+
+
+def api_base_url(provider: str, public_url: str) -> str:
+    """Provider API base URL: LLM_BASE_URL_<PROVIDER>, else LLM_BASE_URL, else ``public_url``"""
+    override = getattr(config.llm_endpoints, provider, "") or config.llm_endpoints.default
+    return (override or public_url).rstrip("/")
+
+
+def split_usage(usage: Dict[str, int], count: int) -> List[Dict[str, int]]:
+    """One call's token usage as ``count`` integer shares that add up to the total"""
+    return [{kind: tokens // count + (i < tokens % count) for kind, tokens in usage.items()} for i in range(count)]
+
+
+def get_session(url: str) -> requests.Session:
+    """Shared keep-alive session (connection pool) for the API host of ``url``"""
+    key = (os.getpid(), urlsplit(url).netloc)
+    session = _sessions.get(key)
+    if session is None:
+        with _sessions_lock:
+            session = _sessions.get(key)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=1,
+                    pool_maxsize=config.llm_http.pool_maxsize,
+                    pool_block=config.llm_http.pool_block,
+                    max_retries=0
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _sessions[key] = session
+    return session
+
+
+# event loop -> ClientSession (aiohttp sessions are bound to the loop they were created on)
+_async_sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.ClientSession]" = \
+    weakref.WeakKeyDictionary()
+
+
+def get_async_session() -> aiohttp.ClientSession:
+    """Shared aiohttp session (keep-alive pool per provider host) for the running event loop"""
+    loop = asyncio.get_running_loop()
+    session = _async_sessions.get(loop)
+    if session is None or session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=0,  # per-host limit only
+            limit_per_host=config.llm_http.async_pool_maxsize,
+            keepalive_timeout=60
+        )
+        session = aiohttp.ClientSession(connector=connector)
+        _async_sessions[loop] = session
+    return session
+
+
+async def close_async_session():
+    """Close the running loop's aiohttp session (server shutdown)"""
+    session = _async_sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None and not session.closed:
+        await session.close()
+
+
+def http_timeout() -> Tuple[float, float]:
+    """(connect, read) timeout; the read timeout is capped by the request deadline"""
+    read_timeout = deadline_timeout(config.llm_http.read_timeout)
+    return min(config.llm_http.connect_timeout, read_timeout), read_timeout
+
 
 class BaseLLMClient(ABC):
     """Base class for all LLM clients"""
 
+    # Key of the shared per-provider limiter (config.llm_limits)
+    provider = "default"
+    # Path of the output-token limit in the request payload (analyze_phishing(max_output_tokens=...))
+    max_tokens_path: Tuple[str, ...] = ("max_tokens",)
+
     def __init__(self, api_key: Optional[str] = None):
         self.api_key = api_key
         self.model_name = "unknown"
 
+    @property
+    def endpoint_key(self) -> str:
+        """
+        Circuit breaker / limiter key: ``provider:model`` for clients that pick a
+        model (outages and quotas are per model, so a hedge to another model of
+        the same provider does not hit the primary's open circuit), else ``provider``
+        """
+        model = getattr(self, "model", None)
+        return f"{self.provider}:{model}" if model else self.provider
+
     @abstractmethod
     def is_available(self) -> bool:
         """Check if API key is configured"""
         pass
 
-    @abstractmethod
-    def analyze_phishing(self, text: str, prompt: str) -> Dict:
+    def analyze_phishing(
+        self,
+        text: str,
+        prompt: str,
+        max_output_tokens: Optional[int] = None,
+        validate: Optional[Callable[[Dict], bool]] = None
+    ) -> Dict:
         """
         Analyze phishing with given prompt
 
         Args:
             text: Conversation text to analyze
             prompt: Analysis prompt
+            max_output_tokens: Raise the client's output-token limit to this (long answers)
+            validate: Extra check for caching; an answer it rejects is neither
+                cached nor served from the cache (e.g. a combined answer missing an agent)
 
         Returns:
             {
@@ -37,8 +171,308 @@ class BaseLLMClient(ABC):
                 "model": str
             }
         """
+        if not self.is_available():
+            return self._error_response("API key not configured")
+
+        try:
+            url, headers, payload = self._build_request(text, prompt)
+            self._raise_output_limit(payload, max_output_tokens)
+            cache, key = self._cache_lookup_key(url, payload, text, prompt)
+            if cache is not None:
+                cached = cache.get(key)
+                if cached is not None and (validate is None or validate(cached)):
+                    return {**cached, "cached": True}
+
+            parsed = self._parse_result(self._post(url, headers, payload))
+            if cache is not None and self._cacheable(parsed, validate):
+                cache.set(key, self._cache_value(parsed))
+            return parsed
+
+        except LLMError as e:
+            logger.error(f"{self.model_name} {e.kind} error: {e}")
+            return self._error_response(str(e), e.kind)
+        except Exception as e:
+            logger.error(f"{self.model_name} error: {e}")
+            return self._error_response(str(e), LLMPermanentError.kind)
+
+    async def analyze_phishing_async(
+        self,
+        text: str,
+        prompt: str,
+        max_output_tokens: Optional[int] = None,
+        validate: Optional[Callable[[Dict], bool]] = None
+    ) -> Dict:
+        """analyze_phishing() over aiohttp; same request, parsing and error handling"""
+        if not self.is_available():
+            return self._error_response("API key not configured")
+
+        try:
+            url, headers, payload = self._build_request(text, prompt)
+            self._raise_output_limit(payload, max_output_tokens)
+            cache, key = self._cache_lookup_key(url, payload, text, prompt)
+            if cache is not None:
+                # SQLite may wait on another writer; keep it off the event loop
+                cached = await asyncio.to_thread(cache.get, key)
+                if cached is not None and (validate is None or validate(cached)):
+                    return {**cached, "cached": True}
+
+            parsed = self._parse_result(await self._post_async(url, headers, payload))
+            if cache is not None and self._cacheable(parsed, validate):
+                await asyncio.to_thread(cache.set, key, self._cache_value(parsed))
+            return parsed
+
+        except asyncio.CancelledError:
+            raise
+        except LLMError as e:
+            logger.error(f"{self.model_name} {e.kind} error: {e}")
+            return self._error_response(str(e), e.kind)
+        except Exception as e:
+            logger.error(f"{self.model_name} error: {e!r}")
+            return self._error_response(str(e) or type(e).__name__, LLMPermanentError.kind)
+
+    def analyze_batch(self, texts: List[str], prompt: str) -> List[Dict]:
+        """
+        Score several transcripts with one request (offline bulk scoring)
+
+        The transcripts are numbered ``[통화 1]``, ``[통화 2]``, ... and ``prompt``
+        must ask for a JSON array with one ``{"index", "score", ...}`` per
+        transcript. Not cached; the batch's token usage is split across the items.
+
+        Returns:
+            One result per transcript, in order (all error responses if the call failed)
+
+        Raises:
+            BatchParseError: The response was not one verdict per transcript, or had
+                no output at all (e.g. a safety block or a cut-off candidate);
+                the caller should split the batch and retry
+        """
+        if not self.is_available():
+            return [self._error_response("API key not configured") for _ in texts]
+
+        try:
+            url, headers, payload = self._build_batch_request(texts, prompt)
+            result = self._post(url, headers, payload)
+        except LLMError as e:
+            logger.error(f"{self.model_name} batch of {len(texts)} {e.kind} error: {e}")
+            return [self._error_response(str(e), e.kind) for _ in texts]
+        except Exception as e:
+            logger.error(f"{self.model_name} batch of {len(texts)} error: {e!r}")
+            return [self._error_response(str(e) or type(e).__name__, LLMPermanentError.kind) for _ in texts]
+
+        usage = self._extract_usage(result)
+        if usage:
+            record_llm_tokens(self.provider, usage)  # billed even if the answer is unusable
+        try:
+            items = self._parse_batch_response(self._extract_content(result), len(texts))
+        except BatchParseError:
+            raise
+        except Exception as e:
+            raise BatchParseError(f"No usable output ({type(e).__name__}: {e})") from e
+        shares = split_usage(usage, len(texts)) if usage else [None] * len(texts)
+        for item, share in zip(items, shares):
+            item.update(model=self.model_name, batch_size=len(texts))
+            if share:
+                item["usage"] = share
+        logger.info(f"✓ {self.model_name} batch of {len(texts)}: {[item['score'] for item in items]}")
+        return items
+
+    def _build_batch_request(self, texts: List[str], prompt: str) -> Tuple[str, Dict, Dict]:
+        """Provider request for a numbered batch of transcripts (default: one prompt, numbered text block)"""
+        return self._build_request(self._format_batch(texts), prompt)
+
+    @staticmethod
+    def _format_batch(texts: List[str]) -> str:
+        return "\n\n".join(f"[통화 {i}]\n{text}" for i, text in enumerate(texts, 1))
+
+    @staticmethod
+    def _parse_batch_response(content: str, count: int) -> List[Dict]:
+        """JSON array of verdicts → one dict per transcript, ordered by ``index`` (1-based)"""
+        if "```" in content:
+            content = content.split("```json")[-1] if "```json" in content else content.split("```")[1]
+            content = content.split("```")[0]
+        try:
+            items = json.loads(content.strip())
+        except json.JSONDecodeError as e:
+            raise BatchParseError(f"Invalid JSON ({e})") from e
+        if isinstance(items, dict):
+            items = next((value for value in items.values() if isinstance(value, list)), None)
+        if not isinstance(items, list) or len(items) != count:
+            raise BatchParseError(f"Expected {count} verdicts, got {len(items) if isinstance(items, list) else 0}")
+        if not all(isinstance(item, dict) and isinstance(item.get("score"), (int, float)) for item in items):
+            raise BatchParseError("Verdict without a numeric score")
+
+        indexes = [item.get("index") for item in items]
+        if sorted(i for i in indexes if isinstance(i, int)) != list(range(1, count + 1)):
+            indexes = range(1, count + 1)  # no usable index: trust the order
+        ordered = [None] * count
+        for index, item in zip(indexes, items):
+            item.pop("index", None)
+            item.setdefault("is_phishing", item["score"] >= 70)
+            item.setdefault("reasoning", "")
+            item.setdefault("key_points", [])
+            ordered[index - 1] = item
+        return ordered
+
+    @abstractmethod
+    def _build_request(self, text: str, prompt: str) -> Tuple[str, Dict, Dict]:
+        """Provider request for one analysis: (url, headers, json payload)"""
+        pass
+
+    @abstractmethod
+    def _extract_content(self, result: Dict) -> str:
+        """Model output text from the provider's JSON response"""
         pass
 
+    def _extract_usage(self, result: Dict) -> Optional[Dict[str, int]]:
+        """Token counts from the provider's JSON response (OpenAI-style ``usage``; None if absent)"""
+        usage = result.get("usage")
+        if not usage:
+            return None
+        return {"prompt_tokens": usage.get("prompt_tokens", 0), "output_tokens": usage.get("completion_tokens", 0)}
+
+    def _parse_result(self, result: Dict) -> Dict:
+        """Provider response → {"score", "reasoning", ..., "model", "usage"} (tokens counted per provider)"""
+        parsed = self._parse_json_response(self._extract_content(result))
+        parsed["model"] = self.model_name
+        usage = self._extract_usage(result)
+        if usage:
+            parsed["usage"] = usage
+            record_llm_tokens(self.provider, usage)
+
+        logger.info(f"✓ {self.model_name} analysis: {parsed.get('score', 0)}/100")
+        return parsed
+
+    def _cache_lookup_key(self, url: str, payload: Dict, text: str, prompt: str):
+        """(cache, key) for this request, or (None, None) when the LLM cache is disabled"""
+        cache = get_llm_cache()
+        if cache is None:
+            return None, None
+        # Model id from the payload (OpenAI-style) or the URL path (Gemini: models/<id>:generateContent)
+        model = payload.get("model") or urlsplit(url).path
+        return cache, llm_cache_key(self.provider, f"{self.model_name}|{model}", prompt, text)
+
+    @staticmethod
+    def _cache_value(parsed: Dict) -> Dict:
+        """Cached answer without token usage (a cache hit costs no tokens)"""
+        return {k: v for k, v in parsed.items() if k != "usage"}
+
+    @staticmethod
+    def _cacheable(parsed: Dict, validate: Optional[Callable[[Dict], bool]] = None) -> bool:
+        """Only real answers; parse failures fall back to a neutral score and must be retried"""
+        if "error" in parsed or parsed.get("parse_error"):
+            return False
+        return validate is None or validate(parsed)
+
+    def _raise_output_limit(self, payload: Dict, max_output_tokens: Optional[int]):
+        """Raise the payload's output-token limit (``max_tokens_path``) to ``max_output_tokens``"""
+        if not max_output_tokens:
+            return
+        *parents, field = self.max_tokens_path
+        target = payload
+        for key in parents:
+            target = target[key]
+        target[field] = max(target.get(field, 0), max_output_tokens)
+
+    def _post(self, url: str, headers: Dict, payload: Dict) -> Dict:
+        """
+        POST with retries behind the provider's circuit breaker
+
+        Raises:
+            LLMError: typed failure after the last attempt (or CircuitOpenError right away)
+        """
+        breaker = get_breaker(self.endpoint_key)
+        attempts = max(1, config.llm_resilience.retry_attempts)
+        for attempt in range(attempts):
+            self._check_breaker(breaker)
+            try:
+                result = self._post_once(url, headers, payload)
+            except Exception as e:
+                error = self._record_failure(breaker, e)
+                delay = self._retry_delay(error, attempt, attempts)
+                if delay is None:
+                    raise error from e
+                logger.warning(f"{self.model_name} {error}; retry {attempt + 1}/{attempts - 1} in {delay:.2f}s")
+                time.sleep(delay)
+            else:
+                breaker.record_success()
+                return result
+
+    async def _post_async(self, url: str, headers: Dict, payload: Dict) -> Dict:
+        """_post() over aiohttp: same retries, backoff and circuit breaker"""
+        breaker = get_breaker(self.endpoint_key)
+        attempts = max(1, config.llm_resilience.retry_attempts)
+        for attempt in range(attempts):
+            self._check_breaker(breaker)
+            try:
+                result = await self._post_once_async(url, headers, payload)
+            except asyncio.CancelledError:
+                breaker.release()
+                raise
+            except Exception as e:
+                error = self._record_failure(breaker, e)
+                delay = self._retry_delay(error, attempt, attempts)
+                if delay is None:
+                    raise error from e
+                logger.warning(f"{self.model_name} {error}; retry {attempt + 1}/{attempts - 1} in {delay:.2f}s")
+                await asyncio.sleep(delay)
+            else:
+                breaker.record_success()
+                return result
+
+    def _post_once(self, url: str, headers: Dict, payload: Dict) -> Dict:
+        """POST over the provider's pooled keep-alive session (within the provider's limits)"""
+        with get_limiter(self.endpoint_key).limit():
+            response = get_session(url).post(url, headers=headers, json=payload, timeout=http_timeout())
+        response.raise_for_status()
+        return response.json()
+
+    async def _post_once_async(self, url: str, headers: Dict, payload: Dict) -> Dict:
+        """POST over the event loop's pooled aiohttp session (within the provider's limits)"""
+        async with get_limiter(self.endpoint_key).limit_async():
+            connect_timeout, read_timeout = http_timeout()
+            timeout = aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout)
+            async with get_async_session().post(url, headers=headers, json=payload, timeout=timeout) as response:
+                response.raise_for_status()
+                return await response.json(content_type=None)
+
+    def _check_breaker(self, breaker):
+        if not breaker.allow():
+            raise CircuitOpenError(self.provider, f"{self.endpoint_key} circuit open, call not sent")
+
+    def _record_failure(self, breaker, exc: Exception) -> LLMError:
+        """Typed error; only transient failures count towards opening the breaker"""
+        error = classify_exception(self.provider, exc)
+        if error.retryable:
+            breaker.record_failure()
+        else:
+            breaker.release()
+        return error
+
+    @staticmethod
+    def _retry_delay(error: LLMError, attempt: int, attempts: int) -> Optional[float]:
+        """Full-jitter backoff before the next attempt, or None to give up"""
+        if not error.retryable or attempt + 1 >= attempts:
+            return None
+        resilience = config.llm_resilience
+        delay = random.uniform(0, min(resilience.retry_max_delay, resilience.retry_base_delay * 2 ** attempt))
+        if error.retry_after:
+            delay = max(delay, min(error.retry_after, resilience.retry_max_delay))
+        deadline = current_deadline()
+        if deadline is not None and deadline.remaining() <= delay + config.admission.llm_min_budget:
+            return None  # no time left for another attempt
+        return delay
+
+    def _error_response(self, error: str, error_type: str = LLMPermanentError.kind) -> Dict:
+        """Failed call: placeholder score only, ``error`` tells callers not to use it"""
+        return {
+            "score": 50,
+            "reasoning": f"Error: {error}",
+            "key_points": [],
+            "model": self.model_name,
+            "error": error,
+            "error_type": error_type
+        }
+
     def _parse_json_response(self, content: str) -> Dict:
         """Common JSON parsing logic"""
         import json
@@ -72,5 +506,6 @@ class BaseLLMClient(ABC):
                 "score": score,
                 "reasoning": reasoning,
                 "is_phishing": score >= 70,
-                "key_points": []
+                "key_points": [],
+                "parse_error": score_match is None
             }
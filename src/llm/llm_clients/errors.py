@@ -0,0 +1,85 @@
+"""
+Typed LLM client errors
+
+``BaseLLMClient._post`` turns every failure into one of these, so callers can
+tell a provider outage (retry, fail over, do not cache) from a real verdict.
+Error responses carry the class's ``kind`` as ``error_type``.
+"""
+import asyncio
+from typing import Optional
+
+import aiohttp
+import requests
+
+# HTTP statuses worth retrying: timeouts, rate limiting and server-side failures
+RETRYABLE_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+
+
+class LLMError(Exception):
+    """Base class: an LLM call produced no verdict"""
+
+    kind = "error"
+    retryable = False
+
+    def __init__(self, provider: str, message: str, status: Optional[int] = None,
+                 retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.provider = provider
+        self.status = status
+        self.retry_after = retry_after
+
+
+class LLMTransientError(LLMError):
+    """Timeout, connection failure, 429 or 5xx - retried, and counted by the circuit breaker"""
+
+    kind = "transient"
+    retryable = True
+
+
+class LLMPermanentError(LLMError):
+    """Request rejected (4xx) or unusable response - retrying will not help"""
+
+    kind = "permanent"
+
+
+class CircuitOpenError(LLMError):
+    """The provider's circuit breaker is open; the call was not sent"""
+
+    kind = "circuit_open"
+
+
+class BatchParseError(ValueError):
+    """A multi-transcript response was not a JSON array with one verdict per transcript"""
+    pass
+
+
+def _retry_after(headers) -> Optional[float]:
+    try:
+        return float(headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+
+
+def classify_exception(provider: str, exc: Exception) -> LLMError:
+    """requests / aiohttp exception → typed LLMError"""
+    if isinstance(exc, LLMError):
+        return exc
+
+    status = None
+    retry_after = None
+    if isinstance(exc, requests.HTTPError) and exc.response is not None:
+        status = exc.response.status_code
+        retry_after = _retry_after(exc.response.headers)
+    elif isinstance(exc, aiohttp.ClientResponseError):
+        status = exc.status
+        retry_after = _retry_after(exc.headers or {})
+
+    message = f"{type(exc).__name__}: {exc}" if str(exc) else type(exc).__name__
+    if status is not None:
+        error_class = LLMTransientError if status in RETRYABLE_STATUSES else LLMPermanentError
+        return error_class(provider, f"HTTP {status}: {message}", status=status, retry_after=retry_after)
+
+    if isinstance(exc, (requests.ConnectionError, requests.Timeout, aiohttp.ClientConnectionError,
+                        aiohttp.ServerTimeoutError, asyncio.TimeoutError, ConnectionError, TimeoutError)):
+        return LLMTransientError(provider, message)
+    return LLMPermanentError(provider, message)
@@ -3,80 +3,100 @@ Google Gemini API Client
 """
 import os
 import logging
-from typing import Dict, Optional
-import requests
+from typing import Dict, List, Optional, Tuple
 
-from .base_client import BaseLLMClient
+from .base_client import BaseLLMClient, api_base_url
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_MODEL = "gemini-2.5-flash"
+
+# Display names (also part of cache keys, so keep them stable)
+MODEL_NAMES = {
+    "gemini-2.5-flash": "Gemini 2.5 Flash",
+    "gemini-2.5-flash-lite": "Gemini 2.5 Flash-Lite",
+    "gemini-2.0-flash": "Gemini 2.0 Flash",
+    "gemini-2.5-pro": "Gemini 2.5 Pro"
+}
+
+# Structured output for analyze_batch(): one verdict per numbered transcript
+BATCH_RESPONSE_SCHEMA = {
+    "type": "ARRAY",
+    "items": {
+        "type": "OBJECT",
+        "properties": {
+            "index": {"type": "INTEGER"},
+            "score": {"type": "INTEGER"},
+            "is_phishing": {"type": "BOOLEAN"},
+            "reasoning": {"type": "STRING"}
+        },
+        "required": ["index", "score", "is_phishing", "reasoning"]
+    }
+}
+
 
 class GeminiClient(BaseLLMClient):
     """Google Gemini API client"""
 
-    def __init__(self, api_key: Optional[str] = None):
+    provider = "gemini"
+    max_tokens_path = ("generationConfig", "maxOutputTokens")
+
+    def __init__(self, api_key: Optional[str] = None, model: Optional[str] = None):
         super().__init__(api_key or os.getenv("GEMINI_API_KEY"))
-        self.model_name = "Gemini 2.5 Flash"
-        self.api_url = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash:generateContent"
+        self.model = model or DEFAULT_MODEL
+        self.model_name = MODEL_NAMES.get(self.model, f"Gemini ({self.model})")
+        self.api_url = (
+            f"{api_base_url(self.provider, 'https://generativelanguage.googleapis.com')}"
+            f"/v1beta/models/{self.model}:generateContent"
+        )
 
     def is_available(self) -> bool:
         return bool(self.api_key)
 
-    def analyze_phishing(self, text: str, prompt: str) -> Dict:
-        """Analyze using Gemini API"""
-        if not self.is_available():
-            return self._error_response("API key not configured")
-
-        try:
-            full_prompt = f"{prompt}\n\n**통화 내용:**\n\"{text}\""
+    def _build_request(self, text: str, prompt: str) -> Tuple[str, Dict, Dict]:
+        """Request for Gemini API"""
+        full_prompt = f"{prompt}\n\n**통화 내용:**\n\"{text}\""
 
-            headers = {
-                "Content-Type": "application/json"
-            }
+        headers = {
+            "Content-Type": "application/json"
+        }
 
-            payload = {
-                "contents": [{
-                    "parts": [{
-                        "text": full_prompt
-                    }]
-                }],
-                "generationConfig": {
-                    "temperature": 0.2,
-                    "maxOutputTokens": 2048,
-                    "response_mime_type": "application/json"
-                }
+        payload = {
+            "contents": [{
+                "parts": [{
+                    "text": full_prompt
+                }]
+            }],
+            "generationConfig": {
+                "temperature": 0.2,
+                "maxOutputTokens": 2048,
+                "response_mime_type": "application/json"
             }
+        }
 
-            response = requests.post(
-                f"{self.api_url}?key={self.api_key}",
-                headers=headers,
-                json=payload,
-                timeout=30
-            )
-
-            response.raise_for_status()
-            result = response.json()
-
-            # Extract content
-            content = result["candidates"][0]["content"]["parts"][0]["text"]
-
-            # Log raw Gemini response for debugging
-            logger.info(f"[DEBUG] Raw Gemini response (first 300 chars): {content[:300]}")
+        return f"{self.api_url}?key={self.api_key}", headers, payload
 
-            parsed = self._parse_json_response(content)
-            parsed["model"] = self.model_name
+    def _build_batch_request(self, texts: List[str], prompt: str) -> Tuple[str, Dict, Dict]:
+        """Batch request with a JSON-array response schema and room for every verdict"""
+        url, headers, payload = self._build_request(self._format_batch(texts), prompt)
+        generation = payload["generationConfig"]
+        generation["responseSchema"] = BATCH_RESPONSE_SCHEMA
+        generation["maxOutputTokens"] = max(generation["maxOutputTokens"], 2048 + 256 * len(texts))
+        return url, headers, payload
 
-            logger.info(f"✓ {self.model_name} analysis: {parsed.get('score', 0)}/100")
-            return parsed
+    def _extract_content(self, result: Dict) -> str:
+        content = result["candidates"][0]["content"]["parts"][0]["text"]
 
-        except Exception as e:
-            logger.error(f"{self.model_name} error: {e}")
-            return self._error_response(str(e))
+        # Log raw Gemini response for debugging
+        logger.info(f"[DEBUG] Raw Gemini response (first 300 chars): {content[:300]}")
+        return content
 
-    def _error_response(self, error: str) -> Dict:
+    def _extract_usage(self, result: Dict) -> Optional[Dict[str, int]]:
+        usage = result.get("usageMetadata")
+        if not usage:
+            return None
         return {
-            "score": 50,
-            "reasoning": f"Error: {error}",
-            "key_points": [],
-            "model": self.model_name
+            "prompt_tokens": usage.get("promptTokenCount", 0),
+            # thinking models bill reasoning tokens as output
+            "output_tokens": usage.get("candidatesTokenCount", 0) + usage.get("thoughtsTokenCount", 0)
         }
@@ -0,0 +1,320 @@
+"""
+Hedged LLM requests (tail-latency cutting)
+
+``HedgedClient`` wraps a primary client. When the primary has not answered
+within its observed latency quantile (p95 by default), the same request goes
+to a secondary model or provider. The first real answer wins and the other
+call is cancelled. On the blocking path the loser's thread cannot be
+interrupted, so its answer is discarded when it arrives.
+
+Hedges are capped at ``LLM_HEDGE_BUDGET`` of the calls in the latency
+window, so a provider-wide slowdown cannot double the traffic. A primary
+that fails outright with a provider outage (transient error or open circuit)
+fails over to the secondary immediately, outside the budget. Outcomes are
+exported as ``sentinel_llm_hedges_total``.
+"""
+import asyncio
+import contextvars
+import logging
+import threading
+import time
+import weakref
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Optional
+
+from src.config import config
+from src.monitoring import REGISTRY, CallbackGauge, Counter
+
+from .base_client import BaseLLMClient
+from .errors import CircuitOpenError, LLMTransientError
+
+logger = logging.getLogger(__name__)
+
+HEDGES = REGISTRY.register(Counter(
+    "sentinel_llm_hedges_total",
+    "Hedged LLM calls by client and outcome (fired, won, budget_denied, failover)",
+    ["client", "outcome"]
+))
+
+_hedged_clients: "weakref.WeakSet[HedgedClient]" = weakref.WeakSet()
+
+# Primary error types that mean "provider down" rather than "bad request"
+FAILOVER_ERRORS = {LLMTransientError.kind, CircuitOpenError.kind}
+
+# Runs the blocking primary/secondary calls (created lazily, so forked workers get their own)
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _shared_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=config.execution.llm_workers * 2,
+                                               thread_name_prefix="llm-hedge")
+    return _executor
+
+
+class LatencyTracker:
+    """
+    Rolling latency window of the primary → hedge delay, plus the hedge budget
+
+    Args:
+        window: Number of recent calls used for the quantile and the budget
+        quantile: Hedge once a call is slower than this share of recent calls
+        budget: Max share of calls in the window that may be hedged
+        min_samples: Use ``initial_delay`` until this many latencies were seen
+        min_delay: Lower bound for the delay (never hedge instantly)
+    """
+
+    def __init__(self, window: int = 500, quantile: float = 0.95, budget: float = 0.05,
+                 min_samples: int = 20, initial_delay: float = 5.0, min_delay: float = 0.25):
+        self.quantile = quantile
+        self.budget = budget
+        self.min_samples = min_samples
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self._latencies = deque(maxlen=window)
+        self._calls = deque(maxlen=window)  # True for hedged calls
+        self._hedged = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, hedge_config) -> "LatencyTracker":
+        return cls(
+            window=hedge_config.window,
+            quantile=hedge_config.quantile,
+            budget=hedge_config.budget,
+            min_samples=hedge_config.min_samples,
+            initial_delay=hedge_config.initial_delay,
+            min_delay=hedge_config.min_delay
+        )
+
+    def record(self, seconds: float):
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def delay(self) -> float:
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return self.initial_delay
+            ordered = sorted(self._latencies)
+        return max(self.min_delay, ordered[min(len(ordered) - 1, int(len(ordered) * self.quantile))])
+
+    def allow_hedge(self) -> bool:
+        """True if one more hedge stays within the budget (counting the current call)"""
+        with self._lock:
+            return self._hedged + 1 <= self.budget * (len(self._calls) + 1)
+
+    def finish_call(self, hedged: bool):
+        with self._lock:
+            if len(self._calls) == self._calls.maxlen and self._calls[0]:
+                self._hedged -= 1
+            self._calls.append(hedged)
+            self._hedged += hedged
+
+    def stats(self) -> Dict:
+        with self._lock:
+            calls, hedged, samples = len(self._calls), self._hedged, len(self._latencies)
+        return {
+            "delay_seconds": round(self.delay(), 3),
+            "samples": samples,
+            "window_calls": calls,
+            "window_hedged": hedged,
+            "budget": self.budget
+        }
+
+
+class HedgedClient:
+    """
+    Primary client + secondary hedge, same interface as BaseLLMClient
+
+    ``provider`` and ``model_name`` are the primary's; answers from the
+    secondary keep their own ``model`` and are flagged ``"hedged": True``.
+
+    Args:
+        name: Metric label for this call site (``gemini``, ``gemini_second_stage``)
+    """
+
+    def __init__(self, primary: BaseLLMClient, secondary: BaseLLMClient, name: str,
+                 tracker: Optional[LatencyTracker] = None):
+        self.name = name
+        self.primary = primary
+        self.secondary = secondary
+        self.tracker = tracker or LatencyTracker.from_config(config.llm_hedge)
+        self.provider = primary.provider
+        self.model_name = primary.model_name
+        _hedged_clients.add(self)
+        logger.info(f"✓ Hedging {primary.model_name} with {secondary.model_name} "
+                    f"(budget {self.tracker.budget:.0%})")
+
+    def is_available(self) -> bool:
+        return self.primary.is_available()
+
+    def analyze_phishing(self, text: str, prompt: str, **options) -> Dict:
+        """options (max_output_tokens, validate) go to both calls"""
+        if not self.secondary.is_available():
+            return self.primary.analyze_phishing(text, prompt, **options)
+
+        executor = _shared_executor()
+        start = time.perf_counter()
+        primary = executor.submit(
+            contextvars.copy_context().run, self.primary.analyze_phishing, text, prompt, **options
+        )
+        primary.add_done_callback(lambda future: self._record_primary(future, start))
+
+        done, _ = wait([primary], timeout=self.tracker.delay())
+        if done and self._should_fail_over(primary.result()):
+            return self.secondary.analyze_phishing(text, prompt, **options)
+        if done or not self._may_hedge():
+            self.tracker.finish_call(hedged=False)
+            return primary.result()
+
+        secondary = executor.submit(
+            contextvars.copy_context().run, self.secondary.analyze_phishing, text, prompt, **options
+        )
+        roles = {primary: "primary", secondary: "secondary"}
+        answers = []
+        pending = set(roles)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            answers.extend((roles[future], future.result()) for future in done)
+            if any("error" not in answer for _, answer in answers):
+                break
+        for future in pending:
+            future.cancel()  # no-op once running; the late answer is discarded
+        return self._pick(answers)
+
+    async def analyze_phishing_async(self, text: str, prompt: str, **options) -> Dict:
+        if not self.secondary.is_available():
+            return await self.primary.analyze_phishing_async(text, prompt, **options)
+
+        start = time.perf_counter()
+        primary = asyncio.ensure_future(self.primary.analyze_phishing_async(text, prompt, **options))
+        primary.add_done_callback(lambda task: self._record_primary(task, start))
+        tasks = {primary: "primary"}
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=self.tracker.delay())
+            if done and self._should_fail_over(primary.result()):
+                return await self.secondary.analyze_phishing_async(text, prompt, **options)
+            if done or not self._may_hedge():
+                self.tracker.finish_call(hedged=False)
+                return await primary
+
+            secondary = asyncio.ensure_future(self.secondary.analyze_phishing_async(text, prompt, **options))
+            tasks[secondary] = "secondary"
+            answers = []
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                answers.extend((tasks[task], task.result()) for task in done)
+                if any("error" not in answer for _, answer in answers):
+                    break
+            return self._pick(answers)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def analyze_batch(self, texts, prompt: str):
+        """Offline bulk scoring is not latency-critical: primary only, no hedge"""
+        return self.primary.analyze_batch(texts, prompt)
+
+    def stats(self) -> Dict:
+        return {"primary": self.model_name, "secondary": self.secondary.model_name, **self.tracker.stats()}
+
+    def _may_hedge(self) -> bool:
+        if self.tracker.allow_hedge():
+            HEDGES.inc(client=self.name, outcome="fired")
+            return True
+        HEDGES.inc(client=self.name, outcome="budget_denied")
+        return False
+
+    def _should_fail_over(self, result: Dict) -> bool:
+        if result.get("error_type") not in FAILOVER_ERRORS:
+            return False
+        HEDGES.inc(client=self.name, outcome="failover")
+        logger.warning(f"{self.model_name} unavailable ({result['error_type']}), "
+                       f"failing over to {self.secondary.model_name}")
+        self.tracker.finish_call(hedged=False)
+        return True
+
+    def _pick(self, answers) -> Dict:
+        """First real answer in completion order; the primary's error if both failed"""
+        self.tracker.finish_call(hedged=True)
+        winner = next(((role, result) for role, result in answers if "error" not in result), None)
+        if winner is None:
+            winner = next(((role, result) for role, result in answers if role == "primary"), answers[0])
+        role, result = winner
+        if role == "secondary":
+            HEDGES.inc(client=self.name, outcome="won")
+            logger.info(f"Hedge won: {self.secondary.model_name} answered before {self.model_name}")
+        return {**result, "hedged": True}
+
+    def _record_primary(self, future, start: float):
+        """Primary latency sample (a cancelled primary was at least this slow)"""
+        elapsed = time.perf_counter() - start
+        if future.cancelled():
+            self.tracker.record(elapsed)
+            return
+        if future.exception() is not None:
+            return
+        result = future.result()
+        if "error" not in result and not result.get("cached"):
+            self.tracker.record(elapsed)
+
+
+def build_client(spec: str) -> BaseLLMClient:
+    """``"gemini:gemini-2.5-flash-lite"``, ``"openai"``, ... → client instance"""
+    provider, _, model = spec.partition(":")
+    if provider == "gemini":
+        from .gemini_client import GeminiClient
+        return GeminiClient(model=model or None)
+
+    from .anthropic_client import AnthropicClient
+    from .clovax_client import ClovaXClient
+    from .deepseek_client import DeepSeekClient
+    from .openai_client import OpenAIClient
+    from .perplexity_client import PerplexityClient
+    clients = {
+        "openai": OpenAIClient,
+        "deepseek": DeepSeekClient,
+        "perplexity": PerplexityClient,
+        "anthropic": AnthropicClient,
+        "clovax": ClovaXClient
+    }
+    if provider not in clients:
+        raise ValueError(f"Unknown LLM provider '{provider}' in '{spec}'")
+    if model:
+        logger.warning(f"Model '{model}' ignored for {provider} (fixed model)")
+    return clients[provider]()
+
+
+def with_hedging(client: BaseLLMClient, name: str):
+    """``client`` wrapped in a HedgedClient when LLM_HEDGE_ENABLED and the secondary is configured"""
+    if not config.llm_hedge.enabled:
+        return client
+    try:
+        secondary = build_client(config.llm_hedge.secondary)
+    except ValueError as e:
+        logger.error(f"LLM hedging disabled: {e}")
+        return client
+    if not secondary.is_available():
+        logger.warning(f"LLM hedging disabled: {secondary.model_name} has no API key")
+        return client
+    if secondary.endpoint_key == client.endpoint_key:
+        # Same breaker and quota: failover would hit the primary's open circuit / 429s
+        logger.warning(f"LLM hedging disabled: secondary {config.llm_hedge.secondary} is the primary model")
+        return client
+    return HedgedClient(client, secondary, name)
+
+
+def hedge_stats() -> Dict[str, Dict]:
+    return {client.name: client.stats() for client in list(_hedged_clients)}
+
+
+REGISTRY.register(CallbackGauge(
+    "sentinel_llm_hedge_delay_seconds", "Current hedge delay (primary latency quantile)", ["client"],
+    lambda: [({"client": client.name}, client.tracker.delay()) for client in list(_hedged_clients)]
+))
@@ -3,15 +3,48 @@ Multi-Agent ClovaX System for Phishing Detection
 3개의 전문 에이전트가 각각 다른 관점에서 분석
 """
 import asyncio
+import contextvars
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
 from typing import Dict, List, Tuple, Optional
 import json
-import requests
-import os
+
+from src.config import config
+from src.llm.agent_prompts import (
+    AGENTS, COMBINED_AGENT, check_agent_mode, combine_agent_prompts, combined_call_options, split_combined_result
+)
+from src.llm.llm_clients.base_client import BaseLLMClient
+from src.llm.llm_clients.clovax_client import ClovaXClient
+from src.llm.llm_clients.errors import LLMPermanentError, LLMTransientError
+from src.llm.llm_clients.hedged_client import build_client
+from src.monitoring import timed_llm
+from src.server.admission import current_deadline
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+AGENT_NAMES = {
+    "context": "context_analyst",
+    "psychological": "psychological_detector",
+    "financial": "financial_detector"
+}
+
+# Long-lived pool for the concurrent agent calls (created lazily, so forked workers get their own)
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _shared_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=config.execution.multi_agent_workers, thread_name_prefix="multi_agent"
+                )
+    return _executor
+
 
 class MultiAgentPhishingDetector:
     """
@@ -28,13 +61,30 @@ ation Detector (심리 조작 탐지) - 불안/긴급성/권위
         self,
         api_key: Optional[str] = None,
         api_gateway_key: Optional[str] = None,
-        request_id: Optional[str] = None
+        request_id: Optional[str] = None,
+        agent_mode: Optional[str] = None,
+        client: Optional[BaseLLMClient] = None,
+        agent_timeout: Optional[float] = None
     ):
-        self.api_key = api_key or os.getenv("CLOVAX_API_KEY")
-        self.api_gateway_key = api_gateway_key or os.getenv("CLOVAX_GATEWAY_KEY")
+        """
+        Args:
+            api_key, api_gateway_key: ClovaX 키 (기본 클라이언트가 ClovaX일 때)
+            agent_mode: "separate" (Agent별 3회 호출) 또는 "combined" (3개 Agent 점수를
+                구조화 JSON 1회 호출로) (기본값: LLM_AGENT_MODE)
+            client: Agent 호출에 쓸 LLM 클라이언트 (기본값: MULTI_AGENT_CLIENT)
+            agent_timeout: Agent별 응답 대기 시간(초) (기본값: MULTI_AGENT_TIMEOUT_SECONDS)
+        """
         self.request_id = request_id or "sentinel-voice-multi-agent"
+        self.agent_mode = check_agent_mode(agent_mode or config.prompt.agent_mode)
+        self.agent_timeout = agent_timeout or config.multi_agent.agent_timeout_seconds
 
-        self.api_url = "https://clovastudio.stream.ntruss.com/testapp/v1/chat-completions/HCX-003"
+        if client is None:
+            spec = config.multi_agent.client
+            if spec == "clovax":
+                client = ClovaXClient(api_key=api_key, gateway_key=api_gateway_key)
+            else:
+                client = build_client(spec)
+        self.client = client
 
         # Agent weights (can be tuned)
         self.agent_weights = {
@@ -43,13 +93,13 @@ ation Detector (심리 조작 탐지) - 불안/긴급성/권위
             "financial": 0.30      # 30% - 금전/정보 요구
         }
 
-        if not self.api_key:
-            logger.warning("ClovaX API key not configured")
+        if not self.client.is_available():
+            logger.warning(f"{self.client.model_name} API key not configured")
         else:
-            logger.info("Multi-Agent Detector initialized (3 agents)")
+            logger.info(f"Multi-Agent Detector initialized (3 agents, {self.client.model_name})")
 
     def is_available(self) -> bool:
-        return bool(self.api_key and self.api_gateway_key)
+        return self.client.is_available()
 
     def analyze(
         self,
@@ -58,31 +108,41 @@ ation Detector (심리 조작 탐지) - 불안/긴급성/권위
     ) -> Dict:
         """
         Run all 3 agents in parallel and combine results
+
+        Agents that fail or miss the per-agent timeout are left out and the
+        remaining agents' weights are renormalized. If no agent answers, the
+        result carries ``error``/``error_type`` (its 50 is not a verdict).
         """
         if not self.is_available():
-            logger.warning("Gemini not available")
+            logger.warning(f"{self.client.model_name} not available")
             return self._fallback_result()
 
         try:
             # Format similar cases context
             similar_context = self._format_similar_cases(similar_cases)
 
-            logger.info("🤖 Running 3-Agent analysis...")
+            logger.info(f"🤖 Running 3-Agent analysis ({self.agent_mode})...")
 
-            # Run all 3 agents
-            agent1_result = self._agent1_context_analysis(conversation_text, similar_context)
-            agent2_result = self._agent2_psychological_analysis(conversation_text)
-            agent3_result = self._agent3_financial_analysis(conversation_text)
+            # Run all 3 agents concurrently
+            results, error_types = self._run_agents(conversation_text, similar_context)
+            if not any(results.values()):
+                logger.error("Multi-agent analysis failed: no agent answered in time")
+                # 모두 시간 초과면 transient, 아니면 첫 실패 유형
+                error_type = next(iter(error_types.values()), LLMTransientError.kind)
+                return self._fallback_result(error="no agent answered", error_type=error_type)
 
             # Combine results
-            combined = self._combine_results(agent1_result, agent2_result, agent3_result)
+            combined = self._combine_results(results["context"], results["psychological"], results["financial"])
+            combined["agent_mode"] = self.agent_mode
+            combined["agent_results"] = {agent: result for agent, result in results.items() if result is not None}
+            combined["llm_calls"] = 1 if self.agent_mode == "combined" else 3
 
             logger.info(f"✓ Multi-agent analysis complete: {combined['risk_score']}/100")
             return combined
 
         except Exception as e:
             logger.error(f"Multi-agent analysis failed: {e}")
-            return self._fallback_result()
+            return self._fallback_result(error=str(e), error_type=LLMPermanentError.kind)
 
     def _format_similar_cases(self, similar_cases: Optional[List[Tuple[str, float, Dict]]]) -> str:
         """Format similar cases for prompt context"""
@@ -97,12 +157,105 @@ ation Detector (심리 조작 탐지) - 불안/긴급성/권위
             context += f"   \"{script[:120]}...\"\n"
         return context
 
+    def _run_agents(self, text: str, similar_context: str) -> Tuple[Dict[str, Optional[Dict]], Dict[str, str]]:
+        """
+        Agent 호출을 동시에 보내고 agent_timeout(요청 deadline 이내)까지 대기
+        Returns:
+            ({agent: 결과 또는 None (실패/시간 초과)}, {실패한 agent: error_type})
+        """
+        if self.agent_mode == "combined":
+            calls = {COMBINED_AGENT: (self._combined_analysis, (text, similar_context))}
+        else:
+            calls = {
+                "context": (self._agent1_context_analysis, (text, similar_context)),
+                "psychological": (self._agent2_psychological_analysis, (text,)),
+                "financial": (self._agent3_financial_analysis, (text,))
+            }
+
+        executor = _shared_executor()
+        futures = {
+            # Copy the request context so the deadline and per-provider timings carry over
+            executor.submit(contextvars.copy_context().run, method, *args): agent
+            for agent, (method, args) in calls.items()
+        }
+        timeout = self.agent_timeout
+        deadline = current_deadline()
+        if deadline is not None:
+            timeout = min(timeout, deadline.remaining())
+        wait(futures, timeout=timeout)
+
+        results: Dict[str, Optional[Dict]] = {}
+        error_types: Dict[str, str] = {}
+        for future, agent in futures.items():
+            result = None
+            if not future.done():
+                future.cancel()  # 대기 중이면 취소, 실행 중이면 결과 무시
+                logger.warning(f"✗ Agent {agent} timed out after {timeout:.1f}s")
+            elif future.exception() is not None:
+                logger.error(f"✗ Agent {agent} failed: {future.exception()!r}")
+                error_types[agent] = LLMPermanentError.kind
+            else:
+                result = future.result()
+            if agent == COMBINED_AGENT:
+                results.update(result or dict.fromkeys(AGENTS))
+            else:
+                results[agent] = result
+        for agent, result in results.items():
+            if result is not None and "error" in result:
+                logger.warning(f"✗ Agent {agent} failed ({result.get('error_type')}): {result['error']}")
+                error_types[agent] = result.get("error_type", LLMPermanentError.kind)
+                results[agent] = None  # 실패 응답의 50점은 점수에 넣지 않음
+        return results, error_types
+
+    def _combined_analysis(self, text: str, similar_context: str) -> Dict[str, Dict]:
+        """
+        3개 Agent를 구조화 JSON 1회 호출로 실행 (통화 내용은 한 번만 전송)
+        응답을 Agent별 결과로 나눠 separate 모드와 같은 형식으로 반환합니다.
+        """
+        prompts = {
+            "context": self._context_prompt(text, similar_context),
+            "psychological": self._psychological_prompt(text),
+            "financial": self._financial_prompt(text)
+        }
+        prompt = combine_agent_prompts(prompts, transcript_block=self._transcript_block(text))
+        result = self._call_llm(prompt, "combined", text, **combined_call_options())
+        if "error" in result:
+            return dict.fromkeys(AGENTS, result)
+
+        split = split_combined_result(result, AGENTS)
+        for agent, item in split.items():
+            item["agent"] = AGENT_NAMES[agent]
+        return split
+
+    @staticmethod
+    def _transcript_block(text: str) -> str:
+        """Agent 프롬프트에 들어가는 통화 내용 부분"""
+        return f"**통화 내용:**\n\"{text}\""
+
     def _agent1_context_analysis(self, text: str, similar_context: str) -> Dict:
         """
         Agent 1: 맥락 분석가 (Context Analyst)
         대화의 전체적인 흐름, 의도, 논리적 일관성, 그리고 최신 피싱 패턴을 분석합니다.
         """
-        prompt = f"""당신은 최신 피싱 트렌드를 포함한 모든 대화의 맥락을 꿰뚫어 보는 전문가입니다. 다음 통화 내용의 **전체적인 맥락과 숨겨진 의도**를 깊이 있게 분석하세요.
+        return self._call_llm(self._context_prompt(text, similar_context), AGENT_NAMES["context"], text)
+
+    def _agent2_psychological_analysis(self, text: str) -> Dict:
+        """
+        Agent 2: 심리 조작 탐지 (Psychological Manipulation Detector)
+        불안감, 긴급성, 권위, 유대감 형성 등 교묘한 심리적 조작 기법을 분석합니다.
+        """
+        return self._call_llm(self._psychological_prompt(text), AGENT_NAMES["psychological"], text)
+
+    def _agent3_financial_analysis(self, text: str) -> Dict:
+        """
+        Agent 3: 금전/정보 요구 탐지 (Financial/Information Request Detector)
+        직접적/간접적, 명시적/암시적 금전 및 개인/금융정보 요구를 분석합니다.
+        """
+        return self._call_llm(self._financial_prompt(text), AGENT_NAMES["financial"], text)
+
+    def _context_prompt(self, text: str, similar_context: str) -> str:
+        """Agent 1 프롬프트"""
+        return f"""당신은 최신 피싱 트렌드를 포함한 모든 대화의 맥락을 꿰뚫어 보는 전문가입니다. 다음 통화 내용의 **전체적인 맥락과 숨겨진 의도**를 깊이 있게 분석하세요.
 
 **통화 내용:**
 "{text}"
@@ -133,14 +286,9 @@ ation Detector (심리 조작 탐지) - 불안/긴급성/권위
 
 JSON:"""
 
-        return self._call_llm(prompt, "context_analyst")
-
-    def _agent2_psychological_analysis(self, text: str) -> Dict:
-        """
-        Agent 2: 심리 조작 탐지 (Psychological Manipulation Detector)
-        불안감, 긴급성, 권위, 유대감 형성 등 교묘한 심리적 조작 기법을 분석합니다.
-        """
-        prompt = f"""당신은 인간의 심리를 조종하는 모든 기법을 간파하는 프로파일러입니다. 다음 통화에서 사용된 **모든 종류의 심리적 조작 기법**을 찾아내세요.
+    def _psychological_prompt(self, text: str) -> str:
+        """Agent 2 프롬프트"""
+        return f"""당신은 인간의 심리를 조종하는 모든 기법을 간파하는 프로파일러입니다. 다음 통화에서 사용된 **모든 종류의 심리적 조작 기법**을 찾아내세요.
 
 **통화 내용:**
 "{text}"
@@ -174,14 +322,9 @@ JSON:"""
 
 JSON:"""
 
-        return self._call_llm(prompt, "psychological_detector")
-
-    def _agent3_financial_analysis(self, text: str) -> Dict:
-        """
-        Agent 3: 금전/정보 요구 탐지 (Financial/Information Request Detector)
-        직접적/간접적, 명시적/암시적 금전 및 개인/금융정보 요구를 분석합니다.
-        """
-        prompt = f"""당신은 사기꾼들의 모든 '요구'를 꿰뚫어 보는 금융 보안 전문가입니다. 다음 통화 내용에서 **명시적이거나 암시적인 모든 형태의 금전 또는 정보 요구**를 탐지하세요.
+    def _financial_prompt(self, text: str) -> str:
+        """Agent 3 프롬프트"""
+        return f"""당신은 사기꾼들의 모든 '요구'를 꿰뚫어 보는 금융 보안 전문가입니다. 다음 통화 내용에서 **명시적이거나 암시적인 모든 형태의 금전 또는 정보 요구**를 탐지하세요.
 
 **통화 내용:**
 "{text}"
@@ -217,16 +360,20 @@ JSON:"""
 
 JSON:"""
 
-        return self._call_llm(prompt, "financial_detector")
+    def _call_llm(self, prompt: str, agent_name: str, text: str, **options) -> Dict:
+        """
+        Call the LLM client for a single agent
+
+        The client appends the transcript itself, so the copy embedded in the
+        agent prompt is removed (sent once, not twice). ``options`` go to
+        ``analyze_phishing`` (combined call: output-token limit, cache check).
+        """
+        logger.debug(f"Calling {self.client.model_name} for {agent_name}...")
+        prompt = prompt.replace(self._transcript_block(text), "")
+
+        with timed_llm("multi_agent") as call:
+            result = call.check(self.client.analyze_phishing(text, prompt, **options))
 
-    def _call_llm(self, prompt: str, agent_name: str) -> Dict:
-        """Call Gemini API for a single agent"""
-        logger.debug(f"Calling Gemini for {agent_name}...")
-        
-        # GeminiClient의 analyze_phishing 메서드 활용
-        # (이미 JSON 파싱 로직이 포함되어 있다고 가정)
-        result = self.client.analyze_phishing(prompt, prompt) # text 인자에 prompt를 넣어서 처리
-        
         # 결과에 agent 이름 추가
         result['agent'] = agent_name
         logger.debug(f"{agent_name} score: {result.get('score', 0)}")
@@ -259,18 +406,29 @@ JSON:"""
 
     def _combine_results(
         self,
-        agent1: Dict,
-        agent2: Dict,
-        agent3: Dict
+        agent1: Optional[Dict],
+        agent2: Optional[Dict],
+        agent3: Optional[Dict]
     ) -> Dict:
-        """Combine results from all 3 agents"""
+        """
+        Combine results from all 3 agents
+
+        A missing agent (None: failed or timed out) is left out, the other
+        agents' weights are renormalized to sum to 1, its ``agent_scores`` entry
+        is None (not 0, which would read as "safe"), and the confidence is
+        scaled by the share of agents that answered.
+        """
+        results = {"context": agent1, "psychological": agent2, "financial": agent3}
+        missing = [agent for agent, result in results.items() if result is None]
+        weights = {agent: weight for agent, weight in self.agent_weights.items() if results[agent] is not None}
+        total_weight = sum(weights.values())
+        weights = {agent: weight / total_weight for agent, weight in weights.items()}
+        no_answer = {"score": None, "reasoning": "응답 없음 (시간 초과 또는 실패)"}
+        agent1, agent2, agent3 = (result if result is not None else no_answer for result in results.values())
 
         # Calculate weighted final score
-        final_score = (
-            agent1.get("score", 50) * self.agent_weights["context"] +
-            agent2.get("score", 50) * self.agent_weights["psychological"] +
-            agent3.get("score", 50) * self.agent_weights["financial"]
-        )
+        final_score = sum(results[agent].get("score", 50) * weight for agent, weight in weights.items())
+        labels = [result["score"] if result["score"] is not None else "-" for result in (agent1, agent2, agent3)]
 
         final_score = round(final_score, 2)
 
@@ -297,11 +455,11 @@ JSON:"""
 
         # Combined reasoning
         reasoning = f"""
-**맥락 분석 ({agent1.get('score', 0)}점)**: {agent1.get('reasoning', 'N/A')}
+**맥락 분석 ({labels[0]}점)**: {agent1.get('reasoning', 'N/A')}
 
-**심리 조작 ({agent2.get('score', 0)}점)**: {agent2.get('reasoning', 'N/A')}
+**심리 조작 ({labels[1]}점)**: {agent2.get('reasoning', 'N/A')}
 
-**금전/정보 요구 ({agent3.get('score', 0)}점)**: {agent3.get('reasoning', 'N/A')}
+**금전/정보 요구 ({labels[2]}점)**: {agent3.get('reasoning', 'N/A')}
 """.strip()
 
         # Recommendation
@@ -317,21 +475,29 @@ JSON:"""
         return {
             "risk_score": final_score,
             "is_phishing": is_phishing,
-            "confidence": 85,  # High confidence for multi-agent system
+            # High confidence for the full multi-agent system, less with fewer agents
+            "confidence": round(85 * len(weights) / len(results)),
             "techniques": all_techniques,
             "reasoning": reasoning,
             "red_flags": red_flags,
             "recommendation": recommendation,
             "agent_scores": {
-                "context": agent1.get("score", 0),
-                "psychological": agent2.get("score", 0),
-                "financial": agent3.get("score", 0)
-            }
+                "context": agent1.get("score"),
+                "psychological": agent2.get("score"),
+                "financial": agent3.get("score")
+            },
+            "agent_weights": {agent: round(weight, 4) for agent, weight in weights.items()},
+            "missing_agents": missing
         }
 
-    def _fallback_result(self) -> Dict:
-        """Fallback when ClovaX is not available"""
-        return {
+    def _fallback_result(self, error: Optional[str] = None, error_type: Optional[str] = None) -> Dict:
+        """
+        Fallback when the LLM is not available
+
+        Args:
+            error: Why the analysis failed (adds error/error_type; the 50 is not a verdict)
+        """
+        result = {
             "risk_score": 50,
             "is_phishing": False,
             "confidence": 0,
@@ -339,8 +505,17 @@ JSON:"""
             "reasoning": "Gemini API를 사용할 수 없습니다.",
             "red_flags": [],
             "recommendation": "Gemini API 키를 설정하세요.",
-            "agent_scores": {"context": 0, "psychological": 0, "financial": 0}
+            "agent_scores": dict.fromkeys(AGENTS)
         }
+        if error is not None:
+            result.update(
+                reasoning=f"Error: {error}",
+                recommendation="LLM 분석에 실패했습니다.",
+                error=error,
+                error_type=error_type or LLMPermanentError.kind,
+                missing_agents=list(AGENTS)
+            )
+        return result
 
 
 def main():
@@ -2,10 +2,22 @@
 Multi-LLM Ensemble System
 5개 LLM (ClovaX, Gemini, GPT, DeepSeek, Perplexity)을 비교하여 최종 판정
 """
+import asyncio
+import contextvars
 import logging
+import threading
 from typing import Dict, List, Tuple, Optional
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FuturesTimeout
 import statistics
+from collections import Counter
+
+from src.config import config
+from src.llm.agent_prompts import (
+    COMBINED_AGENT, check_agent_mode, combine_agent_prompts, combined_call_options, split_combined_result
+)
+from src.llm.llm_clients.errors import LLMPermanentError, LLMTransientError
+from src.monitoring import timed_llm
 
 try:
     from .clovax_client import ClovaXClient
@@ -19,13 +31,37 @@ from .llm_clients.perplexity_client import PerplexityClient
 
 logger = logging.getLogger(__name__)
 
+AGENT_WEIGHTS = {"context": 0.35, "psychological": 0.35, "financial": 0.30}
+PHISHING_THRESHOLD = 70
+
+# Long-lived pool shared by every analyze() call (created lazily, so forked workers get their own)
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _shared_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=config.execution.ensemble_workers, thread_name_prefix="ensemble"
+                )
+    return _executor
+
 
 class MultiLLMEnsemble:
     """
     5개 LLM을 동시에 실행하여 비교 분석
     """
 
-    def __init__(self):
+    def __init__(self, agent_mode: Optional[str] = None):
+        """
+        Args:
+            agent_mode: "separate" (LLM당 Agent별 3회 호출) 또는 "combined" (LLM당 1회, 3개 Agent 점수를
+                구조화 JSON으로 한 번에 받음) (기본값: LLM_AGENT_MODE)
+        """
+        self.agent_mode = check_agent_mode(agent_mode or config.prompt.agent_mode)
         self.clients = {
             "Gemini": GeminiClient(),
             "GPT": OpenAIClient(),
@@ -42,6 +78,11 @@ class MultiLLMEnsemble:
             if client.is_available()
         }
 
+        # 정족수 모드 (0 = 모든 LLM 대기)
+        self.quorum = config.ensemble.quorum
+        self.quorum_margin = config.ensemble.quorum_margin
+        self.call_timeout = config.ensemble.timeout_seconds
+
         if not self.available_llms:
             logger.warning("⚠️ No LLM API keys configured!")
         else:
@@ -57,58 +98,186 @@ class MultiLLMEnsemble:
     ) -> Dict:
         """
         모든 LLM을 동시 실행하여 비교 분석
+
+        ENSEMBLE_QUORUM > 0 이면 충분한 수의 LLM이 같은 판정에 도달하는 즉시
+        반환하고, 나머지(지연 LLM)는 취소하거나 결과를 무시함
         """
         if not self.is_available():
             return self._fallback_result()
 
         try:
-            # FSS 사례 컨텍스트 생성
-            similar_context = self._format_similar_cases(similar_cases)
-
-            # 3가지 Agent 프롬프트 (multi_agent_detector.py와 동일)
-            prompts = {
-                "context": self._get_context_prompt(conversation_text, similar_context),
-                "psychological": self._get_psychological_prompt(conversation_text),
-                "financial": self._get_financial_prompt(conversation_text)
-            }
+            prompts = self._build_prompts(conversation_text, similar_cases)
 
-            logger.info(f"🤖 Running {len(self.available_llms)} LLMs × 3 agents = {len(self.available_llms) * 3} analyses...")
+            logger.info(
+                f"🤖 Running {len(self.available_llms)} LLMs × {len(prompts)} prompts "
+                f"({self.agent_mode}) = {len(self.available_llms) * len(prompts)} analyses..."
+            )
 
             # 모든 LLM × 모든 Agent를 병렬 실행
-            all_results = {}
-            with ThreadPoolExecutor(max_workers=15) as executor:
-                futures = {}
-
-                for llm_name, client in self.available_llms.items():
-                    for agent_name, prompt in prompts.items():
-                        future = executor.submit(
-                            client.analyze_phishing,
-                            conversation_text,
-                            prompt
-                        )
-                        futures[future] = (llm_name, agent_name)
-
-                # 결과 수집
-                for future in as_completed(futures):
+            # 요청마다 스레드 풀을 만들지 않고 공유 풀 사용 (provider별 동시성/속도는 rate_limit에서 제한)
+            executor = _shared_executor()
+            futures = {}
+
+            for llm_name, client in self.available_llms.items():
+                for agent_name, prompt in prompts.items():
+                    # Copy the request context so per-provider timings keep the endpoint label
+                    future = executor.submit(
+                        contextvars.copy_context().run,
+                        self._call_client,
+                        llm_name,
+                        client,
+                        conversation_text,
+                        prompt
+                    )
+                    futures[future] = (llm_name, agent_name)
+
+            # 결과 수집 (정족수 도달 시 조기 종료)
+            tracker = _QuorumTracker(self, len(prompts))
+            try:
+                for future in as_completed(futures, timeout=self.call_timeout):
                     llm_name, agent_name = futures[future]
                     try:
-                        result = future.result(timeout=35)
-                        key = f"{llm_name}_{agent_name}"
-                        all_results[key] = result
+                        result = future.result()
                         logger.debug(f"✓ {llm_name} {agent_name}: {result.get('score', 0)}")
                     except Exception as e:
                         logger.error(f"✗ {llm_name} {agent_name} failed: {e}")
+                        result = None
+                    if tracker.add(llm_name, agent_name, result):
+                        break
+            except FuturesTimeout:
+                logger.warning(f"Ensemble timed out after {self.call_timeout}s; using finished LLMs")
 
-            # 결과 분석 및 비교
-            comparison = self._compare_results(all_results)
+            # 남은 호출: 대기 중이면 취소, 실행 중이면 결과 무시
+            for future in futures:
+                future.cancel()
 
-            logger.info(f"✓ Ensemble complete: {comparison['ensemble_score']}/100")
-            return comparison
+            return self._finish(tracker)
 
         except Exception as e:
             logger.error(f"Ensemble analysis failed: {e}")
+            return self._fallback_result(error=str(e), error_type=LLMPermanentError.kind)
+
+    async def analyze_async(
+        self,
+        conversation_text: str,
+        similar_cases: Optional[List[Tuple[str, float, Dict]]] = None
+    ) -> Dict:
+        """
+        analyze()와 동일, 모든 LLM × Agent 호출을 하나의 이벤트 루프에서 동시 실행 (호출별 스레드 없음)
+        """
+        if not self.is_available():
             return self._fallback_result()
 
+        tasks = {}
+        try:
+            prompts = self._build_prompts(conversation_text, similar_cases)
+            for llm_name, client in self.available_llms.items():
+                for agent_name, prompt in prompts.items():
+                    task = asyncio.ensure_future(
+                        self._call_client_async(llm_name, client, conversation_text, prompt)
+                    )
+                    tasks[task] = (llm_name, agent_name)
+
+            logger.info(f"🤖 Running {len(tasks)} analyses concurrently (async)...")
+
+            tracker = _QuorumTracker(self, len(prompts))
+            pending = set(tasks)
+            loop = asyncio.get_running_loop()
+            give_up_at = loop.time() + self.call_timeout
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, timeout=give_up_at - loop.time(), return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    logger.warning(f"Ensemble timed out after {self.call_timeout}s; using finished LLMs")
+                    break
+                reached = False
+                for task in done:
+                    llm_name, agent_name = tasks[task]
+                    result = None
+                    if task.exception() is not None:
+                        logger.error(f"✗ {llm_name} {agent_name} failed: {task.exception()!r}")
+                    else:
+                        result = task.result()
+                        logger.debug(f"✓ {llm_name} {agent_name}: {result.get('score', 0)}")
+                    reached = tracker.add(llm_name, agent_name, result) or reached
+                if reached:
+                    break
+
+            return self._finish(tracker)
+
+        except Exception as e:
+            logger.error(f"Ensemble analysis failed: {e}")
+            return self._fallback_result(error=str(e), error_type=LLMPermanentError.kind)
+
+        finally:
+            # 지연 LLM 호출 취소
+            for task in tasks:
+                task.cancel()
+
+    def _finish(self, tracker: "_QuorumTracker") -> Dict:
+        """
+        기여한 LLM만으로 비교 결과 생성 + 정족수/지연 LLM 기록
+
+        기여한 LLM이 없으면 (전부 실패/시간 초과) 중립 50점 대신 error 결과 반환
+        """
+        if tracker.contributors():
+            comparison = self._compare_results(tracker.results, providers=tracker.contributors())
+        else:
+            error = f"no LLM answered ({tracker.calls()} calls finished, all failed)"
+            logger.warning(f"✗ Ensemble failed: {error}")
+            comparison = self._fallback_result(error=error, error_type=tracker.error_type())
+        comparison["contributors"] = tracker.contributors()
+        comparison["stragglers"] = [
+            name for name in self.available_llms if name not in comparison["contributors"]
+        ]
+        comparison["quorum"] = tracker.summary()
+        comparison["llm_calls"] = tracker.calls()
+        comparison["agent_mode"] = self.agent_mode
+        if "error" in comparison:
+            return comparison
+
+        logger.info(
+            f"✓ Ensemble complete: {comparison['ensemble_score']}/100 "
+            f"({len(comparison['contributors'])}/{len(self.available_llms)} LLMs"
+            f"{', quorum ' + tracker.side if tracker.side else ''})"
+        )
+        return comparison
+
+    def _build_prompts(
+        self,
+        conversation_text: str,
+        similar_cases: Optional[List[Tuple[str, float, Dict]]]
+    ) -> Dict[str, str]:
+        """3가지 Agent 프롬프트 (multi_agent_detector.py와 동일), combined 모드는 하나로 합친 프롬프트"""
+        # FSS 사례 컨텍스트 생성
+        similar_context = self._format_similar_cases(similar_cases)
+        prompts = {
+            "context": self._get_context_prompt(conversation_text, similar_context),
+            "psychological": self._get_psychological_prompt(conversation_text),
+            "financial": self._get_financial_prompt(conversation_text)
+        }
+        if self.agent_mode == "combined":
+            return {COMBINED_AGENT: combine_agent_prompts(prompts)}
+        return prompts
+
+    def _call_options(self) -> Dict:
+        """combined 모드: 출력 토큰 상향 + 모든 Agent 점수가 있는 응답만 캐시"""
+        return combined_call_options() if self.agent_mode == "combined" else {}
+
+    def _call_client(self, llm_name: str, client, text: str, prompt: str) -> Dict:
+        """단일 LLM 호출 (provider별 지연 시간 기록)"""
+        with timed_llm(llm_name.lower()) as call:
+            return call.check(client.analyze_phishing(text, prompt, **self._call_options()))
+
+    async def _call_client_async(self, llm_name: str, client, text: str, prompt: str) -> Dict:
+        """단일 LLM 비동기 호출 (비동기 API가 없는 클라이언트는 스레드에서 실행)"""
+        options = self._call_options()
+        with timed_llm(llm_name.lower()) as call:
+            if hasattr(client, "analyze_phishing_async"):
+                return call.check(await client.analyze_phishing_async(text, prompt, **options))
+            return call.check(await asyncio.to_thread(client.analyze_phishing, text, prompt, **options))
+
     def _format_similar_cases(self, similar_cases: Optional[List[Tuple[str, float, Dict]]]) -> str:
         """FSS 사례 포맷"""
         if not similar_cases or len(similar_cases) == 0:
@@ -237,12 +406,28 @@ JSON:"""
 
 JSON:"""
 
-    def _compare_results(self, all_results: Dict) -> Dict:
-        """모든 LLM 결과를 비교 테이블 형식으로 정리 (앙상블X, 비교O)"""
+    def _provider_score(self, all_results: Dict, llm_name: str) -> float:
+        """LLM별 3개 Agent 점수 가중 평균 (응답 없는 Agent는 50점)"""
+        return round(
+            sum(
+                all_results.get(f"{llm_name}_{agent}", {}).get("score", 50) * weight
+                for agent, weight in AGENT_WEIGHTS.items()
+            ),
+            2
+        )
+
+    def _compare_results(self, all_results: Dict, providers: Optional[List[str]] = None) -> Dict:
+        """
+        LLM 결과를 비교 테이블 형식으로 정리 (앙상블X, 비교O)
+
+        Args:
+            providers: 비교에 포함할 LLM (기본: 사용 가능한 전체 LLM)
+        """
+        if providers is None:
+            providers = list(self.available_llms.keys())
 
         # LLM별로 3개 Agent 점수 가중 평균 계산
         llm_scores = {}
-        weights = {"context": 0.35, "psychological": 0.35, "financial": 0.30}
 
         comparison_table = []
         comparison_table.append("\n" + "="*80)
@@ -251,17 +436,12 @@ JSON:"""
         comparison_table.append(f"{'LLM':<15} {'맥락(35%)':<12} {'심리(35%)':<12} {'금전(30%)':<12} {'최종점수':<10}")
         comparison_table.append("-"*80)
 
-        for llm_name in self.available_llms.keys():
+        for llm_name in providers:
             context_score = all_results.get(f"{llm_name}_context", {}).get("score", 50)
             psych_score = all_results.get(f"{llm_name}_psychological", {}).get("score", 50)
             fin_score = all_results.get(f"{llm_name}_financial", {}).get("score", 50)
 
-            final = round(
-                context_score * weights["context"] +
-                psych_score * weights["psychological"] +
-                fin_score * weights["financial"],
-                2
-            )
+            final = self._provider_score(all_results, llm_name)
 
             llm_scores[llm_name] = final
 
@@ -286,7 +466,7 @@ JSON:"""
 
         # 상세 분석 (각 LLM의 reasoning)
         detailed_analysis = []
-        for llm_name in self.available_llms.keys():
+        for llm_name in providers:
             detailed_analysis.append(f"\n--- {llm_name} ({llm_scores.get(llm_name, 0)}점) ---")
             for agent in ["context", "psychological", "financial"]:
                 key = f"{llm_name}_{agent}"
@@ -298,7 +478,8 @@ JSON:"""
 
         return {
             "risk_score": avg,  # 참고용 평균값
-            "is_phishing": avg >= 70,
+            "ensemble_score": avg,
+            "is_phishing": avg >= PHISHING_THRESHOLD,
             "confidence": 0,  # 사용자가 직접 판단하므로 0
             "comparison_table": "\n".join(comparison_table),
             "llm_scores": llm_scores,  # 각 LLM별 최종 점수
@@ -316,9 +497,14 @@ JSON:"""
             "red_flags": []
         }
 
-    def _fallback_result(self) -> Dict:
-        """LLM을 사용할 수 없을 때"""
-        return {
+    def _fallback_result(self, error: Optional[str] = None, error_type: Optional[str] = None) -> Dict:
+        """
+        LLM을 사용할 수 없을 때
+
+        Args:
+            error: 분석 실패 사유 (주어지면 error/error_type 포함; 50점은 판정이 아님)
+        """
+        result = {
             "risk_score": 50,
             "is_phishing": False,
             "confidence": 0,
@@ -330,3 +516,97 @@ JSON:"""
             "techniques": [],
             "red_flags": []
         }
+        if error is not None:
+            result.update(
+                reasoning=f"Error: {error}",
+                recommendation="LLM 분석에 실패했습니다.",
+                error=error,
+                error_type=error_type or LLMPermanentError.kind
+            )
+        return result
+
+
+class _QuorumTracker:
+    """
+    LLM × Agent 결과 수집 + 정족수 판정
+
+    combined 모드의 결과는 Agent별 결과로 나눠 기록 (LLM당 호출 1회).
+    한 LLM의 모든 Agent 호출이 끝나면 그 LLM의 점수가 투표가 됨:
+    PHISHING_THRESHOLD ± margin 바깥이면 피싱/정상 표, 그 사이면 기권.
+    한쪽 표가 quorum 이상이고 반대쪽 표가 없으면 정족수 도달.
+    """
+
+    def __init__(self, ensemble: MultiLLMEnsemble, agents_per_llm: int):
+        self.ensemble = ensemble
+        self.agents_per_llm = agents_per_llm
+        self.results: Dict[str, Dict] = {}
+        self._finished: Dict[str, int] = {}
+        self._succeeded: Dict[str, int] = {}
+        self.completed: List[str] = []  # 모든 Agent가 끝난 LLM (완료 순서)
+        self.votes = {"phishing": [], "safe": []}
+        self.side: Optional[str] = None
+        self.error_types: List[str] = []  # 실패한 호출의 error_type
+
+    def add(self, llm_name: str, agent_name: str, result: Optional[Dict]) -> bool:
+        """결과 하나 기록; 정족수에 도달하면 True"""
+        self._finished[llm_name] = self._finished.get(llm_name, 0) + 1
+        if result is not None and "error" in result:
+            logger.warning(f"✗ {llm_name} {agent_name} failed ({result.get('error_type')}): {result['error']}")
+            self.error_types.append(result.get("error_type", LLMPermanentError.kind))
+            result = None  # 실패 응답의 50점은 투표/점수에 넣지 않음
+        elif result is None:
+            self.error_types.append(LLMPermanentError.kind)  # 예외로 끝난 호출
+        items = {agent_name: result}
+        if agent_name == COMBINED_AGENT and result is not None:
+            # 응답에 없는 Agent는 실패로 취급 (가중 평균에서 50점)
+            items = {
+                agent: item for agent, item in split_combined_result(result).items() if "error" not in item
+            }
+        for agent, item in items.items():
+            if item is not None:
+                self.results[f"{llm_name}_{agent}"] = item
+                self._succeeded[llm_name] = self._succeeded.get(llm_name, 0) + 1
+
+        if self._finished[llm_name] < self.agents_per_llm:
+            return False
+        self.completed.append(llm_name)
+        if not self._succeeded.get(llm_name):
+            return False  # 모든 Agent 실패: 투표 없음
+
+        score = self.ensemble._provider_score(self.results, llm_name)
+        if score >= PHISHING_THRESHOLD + self.ensemble.quorum_margin:
+            self.votes["phishing"].append(llm_name)
+        elif score <= PHISHING_THRESHOLD - self.ensemble.quorum_margin:
+            self.votes["safe"].append(llm_name)
+
+        if self.ensemble.quorum <= 0:
+            return False
+        for side, other in (("phishing", "safe"), ("safe", "phishing")):
+            if len(self.votes[side]) >= self.ensemble.quorum and not self.votes[other]:
+                self.side = side
+                return True
+        return False
+
+    def contributors(self) -> List[str]:
+        """결과에 반영된 LLM (모든 Agent가 끝났고 하나 이상 성공)"""
+        return [name for name in self.completed if self._succeeded.get(name)]
+
+    def error_type(self) -> str:
+        """가장 많은 실패 유형 (끝난 호출이 없으면 시간 초과 = transient)"""
+        if not self.error_types:
+            return LLMTransientError.kind
+        return Counter(self.error_types).most_common(1)[0][0]
+
+    def calls(self) -> int:
+        """완료된 LLM 호출 수 (실패 포함, 취소된 호출 제외)"""
+        return sum(self._finished.values())
+
+    def summary(self) -> Dict:
+        return {
+            "enabled": self.ensemble.quorum > 0,
+            "required": self.ensemble.quorum,
+            "margin": self.ensemble.quorum_margin,
+            "reached": self.side is not None,
+            "side": self.side,
+            "votes": {side: list(names) for side, names in self.votes.items()}
+        }
@@ -0,0 +1,209 @@
+"""
+Per-provider LLM concurrency and rate limits
+
+Every LLM provider gets one process-wide ``ProviderLimiter``, shared by all
+clients and requests (detector, 2nd stage verifier, ensemble):
+
+- a semaphore caps the calls in flight to the provider,
+- a token bucket spaces calls to the provider's requests-per-minute quota.
+
+The bucket hands out send times in arrival order (GCRA), so a traffic burst
+queues first-come first-served instead of retrying into 429 storms.
+
+Limits are ``"<max concurrent>:<requests per minute>"`` strings from
+``config.llm_limits`` (``LLM_LIMIT_GEMINI=16:600`` ...). Providers with
+per-model quotas get one limiter per model (``gemini:gemini-2.5-flash``),
+each with the provider's limits.
+"""
+import asyncio
+import logging
+import threading
+import time
+import weakref
+from contextlib import asynccontextmanager, contextmanager
+from typing import Dict, Tuple
+
+from src.config import config
+from src.monitoring import REGISTRY, CallbackGauge, Histogram
+
+logger = logging.getLogger(__name__)
+
+LIMITER_WAIT_SECONDS = REGISTRY.register(Histogram(
+    "sentinel_llm_limiter_wait_seconds",
+    "Time an LLM call waited for its provider's concurrency slot and rate token",
+    ["provider"],
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+))
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket (GCRA form)
+
+    ``reserve()`` books the next free send time and returns how long to wait
+    for it; callers that arrive earlier always get earlier slots.
+    """
+
+    def __init__(self, rate_per_second: float, burst: int):
+        self.interval = 1.0 / rate_per_second
+        self.burst = max(1, burst)
+        self._lock = threading.Lock()
+        self._tat = time.monotonic()  # theoretical arrival time of the next token
+
+    def reserve(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            tat = max(self._tat, now)
+            self._tat = tat + self.interval
+            return max(0.0, tat - now - (self.burst - 1) * self.interval)
+
+    def acquire(self):
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class ProviderLimiter:
+    """Concurrency slot + rate token for one provider (sync and async callers)"""
+
+    def __init__(self, provider: str, max_concurrent: int, requests_per_minute: float):
+        self.provider = provider
+        self.max_concurrent = max(1, max_concurrent)
+        self.requests_per_minute = requests_per_minute
+        self.bucket = TokenBucket(
+            requests_per_minute / 60.0, burst=self.max_concurrent
+        ) if requests_per_minute > 0 else None
+        self._semaphore = threading.BoundedSemaphore(self.max_concurrent)
+        # asyncio semaphores belong to one event loop
+        self._async_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = \
+            weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._waiting = 0
+
+    @contextmanager
+    def limit(self):
+        """Hold a slot and a rate token for one blocking call"""
+        start = time.perf_counter()
+        self._enter_wait()
+        acquired = False
+        try:
+            self._semaphore.acquire()
+            try:
+                if self.bucket is not None:
+                    self.bucket.acquire()
+            except BaseException:
+                self._semaphore.release()
+                raise
+            acquired = True
+        finally:
+            self._leave_wait(start, acquired)
+
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+            self._semaphore.release()
+
+    @asynccontextmanager
+    async def limit_async(self):
+        """Hold a slot and a rate token for one call awaited on the event loop"""
+        semaphore = self._async_semaphore()
+        start = time.perf_counter()
+        self._enter_wait()
+        acquired = False
+        try:
+            await semaphore.acquire()
+            try:
+                if self.bucket is not None:
+                    await self.bucket.acquire_async()
+            except BaseException:
+                semaphore.release()
+                raise
+            acquired = True
+        finally:
+            self._leave_wait(start, acquired)
+
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+            semaphore.release()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "max_concurrent": self.max_concurrent,
+                "requests_per_minute": self.requests_per_minute,
+                "in_flight": self._in_flight,
+                "waiting": self._waiting
+            }
+
+    def _async_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._async_semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._async_semaphores[loop] = asyncio.Semaphore(self.max_concurrent)
+        return semaphore
+
+    def _enter_wait(self):
+        with self._lock:
+            self._waiting += 1
+
+    def _leave_wait(self, start: float, acquired: bool):
+        with self._lock:
+            self._waiting -= 1
+            if acquired:
+                self._in_flight += 1
+        if acquired:
+            LIMITER_WAIT_SECONDS.observe(time.perf_counter() - start, provider=self.provider)
+
+
+def parse_limit(spec: str) -> Tuple[int, float]:
+    """``"16:600"`` → (16 concurrent, 600 requests/minute); rpm 0 = no rate limit"""
+    concurrent, _, rpm = spec.partition(":")
+    return int(concurrent), float(rpm or 0)
+
+
+_limiters: Dict[str, ProviderLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(provider: str) -> ProviderLimiter:
+    """
+    Process-wide limiter for ``provider`` (gemini, openai, deepseek, perplexity, clovax, ...)
+    or one of its models (``gemini:gemini-2.5-flash-lite``, a client's ``endpoint_key``)
+    """
+    limiter = _limiters.get(provider)
+    if limiter is None:
+        with _limiters_lock:
+            limiter = _limiters.get(provider)
+            if limiter is None:
+                spec = getattr(config.llm_limits, provider.partition(":")[0], config.llm_limits.default)
+                max_concurrent, rpm = parse_limit(spec)
+                limiter = _limiters[provider] = ProviderLimiter(provider, max_concurrent, rpm)
+                logger.info(f"LLM limiter {provider}: {max_concurrent} concurrent, {rpm:g} rpm")
+    return limiter
+
+
+def limiter_stats() -> Dict[str, Dict]:
+    with _limiters_lock:
+        limiters = dict(_limiters)
+    return {provider: limiter.stats() for provider, limiter in limiters.items()}
+
+
+REGISTRY.register(CallbackGauge(
+    "sentinel_llm_limiter_waiting", "LLM calls waiting for a provider slot or rate token", ["provider"],
+    lambda: [({"provider": name}, s["waiting"]) for name, s in limiter_stats().items()]
+))
+REGISTRY.register(CallbackGauge(
+    "sentinel_llm_limiter_in_flight", "LLM calls in flight per provider", ["provider"],
+    lambda: [({"provider": name}, s["in_flight"]) for name, s in limiter_stats().items()]
+))
@@ -0,0 +1,36 @@
+"""
+Monitoring module (latency histograms, Prometheus /metrics export)
+"""
+from .metrics import (
+    REGISTRY,
+    CallbackCounter,
+    CallbackGauge,
+    Counter,
+    Histogram,
+    MetricsRegistry,
+    RequestTimings,
+    current_timings,
+    record_llm_tokens,
+    record_rule_outcome,
+    timed,
+    timed_llm,
+    track_endpoint,
+    track_request,
+)
+
+__all__ = [
+    "REGISTRY",
+    "CallbackCounter",
+    "CallbackGauge",
+    "Counter",
+    "Histogram",
+    "MetricsRegistry",
+    "RequestTimings",
+    "current_timings",
+    "record_llm_tokens",
+    "record_rule_outcome",
+    "timed",
+    "timed_llm",
+    "track_endpoint",
+    "track_request",
+]
@@ -0,0 +1,334 @@
+"""
+Per-stage latency histograms exported in Prometheus text format
+
+No client library is required: the handful of metric types used here
+(histogram, counter, callback gauge) are implemented directly and rendered
+by ``REGISTRY.render()`` for ``GET /metrics``.
+
+Request context (endpoint label, per-request timings) travels in contextvars,
+so stages running on the executor threads (which copy the caller's context)
+are attributed to the endpoint that submitted them:
+
+    with track_request("gemini") as timings:
+        ...
+        with timed("rule_filter"):
+            ...
+    timings.as_dict()  # → {"llm_gemini": 1.21, "rule_filter": 0.002}
+"""
+import functools
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labelnames: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    type_name = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+
+
+class Counter(_Metric):
+    """Monotonic counter"""
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket histogram (seconds)"""
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # key -> (per-bucket counts incl. +Inf, sum, count)
+        self._series: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with self._lock:
+            for key, (counts, total, count) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, n in zip(self.buckets + (float("inf"),), counts):
+                    cumulative += n
+                    le = f'le="{_format_value(bound)}"'
+                    lines.append(
+                        f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}"
+                    )
+                labels = _format_labels(self.labelnames, key)
+                lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+                lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class CallbackGauge(_Metric):
+    """Gauge whose samples are read from a callback at scrape time"""
+    type_name = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str],
+                 callback: Callable[[], Iterable[Tuple[Dict[str, str], float]]]):
+        super().__init__(name, documentation, labelnames)
+        self.callback = callback
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        try:
+            samples = list(self.callback())
+        except Exception as e:
+            logger.warning(f"Gauge {self.name} callback failed: {e}")
+            samples = []
+        for labels, value in samples:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, self._key(labels))} {_format_value(value)}")
+        return lines
+
+
+class CallbackCounter(CallbackGauge):
+    """Counter read from a callback (for components that keep their own totals)"""
+    type_name = "counter"
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together for /metrics"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            # Re-registering (e.g. module reload) keeps the existing series
+            return self._metrics.setdefault(metric.name, metric)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+STAGE_SECONDS = REGISTRY.register(Histogram(
+    "sentinel_stage_duration_seconds",
+    "Time spent in one pipeline stage (decode, stt, embedding, faiss_search, rule_filter, pii_masking)",
+    ["stage", "endpoint"]
+))
+LLM_SECONDS = REGISTRY.register(Histogram(
+    "sentinel_llm_request_duration_seconds",
+    "Duration of one LLM provider call",
+    ["provider", "endpoint", "status"]
+))
+REQUEST_SECONDS = REGISTRY.register(Histogram(
+    "sentinel_request_duration_seconds",
+    "End-to-end analysis request duration by rule outcome",
+    ["endpoint", "rule"]
+))
+LLM_TOKENS = REGISTRY.register(Counter(
+    "sentinel_llm_tokens_total",
+    "LLM tokens billed by provider and kind (prompt, output)",
+    ["provider", "kind"]
+))
+RULE_OUTCOMES = REGISTRY.register(Counter(
+    "sentinel_rule_outcomes_total",
+    "Rule filter outcomes (which rule decided the verdict)",
+    ["endpoint", "rule"]
+))
+
+
+class RequestTimings:
+    """Per-request stage durations (seconds, summed per stage)"""
+
+    def __init__(self, endpoint: str):
+        self.endpoint = endpoint
+        self.rule: Optional[str] = None
+        self._stages: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._start = time.perf_counter()
+
+    def add(self, stage: str, seconds: float):
+        with self._lock:
+            self._stages[stage] = self._stages.get(stage, 0.0) + seconds
+
+    def set_rule(self, rule: str):
+        with self._lock:
+            # Batch requests can see several outcomes
+            self.rule = rule if self.rule in (None, rule) else "mixed"
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._start
+
+    def as_dict(self) -> Dict[str, float]:
+        with self._lock:
+            stages = {stage: round(seconds, 4) for stage, seconds in self._stages.items()}
+        stages["total"] = round(self.elapsed, 4)
+        return stages
+
+
+_current: ContextVar[Optional[RequestTimings]] = ContextVar("sentinel_request_timings", default=None)
+
+
+def current_timings() -> Optional[RequestTimings]:
+    return _current.get()
+
+
+def _endpoint() -> str:
+    timings = _current.get()
+    return timings.endpoint if timings else "none"
+
+
+@contextmanager
+def track_request(endpoint: str):
+    """Attribute all stages inside this block to ``endpoint``; records the request duration"""
+    timings = RequestTimings(endpoint)
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        _current.reset(token)
+        REQUEST_SECONDS.observe(timings.elapsed, endpoint=endpoint, rule=timings.rule or "none")
+
+
+def track_endpoint(endpoint: str):
+    """Decorator form of ``track_request`` for async FastAPI handlers"""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with track_request(endpoint):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def timed(stage: str):
+    """Time one pipeline stage"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_SECONDS.observe(elapsed, stage=stage, endpoint=_endpoint())
+        timings = _current.get()
+        if timings is not None:
+            timings.add(stage, elapsed)
+
+
+class LLMCall:
+    """Handle yielded by ``timed_llm``; ``check`` marks an error result"""
+
+    def __init__(self):
+        self.status = "ok"
+
+    def check(self, result):
+        """
+        Return ``result`` unchanged, setting status=error if it is an error
+        result (the clients return ``{"error": ...}`` instead of raising). For
+        a batch (list of results) any failed item marks the call.
+        """
+        items = result if isinstance(result, list) else [result]
+        if any(isinstance(item, dict) and "error" in item for item in items):
+            self.status = "error"
+        return result
+
+
+@contextmanager
+def timed_llm(provider: str):
+    """
+    Time one LLM provider call
+
+    status=error if the call raises or its result is passed to the yielded
+    ``LLMCall.check`` and carries an ``error``.
+    """
+    start = time.perf_counter()
+    call = LLMCall()
+    try:
+        yield call
+    except Exception:
+        call.status = "error"
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        LLM_SECONDS.observe(elapsed, provider=provider, endpoint=_endpoint(), status=call.status)
+        timings = _current.get()
+        if timings is not None:
+            timings.add(f"llm_{provider}", elapsed)
+
+
+def record_llm_tokens(provider: str, usage: Dict[str, int]):
+    """Count one call's prompt/output tokens (``usage`` as returned by the LLM clients)"""
+    for kind in ("prompt", "output"):
+        tokens = usage.get(f"{kind}_tokens")
+        if tokens:
+            LLM_TOKENS.inc(tokens, provider=provider, kind=kind)
+
+
+def record_rule_outcome(rule: str):
+    """Count which rule decided a verdict and tag the current request with it"""
+    RULE_OUTCOMES.inc(endpoint=_endpoint(), rule=rule)
+    timings = _current.get()
+    if timings is not None:
+        timings.set_rule(rule)
@@ -49,10 +49,11 @@ class PhishingDetectionPipeline:
         self.stt = stt_model or WhisperSTT(model_size="base")
         logger.info("STT initialized")
 
-        # Initialize Vector Store
+        # Initialize Vector Store (skip loading if the caller already did, e.g. warm-up)
         self.vector_store = vector_store or PhishingVectorStore()
         try:
-            self.vector_store.load()
+            if self.vector_store.index is None:
+                self.vector_store.load()
             logger.info(f"Vector store loaded with {len(self.vector_store.scripts)} scripts")
         except:
             logger.warning("Vector store not loaded - similarity search will be limited")
@@ -0,0 +1,243 @@
+"""
+Admission control: per-request deadlines and bounded in-flight work per stage
+
+Every analysis request gets a ``Deadline`` (``ADMISSION_DEADLINE_SECONDS``).
+Stages are admitted through ``AdmissionController.run``, which
+
+- refuses to start a stage when the remaining budget is below the stage's
+  minimum (``DeadlineExceeded``),
+- waits for an in-flight slot only as long as the budget allows
+  (``StageSaturated``) - a slot is held until the blocking call actually
+  finishes, so abandoned calls still count against the limit,
+- stops waiting for the result when the deadline passes (``DeadlineExceeded``).
+
+Handlers catch ``AdmissionError`` for optional stages (the LLM) and fall back
+to the RiskScorer + keyword rules with ``degraded: true``. The deadline also
+travels in a contextvar so LLM clients can bound their HTTP timeouts by it
+(``deadline_timeout``).
+"""
+import asyncio
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class AdmissionError(Exception):
+    """Base class: a stage could not be run within the request's budget"""
+
+    def __init__(self, stage: str, message: str):
+        super().__init__(message)
+        self.stage = stage
+
+
+class DeadlineExceeded(AdmissionError):
+    """The request's deadline passed (or would pass) before the stage finished"""
+    pass
+
+
+class StageSaturated(AdmissionError):
+    """No in-flight slot became free for the stage within the budget"""
+    pass
+
+
+class StageFailed(AdmissionError):
+    """The stage ran but its dependency failed (e.g. LLM provider outage or open circuit)"""
+    pass
+
+
+class Deadline:
+    """Absolute per-request time budget"""
+
+    def __init__(self, seconds: float, clock: Callable[[], float] = time.monotonic):
+        self.budget = seconds
+        self._clock = clock
+        self.expires_at = clock() + seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - self._clock())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+
+_current_deadline: ContextVar[Optional[Deadline]] = ContextVar("sentinel_deadline", default=None)
+
+
+def current_deadline() -> Optional[Deadline]:
+    return _current_deadline.get()
+
+
+@contextmanager
+def deadline_scope(seconds: float):
+    """Set the deadline for everything run inside this block (incl. executor threads)"""
+    deadline = Deadline(seconds)
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
+
+
+def deadline_timeout(default: float, grace: float = 0.5) -> float:
+    """
+    HTTP timeout bounded by the current request's remaining budget
+
+    ``grace`` lets the handler's own deadline fire first, so the request
+    degrades instead of surfacing a client timeout error.
+    """
+    deadline = _current_deadline.get()
+    if deadline is None:
+        return default
+    return max(0.1, min(default, deadline.remaining() + grace))
+
+
+class AdmissionController:
+    """
+    Bounded in-flight work per stage, enforced against the current deadline
+
+    Args:
+        executors: StageExecutors the admitted calls run on
+        limits: stage → max in-flight calls (queued + running + abandoned)
+        min_budget: stage → minimum remaining seconds needed to start the stage
+    """
+
+    def __init__(self, executors, limits: Dict[str, int], min_budget: Dict[str, float]):
+        self.executors = executors
+        self.limits = {stage: max(1, limit) for stage, limit in limits.items()}
+        self.min_budget = dict(min_budget)
+        self._semaphores = {stage: asyncio.Semaphore(limit) for stage, limit in self.limits.items()}
+        self._lock = threading.Lock()
+        self._in_flight = {stage: 0 for stage in self.limits}
+        self._counters = {
+            stage: {"admitted": 0, "deadline_exceeded": 0, "saturated": 0}
+            for stage in self.limits
+        }
+
+    @classmethod
+    def from_config(cls, executors, admission_config) -> "AdmissionController":
+        return cls(
+            executors,
+            limits={
+                "stt": admission_config.stt_inflight,
+                "embedding": admission_config.embedding_inflight,
+                "llm": admission_config.llm_inflight
+            },
+            min_budget={
+                "stt": admission_config.stt_min_budget,
+                "embedding": admission_config.embedding_min_budget,
+                "llm": admission_config.llm_min_budget
+            }
+        )
+
+    async def run(self, stage: str, fn: Callable, *args, **kwargs) -> Any:
+        """
+        Run a blocking call on ``stage`` within the current deadline
+
+        Raises:
+            DeadlineExceeded: budget too small to start, or passed while running
+            StageSaturated: no in-flight slot freed up in time
+            StageQueueFull: the stage executor's queue is full
+        """
+        if stage not in self._semaphores:
+            return await self.executors.run(stage, fn, *args, **kwargs)
+
+        deadline = _current_deadline.get()
+        await self._acquire(stage, deadline)
+
+        try:
+            future = self.executors.submit(stage, fn, *args, **kwargs)
+        except Exception:
+            self._semaphores[stage].release()
+            raise
+
+        with self._lock:
+            self._in_flight[stage] += 1
+            self._counters[stage]["admitted"] += 1
+        loop = asyncio.get_running_loop()
+        future.add_done_callback(lambda _: self._release(loop, stage))
+
+        if deadline is None:
+            return await asyncio.wrap_future(future)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout=deadline.remaining())
+        except asyncio.TimeoutError:
+            self._count(stage, "deadline_exceeded")
+            raise DeadlineExceeded(stage, f"Deadline passed while waiting for stage '{stage}'")
+
+    async def run_async(self, stage: str, coro_fn: Callable, *args, **kwargs) -> Any:
+        """
+        Like ``run`` for a coroutine function awaited on the event loop (async LLM clients)
+
+        No executor thread is involved; at the deadline the coroutine is
+        cancelled, which also frees its in-flight slot right away.
+        """
+        if stage not in self._semaphores:
+            return await coro_fn(*args, **kwargs)
+
+        deadline = _current_deadline.get()
+        await self._acquire(stage, deadline)
+        with self._lock:
+            self._in_flight[stage] += 1
+            self._counters[stage]["admitted"] += 1
+
+        try:
+            if deadline is None:
+                return await coro_fn(*args, **kwargs)
+            try:
+                return await asyncio.wait_for(coro_fn(*args, **kwargs), timeout=deadline.remaining())
+            except asyncio.TimeoutError:
+                self._count(stage, "deadline_exceeded")
+                raise DeadlineExceeded(stage, f"Deadline passed while waiting for stage '{stage}'")
+        finally:
+            with self._lock:
+                self._in_flight[stage] -= 1
+            self._semaphores[stage].release()
+
+    def stats(self) -> Dict[str, Dict]:
+        with self._lock:
+            return {
+                stage: {
+                    "in_flight": self._in_flight[stage],
+                    "limit": self.limits[stage],
+                    "min_budget": self.min_budget.get(stage, 0.0),
+                    **self._counters[stage]
+                }
+                for stage in self.limits
+            }
+
+    async def _acquire(self, stage: str, deadline: Optional[Deadline]):
+        """Take an in-flight slot, waiting no longer than the budget allows"""
+        semaphore = self._semaphores[stage]
+        if deadline is None:
+            await semaphore.acquire()
+            return
+
+        slack = deadline.remaining() - self.min_budget.get(stage, 0.0)
+        if slack <= 0:
+            self._count(stage, "deadline_exceeded")
+            raise DeadlineExceeded(stage, f"Not enough budget left for stage '{stage}'")
+        try:
+            await asyncio.wait_for(semaphore.acquire(), timeout=slack)
+        except asyncio.TimeoutError:
+            self._count(stage, "saturated")
+            raise StageSaturated(
+                stage, f"Stage '{stage}' has {self.limits[stage]} calls in flight"
+            )
+
+    def _count(self, stage: str, counter: str):
+        with self._lock:
+            self._counters[stage][counter] += 1
+
+    def _release(self, loop: asyncio.AbstractEventLoop, stage: str):
+        # Runs on the worker thread (or the loop, if cancelled before starting)
+        with self._lock:
+            self._in_flight[stage] -= 1
+        try:
+            loop.call_soon_threadsafe(self._semaphores[stage].release)
+        except RuntimeError:
+            pass  # loop closed during shutdown
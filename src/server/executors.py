@@ -0,0 +1,162 @@
+"""
+Bounded per-stage executors for blocking work on the request path
+
+The FastAPI handlers are ``async def`` but the heavy lifting (Whisper STT,
+sentence embedding + FAISS search, synchronous LLM HTTP calls) blocks. Each
+stage gets its own thread pool so a slow Gemini call cannot starve STT or
+vector search, and a bounded queue so overload turns into a fast 503 instead
+of an ever-growing backlog.
+"""
+import asyncio
+import contextvars
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+STAGE_STT = "stt"
+STAGE_EMBEDDING = "embedding"
+STAGE_LLM = "llm"
+
+
+class StageQueueFull(Exception):
+    """Raised when a stage already has ``max_queue`` tasks waiting"""
+
+    def __init__(self, stage: str, max_queue: int):
+        super().__init__(f"Stage '{stage}' queue is full ({max_queue} waiting)")
+        self.stage = stage
+        self.max_queue = max_queue
+
+
+class StageExecutor:
+    """
+    Thread pool for one pipeline stage with queue-depth accounting
+
+    Gauges:
+        queued: tasks submitted but not yet picked up by a worker
+        active: tasks currently running on a worker
+        peak_queued: high-water mark of ``queued`` since start
+    """
+
+    def __init__(self, name: str, max_workers: int, max_queue: int):
+        self.name = name
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(1, max_queue)
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix=f"sentinel-{name}"
+        )
+        self._lock = threading.Lock()
+
+        self.queued = 0
+        self.active = 0
+        self.peak_queued = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        """
+        Submit a blocking call, copying the caller's contextvars into the worker
+
+        Raises:
+            StageQueueFull: if ``max_queue`` tasks are already waiting
+        """
+        with self._lock:
+            if self.queued >= self.max_queue:
+                self.rejected += 1
+                raise StageQueueFull(self.name, self.max_queue)
+            self.queued += 1
+            self.peak_queued = max(self.peak_queued, self.queued)
+
+        ctx = contextvars.copy_context()
+        future = self._pool.submit(self._invoke, ctx, fn, args, kwargs)
+        future.add_done_callback(self._on_done)
+        return future
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run a blocking call on this stage's pool and await its result"""
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    def _invoke(self, ctx: contextvars.Context, fn: Callable, args: tuple, kwargs: dict) -> Any:
+        with self._lock:
+            self.queued -= 1
+            self.active += 1
+        try:
+            return ctx.run(fn, *args, **kwargs)
+        except Exception:
+            with self._lock:
+                self.failed += 1
+            raise
+        finally:
+            with self._lock:
+                self.active -= 1
+                self.completed += 1
+
+    def _on_done(self, future: Future):
+        # Cancelled before a worker picked it up: _invoke never ran
+        if future.cancelled():
+            with self._lock:
+                self.queued -= 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "queued": self.queued,
+                "active": self.active,
+                "peak_queued": self.peak_queued,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected
+            }
+
+    def shutdown(self, wait: bool = False):
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+
+class StageExecutors:
+    """
+    Registry of per-stage executors
+
+    Usage:
+        executors = StageExecutors.from_config(config.execution)
+        transcript = await executors.run("stt", pipeline.transcribe_audio, path)
+    """
+
+    def __init__(self, stages: Dict[str, StageExecutor]):
+        self.stages = stages
+
+    @classmethod
+    def from_config(cls, execution_config) -> "StageExecutors":
+        return cls({
+            STAGE_STT: StageExecutor(
+                STAGE_STT, execution_config.stt_workers, execution_config.stt_max_queue
+            ),
+            STAGE_EMBEDDING: StageExecutor(
+                STAGE_EMBEDDING, execution_config.embedding_workers, execution_config.embedding_max_queue
+            ),
+            STAGE_LLM: StageExecutor(
+                STAGE_LLM, execution_config.llm_workers, execution_config.llm_max_queue
+            ),
+        })
+
+    def __getitem__(self, stage: str) -> StageExecutor:
+        return self.stages[stage]
+
+    def submit(self, stage: str, fn: Callable, *args, **kwargs) -> Future:
+        return self.stages[stage].submit(fn, *args, **kwargs)
+
+    async def run(self, stage: str, fn: Callable, *args, **kwargs) -> Any:
+        return await self.stages[stage].run(fn, *args, **kwargs)
+
+    def stats(self) -> Dict[str, Dict]:
+        return {name: executor.stats() for name, executor in self.stages.items()}
+
+    def shutdown(self, wait: bool = False):
+        for executor in self.stages.values():
+            executor.shutdown(wait=wait)
+        logger.info("Stage executors shut down")
@@ -0,0 +1,370 @@
+"""
+SQLite-backed job queue for long-running analyses (e.g. 10+ minute recordings)
+
+The API process only stores the upload and enqueues a job; any number of
+worker threads - in the API process or in separate ``scripts/run_job_worker.py``
+processes - claim jobs from the same database file. Jobs survive restarts:
+a job whose worker died is reclaimed once its lease expires, until it has
+used ``max_attempts`` (a recording that keeps killing its worker then fails).
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+FINISHED_STATUSES = (STATUS_DONE, STATUS_FAILED)
+
+
+class JobStore:
+    """Persistent job table shared by API and worker processes (SQLite WAL)"""
+
+    def __init__(self, path: Union[str, Path], lease_seconds: float = 300, max_attempts: int = 3):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._local = threading.local()
+
+        self._conn().executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                status TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                result TEXT,
+                error TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                worker TEXT,
+                lease_until REAL,
+                created_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL
+            );
+            CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, created_at);
+        """)
+
+    def _conn(self) -> sqlite3.Connection:
+        # Per-thread connection, never reused across fork (pre-fork workers)
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(str(self.path), timeout=10.0, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=10000")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def submit(self, kind: str, payload: Dict, job_id: Optional[str] = None) -> str:
+        """Enqueue a job and return its id"""
+        job_id = job_id or uuid.uuid4().hex
+        self._conn().execute(
+            "INSERT INTO jobs (id, kind, status, payload, created_at) VALUES (?, ?, ?, ?, ?)",
+            (job_id, kind, STATUS_QUEUED, json.dumps(payload, ensure_ascii=False), time.time())
+        )
+        logger.info(f"Job queued: {job_id} ({kind})")
+        return job_id
+
+    def claim(self, worker: str) -> Optional[Dict]:
+        """
+        Atomically claim the oldest queued job (or a running job whose lease
+        expired and that has attempts left)
+
+        Returns:
+            Job dict or None if nothing is runnable
+        """
+        conn = self._conn()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT * FROM jobs "
+                "WHERE status = ? OR (status = ? AND lease_until < ? AND attempts < ?) "
+                "ORDER BY created_at LIMIT 1",
+                (STATUS_QUEUED, STATUS_RUNNING, now, self.max_attempts)
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+
+            if row["status"] == STATUS_RUNNING:
+                logger.warning(f"Reclaiming job {row['id']} (lease expired, worker={row['worker']})")
+
+            conn.execute(
+                "UPDATE jobs SET status = ?, worker = ?, lease_until = ?, "
+                "attempts = attempts + 1, started_at = ? WHERE id = ?",
+                (STATUS_RUNNING, worker, now + self.lease_seconds, now, row["id"])
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        job = self._row_to_dict(row)
+        job["status"] = STATUS_RUNNING
+        job["attempts"] += 1
+        job["worker"] = worker
+        return job
+
+    def fail_abandoned(self) -> List[Dict]:
+        """
+        Mark running jobs whose lease expired after their last attempt as failed
+
+        Their worker died on every attempt (crash, OOM kill), so ``fail()`` was
+        never called for them.
+
+        Returns:
+            The jobs that were failed (for cleanup, e.g. deleting their upload)
+        """
+        conn = self._conn()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = conn.execute(
+                "SELECT * FROM jobs WHERE status = ? AND lease_until < ? AND attempts >= ?",
+                (STATUS_RUNNING, now, self.max_attempts)
+            ).fetchall()
+            for row in rows:
+                conn.execute(
+                    "UPDATE jobs SET status = ?, error = ?, lease_until = NULL, finished_at = ? WHERE id = ?",
+                    (STATUS_FAILED, f"Worker lost on all {row['attempts']} attempts (lease expired)", now, row["id"])
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        jobs = [self._row_to_dict(row) for row in rows]
+        for job in jobs:
+            job["status"] = STATUS_FAILED
+            logger.error(f"✗ Job {job['id']} failed: worker lost on all {job['attempts']} attempts")
+        return jobs
+
+    def renew(self, job_id: str, worker: str) -> bool:
+        """Extend the lease of a running job (heartbeat)"""
+        cursor = self._conn().execute(
+            "UPDATE jobs SET lease_until = ? WHERE id = ? AND worker = ? AND status = ?",
+            (time.time() + self.lease_seconds, job_id, worker, STATUS_RUNNING)
+        )
+        return cursor.rowcount == 1
+
+    def complete(self, job_id: str, result: Dict):
+        self._conn().execute(
+            "UPDATE jobs SET status = ?, result = ?, error = NULL, lease_until = NULL, finished_at = ? "
+            "WHERE id = ?",
+            (STATUS_DONE, json.dumps(result, ensure_ascii=False), time.time(), job_id)
+        )
+
+    def fail(self, job_id: str, error: str, retry: bool = True) -> str:
+        """
+        Record a failure; the job is re-queued until ``max_attempts`` is reached
+
+        Returns:
+            New job status (queued or failed)
+        """
+        conn = self._conn()
+        row = conn.execute("SELECT attempts FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        attempts = row["attempts"] if row else self.max_attempts
+
+        if retry and attempts < self.max_attempts:
+            status = STATUS_QUEUED
+            conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, worker = NULL, lease_until = NULL WHERE id = ?",
+                (status, error, job_id)
+            )
+        else:
+            status = STATUS_FAILED
+            conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, lease_until = NULL, finished_at = ? WHERE id = ?",
+                (status, error, time.time(), job_id)
+            )
+        return status
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        row = self._conn().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._row_to_dict(row) if row else None
+
+    def stats(self) -> Dict[str, int]:
+        rows = self._conn().execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status").fetchall()
+        counts = {STATUS_QUEUED: 0, STATUS_RUNNING: 0, STATUS_DONE: 0, STATUS_FAILED: 0}
+        counts.update({row["status"]: row["n"] for row in rows})
+        return counts
+
+    @staticmethod
+    def _row_to_dict(row: sqlite3.Row) -> Dict:
+        job = dict(row)
+        job["payload"] = json.loads(job["payload"])
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+
+class JobWorkerPool:
+    """
+    Worker threads that claim and run jobs from a JobStore
+
+    Args:
+        store: Shared job store
+        handlers: Mapping job kind → callable(payload) returning a JSON-serialisable result
+        num_workers: Number of worker threads
+        poll_interval: Sleep between claims when the queue is empty (seconds)
+        on_failed: Mapping job kind → callable(payload) run once a job has finally
+            failed (e.g. delete its upload)
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        handlers: Dict[str, Callable[[Dict], Dict]],
+        num_workers: int = 1,
+        poll_interval: float = 1.0,
+        name: str = "jobs",
+        on_failed: Optional[Dict[str, Callable[[Dict], None]]] = None
+    ):
+        self.store = store
+        self.handlers = handlers
+        self.on_failed = on_failed or {}
+        self.num_workers = num_workers
+        self.poll_interval = poll_interval
+        self.name = name
+        self._stop = threading.Event()
+        self._threads = []
+
+    def start(self) -> "JobWorkerPool":
+        for i in range(self.num_workers):
+            worker_id = f"{self.name}-{uuid.uuid4().hex[:8]}-{i}"
+            thread = threading.Thread(target=self._run, args=(worker_id,), name=worker_id, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logger.info(f"✓ Job worker pool started ({self.num_workers} workers)")
+        return self
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+        self._threads = []
+
+    def run_once(self, worker_id: str) -> bool:
+        """Claim and run a single job; returns False if the queue was empty"""
+        for abandoned in self.store.fail_abandoned():
+            self._cleanup(abandoned)
+
+        job = self.store.claim(worker_id)
+        if job is None:
+            return False
+
+        handler = self.handlers.get(job["kind"])
+        if handler is None:
+            self.store.fail(job["id"], f"No handler for job kind '{job['kind']}'", retry=False)
+            self._cleanup(job)
+            return True
+
+        heartbeat_stop = threading.Event()
+        heartbeat = threading.Thread(
+            target=self._heartbeat, args=(job["id"], worker_id, heartbeat_stop), daemon=True
+        )
+        heartbeat.start()
+
+        start = time.time()
+        try:
+            result = handler(job["payload"])
+            self.store.complete(job["id"], result)
+            logger.info(f"✓ Job {job['id']} done in {time.time() - start:.1f}s")
+        except Exception as e:
+            status = self.store.fail(job["id"], str(e))
+            logger.error(f"✗ Job {job['id']} failed (attempt {job['attempts']}, now {status}): {e}")
+            if status == STATUS_FAILED:
+                self._cleanup(job)
+        finally:
+            heartbeat_stop.set()
+            heartbeat.join(timeout=1.0)
+        return True
+
+    def _run(self, worker_id: str):
+        while not self._stop.is_set():
+            try:
+                if not self.run_once(worker_id):
+                    self._stop.wait(self.poll_interval)
+            except Exception as e:
+                logger.error(f"Job worker {worker_id} error: {e}")
+                self._stop.wait(self.poll_interval)
+
+    def _cleanup(self, job: Dict):
+        cleanup = self.on_failed.get(job["kind"])
+        if cleanup is None:
+            return
+        try:
+            cleanup(job["payload"])
+        except Exception as e:
+            logger.warning(f"Cleanup of failed job {job['id']} failed: {e}")
+
+    def _heartbeat(self, job_id: str, worker_id: str, stop: threading.Event):
+        interval = max(self.store.lease_seconds / 3, 1.0)
+        while not stop.wait(interval):
+            self.store.renew(job_id, worker_id)
+
+
+def make_audio_job_handler(pipeline, gemini_detector=None, risk_scorer=None) -> Callable[[Dict], Dict]:
+    """
+    Build the handler for ``audio`` jobs: transcribe → Gemini + Rule Filter
+
+    Payload: {"path": str, "filename": str, "enable_filter": bool}
+    The uploaded file is deleted once the job has succeeded (``delete_audio_upload``
+    deletes it when the job has finally failed).
+    """
+    def handle(payload: Dict) -> Dict:
+        audio_path = Path(payload["path"])
+        if not audio_path.exists():
+            raise FileNotFoundError(f"Uploaded audio missing: {audio_path}")
+
+        transcript = pipeline.transcribe_audio(audio_path)
+
+        if gemini_detector is not None:
+            result = gemini_detector.analyze(transcript, enable_filter=payload.get("enable_filter", True))
+            if result.get("error"):
+                raise RuntimeError(result["error"])
+            verdict = {
+                "risk_score": result["score"],
+                "risk_level": result["risk_level"],
+                "is_phishing": result["is_phishing"],
+                "alert_message": result["reasoning"],
+                "llm_score": result.get("llm_score", result["score"]),
+                "filter_applied": result.get("filter_applied", False)
+            }
+        else:
+            similar_cases = pipeline.search_similar_cases(transcript)
+            risk_result = risk_scorer.calculate_risk_score(transcript, similar_cases)
+            verdict = {
+                "risk_score": risk_result["risk_score"],
+                "risk_level": risk_result["risk_level"],
+                "is_phishing": risk_result["is_phishing"],
+                "alert_message": risk_result["alert_message"]
+            }
+
+        delete_audio_upload(payload)
+
+        return {"filename": payload.get("filename"), "transcript": transcript, **verdict}
+
+    return handle
+
+
+def delete_audio_upload(payload: Dict):
+    """Delete an ``audio`` job's upload (after success, or as ``on_failed`` cleanup)"""
+    audio_path = Path(payload["path"])
+    try:
+        audio_path.unlink(missing_ok=True)
+    except OSError as e:
+        logger.warning(f"Could not delete job upload {audio_path}: {e}")
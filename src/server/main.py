@@ -1,28 +1,53 @@
 """
 FastAPI server for Sentinel-Voice phishing detection
 """
-from fastapi import FastAPI, File, UploadFile, HTTPException, Request
+from fastapi import FastAPI, File, UploadFile, HTTPException, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import JSONResponse, FileResponse, PlainTextResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
 from pathlib import Path
+import asyncio
+import json
 import tempfile
 import shutil
 import logging
-from typing import Optional
-import hashlib
-from datetime import datetime, timedelta
+import os
+import uuid
+from typing import Dict, List, Optional
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 
 from src.nlp.phishing_pipeline import PhishingDetectionPipeline
+from src.stt.whisper_stt import WhisperSTT
+from src.vector_db.vector_store import PhishingVectorStore
 from src.scoring.risk_scorer import RiskScorer
 from src.security.pii_masking import PIIMasker
 from src.llm.multi_agent_detector import MultiAgentPhishingDetector
 from src.llm.multi_llm_ensemble import MultiLLMEnsemble
 from src.llm.gemini_detector import GeminiPhishingDetector
+from src.llm.cascade_detector import CascadeDetector
+from src.server.executors import StageExecutors, StageQueueFull
+from src.server.admission import (
+    AdmissionController, AdmissionError, DeadlineExceeded, StageFailed, StageSaturated, current_deadline,
+    deadline_scope
+)
+from src.server.single_flight import SingleFlight
+from src.llm.llm_clients.base_client import close_async_session
+from src.llm.rate_limit import limiter_stats
+from src.llm.circuit_breaker import breaker_stats
+from src.llm.llm_clients.hedged_client import hedge_stats
+from src.server.streaming import StreamingSession, StreamLimitExceeded, build_session
+from src.server.jobs import (
+    JobStore, JobWorkerPool, FINISHED_STATUSES, delete_audio_upload, make_audio_job_handler
+)
+from src.server.warmup import WarmupRegistry
+from src.server import prefork
+from src.cache import build_response_cache, get_llm_cache, normalize_text
+from src.monitoring import (
+    REGISTRY, CallbackCounter, CallbackGauge, current_timings, timed, track_endpoint, track_request
+)
 from src.config import config
 
 logging.basicConfig(level=logging.INFO)
@@ -56,49 +81,307 @@ pii_masker = None
 clovax_client = None
 llm_ensemble = None
 gemini_detector = None
+llm_cascade = None
+
+# Bounded thread pools for blocking stages (STT / embedding / LLM I/O)
+executors = StageExecutors.from_config(config.execution)
+
+# Per-request deadlines and in-flight limits per stage (degrade instead of queueing)
+admission = AdmissionController.from_config(executors, config.admission)
+
+# Bounded LRU+TTL response cache (memory or shared SQLite backend)
+response_cache = build_response_cache(config.cache)
+
+# Identical Gemini analyses in flight share one LLM call
+gemini_flight = SingleFlight()
+
+# Executor queue gauges on /metrics
+REGISTRY.register(CallbackGauge(
+    "sentinel_executor_queued", "Tasks queued or running per stage executor", ["stage"],
+    lambda: [({"stage": name}, s["queued"]) for name, s in executors.stats().items()]
+))
+REGISTRY.register(CallbackGauge(
+    "sentinel_executor_active", "Tasks currently running per stage executor", ["stage"],
+    lambda: [({"stage": name}, s["active"]) for name, s in executors.stats().items()]
+))
+REGISTRY.register(CallbackCounter(
+    "sentinel_executor_tasks_total", "Finished stage executor tasks by outcome", ["stage", "outcome"],
+    lambda: [
+        ({"stage": name, "outcome": outcome}, s[outcome])
+        for name, s in executors.stats().items()
+        for outcome in ("completed", "failed", "rejected")
+    ]
+))
+
+REGISTRY.register(CallbackGauge(
+    "sentinel_admission_in_flight", "Admitted calls in flight per stage", ["stage"],
+    lambda: [({"stage": name}, s["in_flight"]) for name, s in admission.stats().items()]
+))
+REGISTRY.register(CallbackCounter(
+    "sentinel_admission_total", "Admission decisions per stage", ["stage", "outcome"],
+    lambda: [
+        ({"stage": name, "outcome": outcome}, s[outcome])
+        for name, s in admission.stats().items()
+        for outcome in ("admitted", "deadline_exceeded", "saturated")
+    ]
+))
+REGISTRY.register(CallbackCounter(
+    "sentinel_singleflight_total", "Gemini analyses that started an LLM call or joined one in flight", ["outcome"],
+    lambda: [
+        ({"outcome": "leader"}, gemini_flight.leaders),
+        ({"outcome": "coalesced"}, gemini_flight.coalesced)
+    ]
+))
+
+# SQLite-backed job queue for long recordings (initialized on startup)
+job_store = None
+job_pool = None
+
+# Startup components, loaded concurrently (see src/server/warmup.py)
+warmup = WarmupRegistry()
+
+ALLOWED_AUDIO_EXTENSIONS = [".wav", ".mp3", ".flac", ".m4a", ".webm", ".ogg", ".opus"]
+
+
+def _load_vector_store() -> PhishingVectorStore:
+    """Embedding model + FAISS index (an empty store is still usable)"""
+    vector_store = PhishingVectorStore()
+    try:
+        vector_store.load()
+    except Exception as e:
+        logger.warning(f"Vector store not loaded - similarity search will be limited: {e}")
+    return vector_store
+
+
+def _register_components():
+    """Declare startup components and their dependencies"""
+    warmup.register("stt", lambda: WhisperSTT(model_size="base"))
+    warmup.register("vector_store", _load_vector_store)
+    warmup.register(
+        "pipeline",
+        lambda stt, vector_store: PhishingDetectionPipeline(stt_model=stt, vector_store=vector_store),
+        depends_on=["stt", "vector_store"]
+    )
+    warmup.register("risk_scorer", RiskScorer)
+    warmup.register("pii_masker", PIIMasker)
+    # Optional: the service is ready without them (rule-based fallback)
+    warmup.register("gemini_detector", GeminiPhishingDetector, required=False)
+    warmup.register("llm_ensemble", MultiLLMEnsemble, required=False)
+    warmup.register("multi_agent", MultiAgentPhishingDetector, required=False)
+
+
+def _build_cascade() -> Optional[CascadeDetector]:
+    """Gemini-first cascade over the loaded detectors (CASCADE_ENABLED)"""
+    if not config.cascade.enabled or not (gemini_detector and gemini_detector.is_available()):
+        return None
+    escalation = clovax_client if config.cascade.escalation == "multi_agent" else llm_ensemble
+    try:
+        return CascadeDetector(first_stage=gemini_detector, escalation=escalation)
+    except ValueError as e:
+        logger.error(f"LLM cascade disabled: {e}")
+        return None
 
-# Simple in-memory cache with TTL
-response_cache = {}
-cache_timestamps = {}
-CACHE_TTL = 3600  # 1 hour
+
+def load_components():
+    """
+    Load all components (blocking) and publish them to the handlers
+
+    Called from the startup event, or by the pre-fork parent before workers
+    fork (src/server/prefork.py) so the models are shared copy-on-write.
+    """
+    global pipeline, risk_scorer, pii_masker, clovax_client, llm_ensemble, gemini_detector, llm_cascade
+
+    _register_components()
+    loaded = warmup.run(max_workers=config.warmup.max_workers)
+
+    pipeline = loaded.get("pipeline")
+    risk_scorer = loaded.get("risk_scorer")
+    pii_masker = loaded.get("pii_masker")
+    gemini_detector = loaded.get("gemini_detector")
+    llm_ensemble = loaded.get("llm_ensemble")
+    clovax_client = loaded.get("multi_agent")
+    llm_cascade = _build_cascade()
+
+    if gemini_detector:
+        logger.info("✓ Gemini 2.5 Flash + Rule Filter initialized (main system)")
+    if llm_ensemble and llm_ensemble.is_available():
+        logger.info(f"✓ Multi-LLM Comparison enabled: {len(llm_ensemble.available_llms)} LLMs available")
+    elif clovax_client and clovax_client.is_available():
+        logger.info(f"✓ Multi-Agent LLM enabled (3 agents, {clovax_client.client.model_name})")
+    else:
+        logger.warning("⚠ No LLM configured, using rule-based fallback")
+
+    if not warmup.is_ready():
+        logger.error("Failed to initialize pipeline (see startup timing report)")
+        return
+
+    logger.info("✓ Pipeline initialized successfully")
+
+
+def _start_job_workers():
+    """In-process job workers (threads are started per process, after any fork)"""
+    global job_pool
+
+    if config.jobs.workers > 0 and warmup.is_ready():
+        job_pool = JobWorkerPool(
+            job_store,
+            {"audio": make_audio_job_handler(pipeline, gemini_detector, risk_scorer)},
+            num_workers=config.jobs.workers,
+            name="api",
+            on_failed={"audio": delete_audio_upload}
+        ).start()
+
+
+def _warm_up():
+    load_components()
+    _start_job_workers()
 
 
 @app.on_event("startup")
 async def startup_event():
-    """Initialize models on startup"""
-    global pipeline, risk_scorer, pii_masker, clovax_client, llm_ensemble, gemini_detector
+    """Initialize models on startup (in the background unless WARMUP_BACKGROUND=false)"""
+    global job_store
 
     logger.info("Initializing Sentinel-Voice pipeline...")
 
+    # Job queue accepts uploads while models are still loading;
+    # extra workers can run via scripts/run_job_worker.py
+    job_store = JobStore(
+        config.jobs.db_path,
+        lease_seconds=config.jobs.lease_seconds,
+        max_attempts=config.jobs.max_attempts
+    )
+
+    if warmup.finished.is_set():
+        # Pre-fork worker: models were loaded in the parent before fork
+        logger.info(f"✓ Using models preloaded by pre-fork parent (pid {os.getppid()})")
+        _start_job_workers()
+        return
+
+    if config.warmup.background:
+        # Liveness is served immediately; /health/ready turns 200 once loaded
+        app.state.warmup_future = asyncio.get_running_loop().run_in_executor(None, _warm_up)
+    else:
+        await asyncio.get_running_loop().run_in_executor(None, _warm_up)
+        if not warmup.is_ready():
+            raise RuntimeError("Failed to initialize pipeline")
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release executor and job worker threads on shutdown"""
+    if job_pool is not None:
+        job_pool.stop()
+    executors.shutdown(wait=False)
+    await close_async_session()
+
+
+@app.exception_handler(StageQueueFull)
+async def stage_queue_full_handler(request: Request, exc: StageQueueFull):
+    """Overloaded stage -> 503 so clients/load balancers back off"""
+    logger.warning(f"Rejected request: {exc}")
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc), "stage": exc.stage},
+        headers={"Retry-After": "1"}
+    )
+
+
+@app.exception_handler(AdmissionError)
+async def admission_error_handler(request: Request, exc: AdmissionError):
+    """A required stage (e.g. STT) could not run within the deadline -> 503"""
+    logger.warning(f"Admission rejected: {exc}")
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc), "stage": exc.stage},
+        headers={"Retry-After": "1"}
+    )
+
+
+def _request_deadline(requested: Optional[float], default: float) -> float:
+    """Deadline (seconds) for one request: client value capped by ADMISSION_MAX_DEADLINE_SECONDS"""
+    return min(requested or default, config.admission.max_deadline_seconds)
+
+
+async def _run_gemini(text: str, enable_filter: bool = True, features: Optional[Dict] = None) -> Dict:
+    """
+    Gemini + Rule Filter on the LLM stage
+
+    LLM_ASYNC_CLIENTS=True awaits the aiohttp clients on the event loop;
+    otherwise the blocking clients run on the LLM executor.
+
+    Concurrent calls with the same cache key share one analysis (single
+    flight); each caller still waits no longer than its own deadline. The
+    shared analysis runs under its leader's deadline, so a caller that joined
+    it and got the leader's out-of-budget error retries under its own.
+
+    Raises:
+        StageFailed: Gemini returned an error (outage, open circuit) instead of
+            a verdict, so callers degrade and nothing is cached
+    """
+    async def analyze():
+        if config.llm_http.async_clients:
+            return await admission.run_async(
+                "llm", gemini_detector.analyze_async, text, enable_filter=enable_filter, features=features
+            )
+        return await admission.run(
+            "llm", gemini_detector.analyze, text, enable_filter=enable_filter, features=features
+        )
+
+    deadline = current_deadline()
     try:
-        pipeline = PhishingDetectionPipeline()
-        risk_scorer = RiskScorer()
-        pii_masker = PIIMasker()
+        result = await gemini_flight.do(
+            _gemini_cache_key(text, enable_filter),
+            analyze,
+            timeout=deadline.remaining() if deadline else None,
+            retry_if=_leader_out_of_budget
+        )
+    except asyncio.TimeoutError:
+        raise DeadlineExceeded("llm", "Deadline passed while waiting for a coalesced Gemini analysis")
+    if "error" in result:
+        raise StageFailed("llm", f"Gemini unavailable ({result.get('error_type', 'error')}): {result['error']}")
+    return result
 
-        # Initialize Gemini + Rule Filter (main detection system)
-        try:
-            gemini_detector = GeminiPhishingDetector()
-            logger.info("✓ Gemini 2.5 Flash + Rule Filter initialized (main system)")
-        except Exception as e:
-            logger.warning(f"⚠ Gemini detector initialization failed: {e}")
 
-        # Initialize Multi-LLM Ensemble for comparison
-        llm_ensemble = MultiLLMEnsemble()
+def _leader_out_of_budget(error: Exception) -> bool:
+    """A coalesced LLM call failed on its leader's deadline, not on a provider error"""
+    return isinstance(error, (DeadlineExceeded, StageSaturated))
 
-        # Fallback to single multi-agent detector
-        clovax_client = MultiAgentPhishingDetector()
 
-        if llm_ensemble.is_available():
-            logger.info(f"✓ Multi-LLM Comparison enabled: {len(llm_ensemble.available_llms)} LLMs available")
-        elif clovax_client.is_available():
-            logger.info("✓ Multi-Agent ClovaX LLM enabled (3 agents)")
-        else:
-            logger.warning("⚠ No LLM configured, using rule-based fallback")
+def _raise_on_llm_error(llm_result: Dict):
+    """
+    Raises:
+        StageFailed: the detector returned an error (every LLM failed) instead of
+            a verdict, so the caller degrades rather than serving its neutral 50
+    """
+    if "error" in llm_result:
+        raise StageFailed("llm", f"LLM unavailable ({llm_result.get('error_type', 'error')}): {llm_result['error']}")
 
-        logger.info("✓ Pipeline initialized successfully")
-    except Exception as e:
-        logger.error(f"Failed to initialize pipeline: {e}")
-        raise
+
+def _degraded_verdict(text: str, reason: str, similar_cases: Optional[List] = None) -> Dict:
+    """
+    RiskScorer + keyword rule verdict for requests whose LLM stage missed the deadline
+
+    Same shape as GeminiPhishingDetector.analyze(), flagged ``degraded``.
+    """
+    logger.warning(f"Degraded verdict (no LLM): {reason}")
+    risk_result = risk_scorer.calculate_risk_score(text, similar_cases)
+    if gemini_detector:
+        result = gemini_detector.rule_only(text, risk_result["risk_score"])
+    else:
+        result = {
+            "score": risk_result["risk_score"],
+            "risk_level": risk_result["risk_level"],
+            "is_phishing": risk_result["is_phishing"],
+            "reasoning": risk_result["alert_message"],
+            "model": "RiskScorer (degraded)",
+            "filter_applied": False,
+            "rule": "disabled",
+            "llm_score": None
+        }
+    result["degraded"] = True
+    result["degraded_reason"] = reason
+    return result
 
 
 # Mount static files
@@ -114,6 +397,8 @@ class AnalysisRequest(BaseModel):
     """Request model for text analysis"""
     text: str
     enable_pii_masking: bool = True
+    include_timings: bool = False
+    deadline_seconds: Optional[float] = None  # default: ADMISSION_DEADLINE_SECONDS
 
 
 class AnalysisResponse(BaseModel):
@@ -126,6 +411,9 @@ class AnalysisResponse(BaseModel):
     techniques_detected: list
     masked_text: Optional[str] = None
     pii_detected: Optional[dict] = None
+    timings: Optional[dict] = None  # per-stage seconds (include_timings=true)
+    degraded: bool = False  # LLM missed the deadline; rule-based verdict
+    degraded_reason: Optional[str] = None
 
 
 @app.get("/")
@@ -169,6 +457,7 @@ async def health_check():
     """Health check endpoint"""
     return {
         "status": "healthy",
+        "ready": warmup.is_ready(),
         "pipeline_ready": pipeline is not None,
         "scorer_ready": risk_scorer is not None,
         "masker_ready": pii_masker is not None,
@@ -176,13 +465,53 @@ async def health_check():
     }
 
 
+def _audio_extension(filename: Optional[str]) -> str:
+    """Validate the upload's file type - allow WebM for browser recordings"""
+    file_extension = Path(filename or "").suffix.lower()
+
+    # If no extension (browser recording), default to .webm
+    if not file_extension:
+        file_extension = ".webm"
+        logger.info(f"No file extension detected, using default: {file_extension}")
+
+    if file_extension not in ALLOWED_AUDIO_EXTENSIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported file type. Allowed: {', '.join(ALLOWED_AUDIO_EXTENSIONS)}"
+        )
+    return file_extension
+
+
+@app.get("/health/live")
+async def liveness():
+    """Liveness probe: the process is up and serving (models may still be loading)"""
+    return {"status": "alive"}
+
+
+@app.get("/health/ready")
+async def readiness():
+    """Readiness probe: 200 once all required models are loaded, else 503"""
+    report = warmup.report()
+    if not warmup.is_ready():
+        return JSONResponse(status_code=503, content={"status": "not_ready", "startup": report})
+    return {"status": "ready", "startup": report}
+
+
 @app.post("/api/analyze/audio", response_model=AnalysisResponse)
-async def analyze_audio(file: UploadFile = File(...)):
+@track_endpoint("audio")
+async def analyze_audio(
+    file: UploadFile = File(...),
+    include_timings: bool = False,
+    deadline_seconds: Optional[float] = None
+):
     """
     Analyze audio file for phishing detection
 
     Args:
         file: Audio file (WAV, MP3, FLAC)
+        include_timings: Add per-stage timings to the response
+        deadline_seconds: Time budget (default ADMISSION_AUDIO_DEADLINE_SECONDS);
+            if the LLM can't answer in time the verdict is rule-based (degraded)
 
     Returns:
         Analysis results with risk score
@@ -190,20 +519,7 @@ async def analyze_audio(file: UploadFile = File(...)):
     if pipeline is None:
         raise HTTPException(status_code=503, detail="Pipeline not initialized")
 
-    # Validate file type - allow WebM for browser recordings
-    allowed_extensions = [".wav", ".mp3", ".flac", ".m4a", ".webm", ".ogg", ".opus"]
-    file_extension = Path(file.filename).suffix.lower()
-
-    # If no extension (browser recording), default to .webm
-    if not file_extension:
-        file_extension = ".webm"
-        logger.info(f"No file extension detected, using default: {file_extension}")
-
-    if file_extension not in allowed_extensions:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Unsupported file type. Allowed: {', '.join(allowed_extensions)}"
-        )
+    file_extension = _audio_extension(file.filename)
 
     # Save uploaded file temporarily
     temp_path = None
@@ -229,63 +545,75 @@ async def analyze_audio(file: UploadFile = File(...)):
         if temp_path.stat().st_size == 0:
             raise HTTPException(status_code=400, detail="Uploaded file is empty")
 
-        # Transcribe audio only (bypass full pipeline to avoid ffmpeg issues)
-        transcript = pipeline.transcribe_audio(temp_path)
-        logger.info(f"Transcription: {transcript[:100]}...")
-
-        # Use Gemini + Filter for analysis (same as text analysis)
-        if gemini_detector:
-            gemini_result = gemini_detector.analyze(transcript, enable_filter=True)
-
-            # Convert Gemini result to AnalysisResponse format
-            response = AnalysisResponse(
-                risk_score=gemini_result["score"],
-                risk_level=gemini_result["risk_level"],
-                is_phishing=gemini_result["is_phishing"],
-                alert_message=gemini_result["reasoning"],
-                component_scores={
-                    "llm_score": gemini_result.get("llm_score", gemini_result["score"]),
-                    "final_score": gemini_result["score"],
-                    "filter_applied": gemini_result.get("filter_applied", False)
-                },
-                techniques_detected=[],
-                masked_text=None,
-                pii_detected={}
-            )
-
-            logger.info(
-                f"Analysis complete: {file.filename} - "
-                f"Risk: {gemini_result['score']}/100 ({gemini_result['risk_level']})"
-            )
-        else:
-            # Fallback to old pipeline if Gemini not available
-            result = pipeline.analyze_audio(temp_path)
-
-            risk_result = risk_scorer.calculate_risk_score(
-                result["transcript"],
-                [(case["script"], case["similarity"], {}) for case in result["similar_cases"]]
-            )
-
-            masked_text, pii_metadata = pii_masker.mask_text(result["transcript"])
-
-            response = AnalysisResponse(
-                risk_score=risk_result["risk_score"],
-                risk_level=risk_result["risk_level"],
-                is_phishing=risk_result["is_phishing"],
-                alert_message=risk_result["alert_message"],
-                component_scores=risk_result["component_scores"],
-                techniques_detected=result.get("techniques_detected", []),
-                masked_text=masked_text,
-                pii_detected=pii_metadata.get("masked_types", {})
-            )
-
-            logger.info(
-                f"Analysis complete: {file.filename} - "
-                f"Risk: {risk_result['risk_score']:.2f}/100 ({risk_result['risk_level']})"
-            )
-
+        deadline = _request_deadline(deadline_seconds, config.admission.audio_deadline_seconds)
+        with deadline_scope(deadline):
+            # Transcribe audio only (bypass full pipeline to avoid ffmpeg issues)
+            transcript = await admission.run("stt", pipeline.transcribe_audio, temp_path)
+            logger.info(f"Transcription: {transcript[:100]}...")
+
+            # Use Gemini + Filter for analysis (same as text analysis)
+            if gemini_detector:
+                try:
+                    gemini_result = await _run_gemini(transcript)
+                except AdmissionError as e:
+                    gemini_result = _degraded_verdict(transcript, str(e))
+
+                # Convert Gemini result to AnalysisResponse format
+                response = AnalysisResponse(
+                    risk_score=gemini_result["score"],
+                    risk_level=gemini_result["risk_level"],
+                    is_phishing=gemini_result["is_phishing"],
+                    alert_message=gemini_result["reasoning"],
+                    component_scores={
+                        "llm_score": gemini_result.get("llm_score", gemini_result["score"]),
+                        "final_score": gemini_result["score"],
+                        "filter_applied": gemini_result.get("filter_applied", False)
+                    },
+                    techniques_detected=[],
+                    masked_text=None,
+                    pii_detected={},
+                    degraded=gemini_result.get("degraded", False),
+                    degraded_reason=gemini_result.get("degraded_reason")
+                )
+
+                logger.info(
+                    f"Analysis complete: {file.filename} - "
+                    f"Risk: {gemini_result['score']}/100 ({gemini_result['risk_level']})"
+                )
+            else:
+                # Fallback to old pipeline if Gemini not available
+                result = await admission.run("stt", pipeline.analyze_audio, temp_path)
+
+                risk_result = risk_scorer.calculate_risk_score(
+                    result["transcript"],
+                    [(case["script"], case["similarity"], {}) for case in result["similar_cases"]]
+                )
+
+                with timed("pii_masking"):
+                    masked_text, pii_metadata = pii_masker.mask_text(result["transcript"])
+
+                response = AnalysisResponse(
+                    risk_score=risk_result["risk_score"],
+                    risk_level=risk_result["risk_level"],
+                    is_phishing=risk_result["is_phishing"],
+                    alert_message=risk_result["alert_message"],
+                    component_scores=risk_result["component_scores"],
+                    techniques_detected=result.get("techniques_detected", []),
+                    masked_text=masked_text,
+                    pii_detected=pii_metadata.get("masked_types", {})
+                )
+
+                logger.info(
+                    f"Analysis complete: {file.filename} - "
+                    f"Risk: {risk_result['risk_score']:.2f}/100 ({risk_result['risk_level']})"
+                )
+
+        if include_timings:
+            response.timings = current_timings().as_dict()
         return response
 
+    except (HTTPException, StageQueueFull, AdmissionError):
+        raise
     except Exception as e:
         logger.error(f"Error analyzing audio: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -302,7 +630,95 @@ async def analyze_audio(file: UploadFile = File(...)):
                 logger.warning(f"Could not delete temp file: {e}")
 
 
+def _job_response(job: Dict) -> Dict:
+    """Public view of a job row"""
+    return {
+        "job_id": job["id"],
+        "status": job["status"],
+        "attempts": job["attempts"],
+        "created_at": job["created_at"],
+        "started_at": job["started_at"],
+        "finished_at": job["finished_at"],
+        "result": job["result"],
+        "error": job["error"]
+    }
+
+
+@app.post("/api/jobs/audio", status_code=202)
+async def submit_audio_job(file: UploadFile = File(...), enable_filter: bool = True):
+    """
+    Submit a long recording for background analysis
+
+    Returns immediately with a job id; poll ``GET /api/jobs/{job_id}``
+    (optionally with ``?wait=`` seconds to long-poll) for the result.
+    """
+    if job_store is None:
+        raise HTTPException(status_code=503, detail="Job queue not initialized")
+
+    file_extension = _audio_extension(file.filename)
+    job_id = uuid.uuid4().hex
+    upload_dir = Path(config.jobs.upload_dir)
+    upload_dir.mkdir(parents=True, exist_ok=True)
+    upload_path = upload_dir / f"{job_id}{file_extension}"
+
+    def save_upload() -> int:
+        with open(upload_path, "wb") as out:
+            shutil.copyfileobj(file.file, out)
+        return upload_path.stat().st_size
+
+    size = await asyncio.to_thread(save_upload)
+    if size == 0:
+        upload_path.unlink()
+        raise HTTPException(status_code=400, detail="Uploaded file is empty")
+
+    job_store.submit(
+        "audio",
+        {"path": str(upload_path), "filename": file.filename, "enable_filter": enable_filter},
+        job_id=job_id
+    )
+    logger.info(f"Audio job submitted: {job_id} ({file.filename}, {size} bytes)")
+
+    return {"job_id": job_id, "status": "queued", "status_url": f"/api/jobs/{job_id}"}
+
+
+@app.get("/api/jobs/stats")
+async def get_job_stats():
+    """Job counts by status"""
+    if job_store is None:
+        raise HTTPException(status_code=503, detail="Job queue not initialized")
+    return {
+        **job_store.stats(),
+        "in_process_workers": job_pool.num_workers if job_pool else 0
+    }
+
+
+@app.get("/api/jobs/{job_id}")
+async def get_job(job_id: str, wait: float = 0):
+    """
+    Job status and result
+
+    Args:
+        job_id: Id returned by ``POST /api/jobs/audio``
+        wait: Long-poll up to this many seconds for the job to finish
+              (capped by JOB_MAX_WAIT_SECONDS)
+    """
+    if job_store is None:
+        raise HTTPException(status_code=503, detail="Job queue not initialized")
+
+    job = job_store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    deadline = asyncio.get_running_loop().time() + min(max(wait, 0), config.jobs.max_wait_seconds)
+    while job["status"] not in FINISHED_STATUSES and asyncio.get_running_loop().time() < deadline:
+        await asyncio.sleep(0.5)
+        job = job_store.get(job_id)
+
+    return _job_response(job)
+
+
 @app.post("/api/analyze/text", response_model=AnalysisResponse)
+@track_endpoint("text")
 async def analyze_text(request: AnalysisRequest):
     """
     Analyze text for phishing detection
@@ -319,82 +735,108 @@ async def analyze_text(request: AnalysisRequest):
     try:
         logger.info(f"Analyzing text: {request.text[:50]}...")
 
-        # Search for similar cases using Vector DB
-        similar_cases = pipeline.search_similar_cases(request.text, top_k=5)
-
-        # Use Multi-LLM Ensemble for comparison if available
-        if llm_ensemble and llm_ensemble.is_available():
-            logger.info(f"🔬 Using Multi-LLM Comparison ({len(llm_ensemble.available_llms)} LLMs)")
-            llm_result = llm_ensemble.analyze(request.text, similar_cases)
-
-            # Print comparison table to console
-            if "comparison_table" in llm_result:
-                print(llm_result["comparison_table"])
-                print(llm_result["detailed_analysis"])
-
-            risk_result = {
-                "risk_score": llm_result["risk_score"],
-                "risk_level": _get_risk_level(llm_result["risk_score"]),
-                "is_phishing": llm_result["is_phishing"],
-                "alert_message": llm_result["recommendation"],
-                "component_scores": {
-                    "llm_confidence": llm_result.get("confidence", 0),
-                    "similarity": max([s for _, s, _ in similar_cases], default=0) * 100,
-                    **llm_result.get("llm_scores", {})  # Individual LLM scores
-                },
-                "metadata": {
-                    "mode": "Multi-LLM Comparison",
-                    "comparison_table": llm_result.get("comparison_table", ""),
-                    "detailed_analysis": llm_result.get("detailed_analysis", ""),
-                    "statistics": llm_result.get("statistics", {}),
-                    "reasoning": llm_result.get("reasoning", ""),
-                    "red_flags": llm_result.get("red_flags", [])
-                }
-            }
-            techniques = llm_result.get("techniques", [])
-
-        # Fallback to single multi-agent ClovaX
-        elif clovax_client and clovax_client.is_available():
-            logger.info("🤖 Using Multi-Agent ClovaX (3 agents) for contextual analysis")
-            llm_result = clovax_client.analyze(request.text, similar_cases)
-
-            risk_result = {
-                "risk_score": llm_result["risk_score"],
-                "risk_level": _get_risk_level(llm_result["risk_score"]),
-                "is_phishing": llm_result["is_phishing"],
-                "alert_message": llm_result["recommendation"],
-                "component_scores": {
-                    "llm_confidence": llm_result.get("confidence", 0),
-                    "similarity": max([s for _, s, _ in similar_cases], default=0) * 100,
-                    "agent_context": llm_result["agent_scores"]["context"],
-                    "agent_psychological": llm_result["agent_scores"]["psychological"],
-                    "agent_financial": llm_result["agent_scores"]["financial"]
-                },
-                "metadata": {
-                    "mode": "Multi-Agent LLM",
-                    "reasoning": llm_result.get("reasoning", ""),
-                    "red_flags": llm_result.get("red_flags", [])
-                }
-            }
-            techniques = llm_result.get("techniques", [])
-
-        # Fallback to rule-based
-        else:
-            logger.info("📊 Using rule-based analysis (No LLM available)")
-            risk_result = risk_scorer.calculate_risk_score(request.text, similar_cases)
+        degraded_reason = None
+        deadline = _request_deadline(request.deadline_seconds, config.admission.deadline_seconds)
+        with deadline_scope(deadline):
+            # Search for similar cases using Vector DB
+            try:
+                similar_cases = await admission.run(
+                    "embedding", pipeline.search_similar_cases, request.text, top_k=5
+                )
+            except AdmissionError as e:
+                logger.warning(f"Similar case search skipped: {e}")
+                similar_cases = []
 
-            # Extract techniques from metadata
-            techniques = []
-            keyword_matches = risk_result["metadata"]["keyword"].get("matches", {})
-            for category, data in keyword_matches.items():
-                techniques.append(f"{category} ({data['count']}건)")
+            try:
+                # Gemini-first cascade (escalates uncertain scores), else the full Multi-LLM comparison
+                comparison = llm_cascade or llm_ensemble
+                if comparison and comparison.is_available():
+                    if llm_cascade:
+                        logger.info("🔬 Using LLM cascade (Gemini first)")
+                    else:
+                        logger.info(f"🔬 Using Multi-LLM Comparison ({len(llm_ensemble.available_llms)} LLMs)")
+                    if config.llm_http.async_clients:
+                        llm_result = await admission.run_async(
+                            "llm", comparison.analyze_async, request.text, similar_cases
+                        )
+                    else:
+                        llm_result = await admission.run("llm", comparison.analyze, request.text, similar_cases)
+                    _raise_on_llm_error(llm_result)
+
+                    # Print comparison table to console
+                    if "comparison_table" in llm_result:
+                        print(llm_result["comparison_table"])
+                        print(llm_result["detailed_analysis"])
+
+                    risk_result = {
+                        "risk_score": llm_result["risk_score"],
+                        "risk_level": _get_risk_level(llm_result["risk_score"]),
+                        "is_phishing": llm_result["is_phishing"],
+                        "alert_message": llm_result["recommendation"],
+                        "component_scores": {
+                            "llm_confidence": llm_result.get("confidence", 0),
+                            "similarity": max([s for _, s, _ in similar_cases], default=0) * 100,
+                            **llm_result.get("llm_scores", {})  # Individual LLM scores
+                        },
+                        "metadata": {
+                            "mode": "LLM Cascade" if "cascade" in llm_result else "Multi-LLM Comparison",
+                            "cascade": llm_result.get("cascade"),
+                            "comparison_table": llm_result.get("comparison_table", ""),
+                            "detailed_analysis": llm_result.get("detailed_analysis", ""),
+                            "statistics": llm_result.get("statistics", {}),
+                            "contributors": llm_result.get("contributors", []),
+                            "stragglers": llm_result.get("stragglers", []),
+                            "quorum": llm_result.get("quorum", {}),
+                            "reasoning": llm_result.get("reasoning", ""),
+                            "red_flags": llm_result.get("red_flags", [])
+                        }
+                    }
+                    techniques = llm_result.get("techniques", [])
+
+                # Fallback to single multi-agent ClovaX
+                elif clovax_client and clovax_client.is_available():
+                    logger.info("🤖 Using Multi-Agent ClovaX (3 agents) for contextual analysis")
+                    llm_result = await admission.run("llm", clovax_client.analyze, request.text, similar_cases)
+                    _raise_on_llm_error(llm_result)
+
+                    risk_result = {
+                        "risk_score": llm_result["risk_score"],
+                        "risk_level": _get_risk_level(llm_result["risk_score"]),
+                        "is_phishing": llm_result["is_phishing"],
+                        "alert_message": llm_result["recommendation"],
+                        "component_scores": {
+                            "llm_confidence": llm_result.get("confidence", 0),
+                            "similarity": max([s for _, s, _ in similar_cases], default=0) * 100,
+                            "agent_context": llm_result["agent_scores"]["context"],
+                            "agent_psychological": llm_result["agent_scores"]["psychological"],
+                            "agent_financial": llm_result["agent_scores"]["financial"]
+                        },
+                        "metadata": {
+                            "mode": "Multi-Agent LLM",
+                            "reasoning": llm_result.get("reasoning", ""),
+                            "red_flags": llm_result.get("red_flags", [])
+                        }
+                    }
+                    techniques = llm_result.get("techniques", [])
+
+                # Fallback to rule-based
+                else:
+                    logger.info("📊 Using rule-based analysis (No LLM available)")
+                    risk_result, techniques = _rule_based_result(request.text, similar_cases)
+
+            except AdmissionError as e:
+                # LLM could not answer within the deadline: rule-based verdict
+                logger.warning(f"Degraded verdict (no LLM): {e}")
+                risk_result, techniques = _rule_based_result(request.text, similar_cases)
+                degraded_reason = str(e)
 
         # PII masking
         masked_text = None
         pii_detected = None
 
         if request.enable_pii_masking:
-            masked_text, pii_metadata = pii_masker.mask_text(request.text)
+            with timed("pii_masking"):
+                masked_text, pii_metadata = pii_masker.mask_text(request.text)
             pii_detected = pii_metadata.get("masked_types", {})
 
         response = AnalysisResponse(
@@ -405,7 +847,9 @@ async def analyze_text(request: AnalysisRequest):
             component_scores=risk_result["component_scores"],
             techniques_detected=techniques,
             masked_text=masked_text,
-            pii_detected=pii_detected
+            pii_detected=pii_detected,
+            degraded=degraded_reason is not None,
+            degraded_reason=degraded_reason
         )
 
         logger.info(
@@ -413,13 +857,172 @@ async def analyze_text(request: AnalysisRequest):
             f"Risk: {risk_result['risk_score']:.2f}/100 ({risk_result['risk_level']})"
         )
 
+        if request.include_timings:
+            response.timings = current_timings().as_dict()
         return response
 
+    except StageQueueFull:
+        raise
     except Exception as e:
         logger.error(f"Error analyzing text: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _rule_based_result(text: str, similar_cases: List):
+    """RiskScorer verdict + techniques from its keyword matches"""
+    risk_result = risk_scorer.calculate_risk_score(text, similar_cases)
+
+    # Extract techniques from metadata
+    techniques = []
+    keyword_matches = risk_result["metadata"]["keyword"].get("matches", {})
+    for category, data in keyword_matches.items():
+        techniques.append(f"{category} ({data['count']}건)")
+    return risk_result, techniques
+
+
+def _transcribe_stream_window(session: StreamingSession) -> str:
+    """Pop the pending window and transcribe it (runs on the STT executor)"""
+    window = session.take_window()
+    if len(window) == 0:
+        return ""
+    return pipeline.stt.transcribe(window)["text"]
+
+
+async def _stream_partial(websocket: WebSocket, session: StreamingSession):
+    """Transcribe the next rolling window and push the updated risk score"""
+    try:
+        new_text = await executors.run("stt", _transcribe_stream_window, session)
+        session.add_transcript(new_text)
+        transcript = session.transcript
+
+        similar_cases = []
+        if transcript:
+            similar_cases = await executors.run(
+                "embedding", pipeline.search_similar_cases, transcript, top_k=3
+            )
+        risk_result = risk_scorer.calculate_risk_score(transcript, similar_cases)
+
+        await websocket.send_json({
+            "type": "partial",
+            "new_text": new_text,
+            "transcript": transcript,
+            "risk_score": risk_result["risk_score"],
+            "risk_level": risk_result["risk_level"],
+            "is_phishing": risk_result["is_phishing"],
+            "alert_message": risk_result["alert_message"],
+            "stream": session.stats()
+        })
+    except (StageQueueFull, StreamLimitExceeded) as e:
+        await websocket.send_json({"type": "warning", "detail": str(e)})
+
+
+async def _stream_final(websocket: WebSocket, session: StreamingSession):
+    """Full verdict on the accumulated transcript once the call ends"""
+    transcript = session.transcript
+    if gemini_detector and transcript:
+        with deadline_scope(config.admission.deadline_seconds):
+            try:
+                result = await _run_gemini(transcript)
+            except AdmissionError as e:
+                result = _degraded_verdict(transcript, str(e))
+        verdict = {
+            "risk_score": result["score"],
+            "risk_level": result["risk_level"],
+            "is_phishing": result["is_phishing"],
+            "alert_message": result["reasoning"],
+            "degraded": result.get("degraded", False)
+        }
+    else:
+        risk_result = risk_scorer.calculate_risk_score(transcript)
+        verdict = {
+            "risk_score": risk_result["risk_score"],
+            "risk_level": risk_result["risk_level"],
+            "is_phishing": risk_result["is_phishing"],
+            "alert_message": risk_result["alert_message"]
+        }
+
+    await websocket.send_json({
+        "type": "final",
+        "transcript": transcript,
+        **verdict,
+        "stream": session.stats()
+    })
+
+
+@app.websocket("/ws/analyze/stream")
+async def analyze_stream(websocket: WebSocket):
+    """
+    Live call analysis over WebSocket
+
+    Protocol:
+        client → {"type": "config", "format": "pcm_s16le", "sample_rate": 16000}  (optional)
+        client → binary audio frames (pcm_s16le / pcm_f32le / webm / ogg / opus)
+        server → {"type": "partial", "transcript": ..., "risk_score": ...} every STREAM_STEP_SECONDS
+        client → {"type": "stop"}
+        server → {"type": "final", ...} and closes
+    """
+    await websocket.accept()
+
+    if pipeline is None or risk_scorer is None:
+        await websocket.send_json({"type": "error", "detail": "Pipeline not initialized"})
+        await websocket.close(code=1013)
+        return
+
+    session: Optional[StreamingSession] = None
+    stt_task: Optional[asyncio.Task] = None
+
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+
+            if message.get("text") is not None:
+                payload = json.loads(message["text"])
+                kind = payload.get("type")
+
+                if kind == "config":
+                    if session is not None:
+                        raise ValueError("config must be sent before any audio")
+                    session = build_session(payload, config.streaming)
+                    await websocket.send_json({"type": "ready", "stream": session.stats()})
+
+                elif kind == "stop":
+                    if session is None:
+                        session = build_session(None, config.streaming)
+                    if stt_task is not None:
+                        await stt_task
+                    await _stream_partial(websocket, session)  # flush remaining audio
+                    await _stream_final(websocket, session)
+                    await websocket.close()
+                    break
+                continue
+
+            data = message.get("bytes")
+            if not data:
+                continue
+
+            if session is None:
+                session = build_session(None, config.streaming)
+            session.add_frame(data)
+
+            # One STT window in flight per connection; audio keeps buffering meanwhile
+            if session.ready() and (stt_task is None or stt_task.done()):
+                stt_task = asyncio.create_task(_stream_partial(websocket, session))
+
+    except WebSocketDisconnect:
+        logger.info("Streaming client disconnected")
+    except (ValueError, StreamLimitExceeded) as e:
+        logger.warning(f"Streaming session rejected: {e}")
+        await websocket.send_json({"type": "error", "detail": str(e)})
+        await websocket.close(code=1009 if isinstance(e, StreamLimitExceeded) else 1003)
+    finally:
+        if stt_task is not None and not stt_task.done():
+            stt_task.cancel()
+        if session is not None:
+            logger.info(f"Streaming session closed: {session.stats()}")
+
+
 @app.get("/api/stats")
 async def get_stats():
     """Get system statistics"""
@@ -439,45 +1042,53 @@ async def get_stats():
     }
 
 
-def _get_cache_key(text: str) -> str:
-    """Generate cache key from text"""
-    return hashlib.md5(text.encode()).hexdigest()
-
-
-def _is_cache_valid(cache_key: str) -> bool:
-    """Check if cached response is still valid"""
-    if cache_key not in cache_timestamps:
-        return False
-    elapsed = (datetime.now() - cache_timestamps[cache_key]).total_seconds()
-    return elapsed < CACHE_TTL
+def _gemini_cache_key(text: str, enable_filter: bool) -> str:
+    """Cache key covering every input that changes the Gemini verdict"""
+    return response_cache.make_key(
+        "gemini",
+        normalize_text(text),
+        enable_filter=enable_filter,
+        model=gemini_detector.model_name,
+        prompt_version=gemini_detector.prompt_version
+    )
 
 
-def _clean_expired_cache():
-    """Remove expired cache entries"""
-    now = datetime.now()
-    expired_keys = [
-        key for key, timestamp in cache_timestamps.items()
-        if (now - timestamp).total_seconds() >= CACHE_TTL
-    ]
-    for key in expired_keys:
-        response_cache.pop(key, None)
-        cache_timestamps.pop(key, None)
+def _gemini_response(result: Dict) -> Dict:
+    """GeminiPhishingDetector 결과 → API 응답 형식"""
+    return {
+        "score": result["score"],
+        "risk_level": result["risk_level"],
+        "is_phishing": result["is_phishing"],
+        "reasoning": result["reasoning"],
+        "model": result["model"],
+        "filter_applied": result.get("filter_applied", False),
+        "rule": result.get("rule"),
+        "llm_score": result.get("llm_score", result["score"]),
+        "keyword_analysis": result.get("keyword_analysis", {}),
+        "degraded": result.get("degraded", False),
+        "degraded_reason": result.get("degraded_reason"),
+        "cached": False
+    }
 
 
 class GeminiAnalysisRequest(BaseModel):
     """Request model for Gemini + Filter analysis"""
     text: str
     enable_filter: bool = True
+    include_timings: bool = False
+    deadline_seconds: Optional[float] = None  # default: ADMISSION_DEADLINE_SECONDS
 
 
 @app.post("/api/analyze/gemini")
 @limiter.limit("10/minute")  # 1분당 10회 제한
+@track_endpoint("gemini")
 async def analyze_with_gemini(request: Request, req: GeminiAnalysisRequest):
     """
     Gemini 2.5 Flash + Rule-based Filter를 사용한 피싱 탐지
 
     - Rate limit: 10 requests/minute per IP
-    - Caching: 동일 텍스트 1시간 캐싱
+    - Caching: 동일 텍스트 + 동일 파라미터 CACHE_TTL 동안 캐싱
+    - Deadline: deadline_seconds 안에 LLM 응답이 없으면 RiskScorer + Rule 판정 (degraded)
     """
     global gemini_detector
 
@@ -485,33 +1096,27 @@ async def analyze_with_gemini(request: Request, req: GeminiAnalysisRequest):
         raise HTTPException(status_code=503, detail="Gemini detector not available")
 
     # 캐시 체크
-    cache_key = _get_cache_key(req.text)
-    if _is_cache_valid(cache_key):
+    cache_key = _gemini_cache_key(req.text, req.enable_filter)
+    cached = response_cache.get(cache_key)
+    if cached is not None:
         logger.info(f"✓ Cache hit for request from {get_remote_address(request)}")
-        return response_cache[cache_key]
-
-    # 만료된 캐시 정리
-    _clean_expired_cache()
+        if req.include_timings:
+            return {**cached, "timings": current_timings().as_dict()}
+        return cached
 
     try:
         # Gemini + Filter 분석
-        result = gemini_detector.analyze(req.text, enable_filter=req.enable_filter)
-
-        response = {
-            "score": result["score"],
-            "risk_level": result["risk_level"],
-            "is_phishing": result["is_phishing"],
-            "reasoning": result["reasoning"],
-            "model": result["model"],
-            "filter_applied": result.get("filter_applied", False),
-            "llm_score": result.get("llm_score", result["score"]),
-            "keyword_analysis": result.get("keyword_analysis", {}),
-            "cached": False
-        }
+        deadline = _request_deadline(req.deadline_seconds, config.admission.deadline_seconds)
+        with deadline_scope(deadline):
+            try:
+                result = await _run_gemini(req.text, enable_filter=req.enable_filter)
+            except AdmissionError as e:
+                result = _degraded_verdict(req.text, str(e))
+        response = _gemini_response(result)
 
-        # 결과 캐싱
-        response_cache[cache_key] = {**response, "cached": True}
-        cache_timestamps[cache_key] = datetime.now()
+        # 결과 캐싱 (에러/degraded 응답은 캐싱하지 않음)
+        if not result.get("error") and not result.get("degraded"):
+            response_cache.set(cache_key, {**response, "cached": True})
 
         logger.info(
             f"✓ Gemini analysis: score={result['score']}, "
@@ -519,22 +1124,311 @@ async def analyze_with_gemini(request: Request, req: GeminiAnalysisRequest):
             f"filter_applied={result.get('filter_applied', False)}"
         )
 
+        if req.include_timings:
+            response["timings"] = current_timings().as_dict()
         return response
 
+    except StageQueueFull:
+        raise
     except Exception as e:
         logger.error(f"Gemini analysis error: {e}")
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
 
 
+def _sse_event(event: str, data: Dict) -> str:
+    """Server-Sent Events frame"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def _run_gemini_first_stage(text: str, cache_key: str) -> Dict:
+    """
+    Gemini first-stage call (no Rule Filter) on the LLM stage, within the current deadline
+
+    Concurrent streams for the same text share one call (single flight).
+
+    Raises:
+        DeadlineExceeded / StageSaturated: the LLM stage could not answer in time
+    """
+    async def query():
+        if config.llm_http.async_clients:
+            return await admission.run_async("llm", gemini_detector.query_llm_async, text)
+        return await admission.run("llm", gemini_detector.query_llm, text)
+
+    deadline = current_deadline()
+    try:
+        return await gemini_flight.do(
+            (cache_key, "first_stage"), query, timeout=deadline.remaining() if deadline else None,
+            retry_if=_leader_out_of_budget
+        )
+    except asyncio.TimeoutError:
+        raise DeadlineExceeded("llm", "Deadline passed while waiting for a coalesced Gemini call")
+
+
+async def _gemini_stream_events(req: GeminiAnalysisRequest, queue: asyncio.Queue):
+    """
+    Produce the SSE frames of /api/analyze/gemini/stream into ``queue`` (None = end)
+
+    Runs as its own task, so the request timings and the deadline stay set for
+    the whole stream; an LLM stage that misses the deadline ends in a degraded
+    ``final`` event.
+    """
+    deadline = _request_deadline(req.deadline_seconds, config.admission.deadline_seconds)
+    llm_task = None
+    with track_request("gemini_stream"), deadline_scope(deadline):
+        try:
+            cache_key = _gemini_cache_key(req.text, req.enable_filter)
+            cached = response_cache.get(cache_key)
+            if cached is not None:
+                await queue.put(_sse_event("final", cached))
+                return
+
+            # LLM 호출을 먼저 시작해두고 빠른 단계부터 순서대로 전송
+            llm_task = asyncio.ensure_future(_run_gemini_first_stage(req.text, cache_key))
+            features = gemini_detector.rule_filter.extract_features(req.text)
+            flags = {name: value for name, value in features.items() if name != "keyword_analysis"}
+            rules_event = {"keyword_analysis": features["keyword_analysis"], "rule_flags": flags}
+            if risk_scorer is not None:
+                rule_risk = risk_scorer.calculate_risk_score(req.text)
+                rules_event.update({
+                    "risk_score": rule_risk["risk_score"],
+                    "risk_level": rule_risk["risk_level"],
+                    "is_phishing": rule_risk["is_phishing"]
+                })
+            await queue.put(_sse_event("rules", rules_event))
+
+            if pipeline is not None and risk_scorer is not None:
+                similar_cases = await executors.run(
+                    "embedding", pipeline.search_similar_cases, req.text, top_k=3
+                )
+                similarity_risk = risk_scorer.calculate_risk_score(req.text, similar_cases)
+                await queue.put(_sse_event("similarity", {
+                    "similar_cases": [
+                        {"script": script[:120], "similarity": float(score), "label": meta.get("label")}
+                        for script, score, meta in similar_cases
+                    ],
+                    "risk_score": similarity_risk["risk_score"],
+                    "risk_level": similarity_risk["risk_level"],
+                    "is_phishing": similarity_risk["is_phishing"]
+                }))
+
+            try:
+                gemini_result = await llm_task
+                await queue.put(_sse_event("llm", {
+                    "llm_score": gemini_result.get("score", 50),
+                    "reasoning": gemini_result.get("reasoning", ""),
+                    "model": gemini_result.get("model", ""),
+                    "error_type": gemini_result.get("error_type")
+                }))
+                if "error" in gemini_result:
+                    # 호출 실패의 50점 placeholder 대신 Rule 기반 판정 (캐싱하지 않음)
+                    raise StageFailed(
+                        "llm", f"Gemini unavailable ({gemini_result.get('error_type', 'error')}): "
+                               f"{gemini_result['error']}"
+                    )
+                if config.llm_http.async_clients:
+                    result = await admission.run_async(
+                        "llm", gemini_detector.finalize_async, req.text, gemini_result,
+                        enable_filter=req.enable_filter, features=features
+                    )
+                else:
+                    result = await admission.run(
+                        "llm", gemini_detector.finalize, req.text, gemini_result,
+                        enable_filter=req.enable_filter, features=features
+                    )
+            except AdmissionError as e:
+                result = _degraded_verdict(req.text, str(e))
+            response = _gemini_response(result)
+            if not result.get("error") and not result.get("degraded"):
+                response_cache.set(cache_key, {**response, "cached": True})
+            await queue.put(_sse_event("final", response))
+
+        except Exception as e:
+            logger.error(f"Gemini stream error: {e}")
+            await queue.put(_sse_event("error", {"detail": str(e)}))
+        finally:
+            if llm_task is not None and not llm_task.done():
+                llm_task.cancel()
+
+
+@app.post("/api/analyze/gemini/stream")
+@limiter.limit("10/minute")
+async def analyze_with_gemini_stream(request: Request, req: GeminiAnalysisRequest):
+    """
+    /api/analyze/gemini 의 단계별 스트리밍 버전 (Server-Sent Events)
+
+    이벤트 순서:
+        rules      - 키워드/Rule 특징 + RiskScorer 점수 (즉시)
+        similarity - FAISS 유사 사례 + 유사도 반영 점수
+        llm        - Gemini 1차 판정
+        final      - Rule Filter / 2차 LLM 검증 후 최종 판정 (/api/analyze/gemini 와 동일 형식)
+
+    LLM 단계는 deadline_seconds(기본 ADMISSION_DEADLINE_SECONDS) 안에서 실행되며,
+    시간 안에 답하지 못하면 final 이벤트가 Rule 기반 판정(degraded)으로 전송됨
+    """
+    if not gemini_detector:
+        raise HTTPException(status_code=503, detail="Gemini detector not available")
+
+    async def event_stream():
+        queue: asyncio.Queue = asyncio.Queue()
+        producer = asyncio.ensure_future(_gemini_stream_events(req, queue))
+        producer.add_done_callback(lambda _: queue.put_nowait(None))
+        try:
+            while True:
+                frame = await queue.get()
+                if frame is None:
+                    break
+                yield frame
+        finally:
+            producer.cancel()  # client disconnected: stop the LLM calls
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+class BatchAnalysisRequest(BaseModel):
+    """Request model for batch Gemini + Filter analysis"""
+    texts: List[str]
+    enable_filter: bool = True
+    max_concurrency: Optional[int] = None
+    deadline_seconds: Optional[float] = None  # default: BATCH_DEADLINE_SECONDS
+
+
+@app.post("/api/analyze/batch")
+@limiter.limit("5/minute")
+@track_endpoint("batch")
+async def analyze_batch(request: Request, req: BatchAnalysisRequest):
+    """
+    여러 통화 내용을 한 번에 분석 (Gemini + Rule Filter, 단건 엔드포인트와 동일 판정)
+
+    - 동일 텍스트는 한 번만 분석 (요청 내 중복 제거 + 응답 캐시 재사용)
+    - Rule/키워드 특징은 고유 텍스트마다 한 번, LLM 호출 전에 계산
+    - LLM 호출은 max_concurrency (기본 BATCH_LLM_CONCURRENCY) 만큼만 동시 실행
+    - Deadline: 배치 전체가 deadline_seconds 안에 끝남; 그때까지 LLM 판정이 없는
+      항목은 RiskScorer + Rule 판정 (degraded)
+    - 결과는 입력 순서대로, 항목별 에러 포함
+    """
+    if not gemini_detector:
+        raise HTTPException(status_code=503, detail="Gemini detector not available")
+
+    if len(req.texts) > config.batch.max_items:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many texts: {len(req.texts)} (max {config.batch.max_items})"
+        )
+
+    concurrency = min(req.max_concurrency or config.batch.llm_concurrency, config.batch.llm_concurrency)
+    concurrency = max(concurrency, 1)
+
+    # 요청 내 중복 제거 (입력 순서 유지)
+    unique_texts = list(dict.fromkeys(req.texts))
+    features = dict(zip(
+        unique_texts,
+        gemini_detector.rule_filter.extract_features_batch(unique_texts)
+    )) if req.enable_filter else {}
+
+    semaphore = asyncio.Semaphore(concurrency)
+    cache_hits = 0
+    degraded = 0
+
+    async def _analyze_one(text: str) -> Dict:
+        nonlocal cache_hits, degraded
+        cache_key = _gemini_cache_key(text, req.enable_filter)
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            cache_hits += 1
+            return cached
+
+        try:
+            async with semaphore:
+                result = await _run_gemini(text, enable_filter=req.enable_filter, features=features.get(text))
+        except AdmissionError as e:
+            # 배치 deadline 초과/LLM 장애: 이 항목만 degraded, 캐싱하지 않음
+            degraded += 1
+            return _gemini_response(_degraded_verdict(text, str(e)))
+
+        response = _gemini_response(result)
+        response_cache.set(cache_key, {**response, "cached": True})
+        return response
+
+    deadline = _request_deadline(req.deadline_seconds, config.batch.deadline_seconds)
+    with deadline_scope(deadline):
+        outcomes = await asyncio.gather(
+            *(_analyze_one(text) for text in unique_texts),
+            return_exceptions=True
+        )
+    by_text = dict(zip(unique_texts, outcomes))
+
+    items = []
+    for index, text in enumerate(req.texts):
+        outcome = by_text[text]
+        if isinstance(outcome, Exception):
+            items.append({"index": index, "result": None, "error": str(outcome)})
+        else:
+            items.append({"index": index, "result": outcome, "error": None})
+
+    errors = sum(1 for item in items if item["error"])
+    logger.info(
+        f"✓ Batch analysis: {len(req.texts)} texts, {len(unique_texts)} unique, "
+        f"{cache_hits} cached, {degraded} degraded, {errors} errors (concurrency={concurrency})"
+    )
+
+    return {
+        "total": len(req.texts),
+        "unique": len(unique_texts),
+        "cache_hits": cache_hits,
+        "degraded": degraded,
+        "errors": errors,
+        "results": items
+    }
+
+
 @app.get("/api/cache/stats")
 async def get_cache_stats():
     """캐시 통계 조회"""
-    _clean_expired_cache()
-    return {
-        "cache_size": len(response_cache),
-        "cache_hit_rate": "N/A",  # 추적을 위해서는 별도 카운터 필요
-        "ttl_seconds": CACHE_TTL
-    }
+    llm_cache = get_llm_cache()
+    return {**response_cache.stats(), "llm": llm_cache.stats() if llm_cache else None}
+
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus text exposition (stage/LLM/request latency histograms, executor gauges)"""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/api/memory")
+async def get_memory_report():
+    """RSS/PSS/shared pages of this server's process group (Linux /proc)"""
+    try:
+        return prefork.memory_report()
+    except OSError as e:
+        raise HTTPException(status_code=501, detail=f"Memory report unavailable: {e}")
+
+
+@app.get("/api/admission/stats")
+async def get_admission_stats():
+    """In-flight calls, limits and admit/degrade counts per stage"""
+    return admission.stats()
+
+
+@app.get("/api/llm/limits")
+async def get_llm_limits():
+    """
+    Per-provider LLM limits with calls in flight / waiting for a slot or rate token,
+    plus hedging, circuit state and the speculative second-stage budget
+    """
+    speculation = None
+    if gemini_detector is not None:
+        speculation = {"enabled": config.speculation.enabled, **gemini_detector.rule_filter.speculation_budget.stats()}
+    return {**limiter_stats(), "hedging": hedge_stats(), "circuits": breaker_stats(), "speculation": speculation}
+
+
+@app.get("/api/executors/stats")
+async def get_executor_stats():
+    """Per-stage executor gauges (queue depth, active workers, rejections)"""
+    return executors.stats()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,202 @@
+"""
+Pre-fork serving mode: load models once, then fork uvicorn workers
+
+With ``uvicorn --workers N`` every worker loads its own Whisper model,
+ko-sroberta encoder and FAISS index. Here the parent process loads them once
+(``main.load_components``), freezes the GC so collections in the workers do
+not write to the parent's objects, binds the listening socket and forks N
+workers that serve the shared socket. The read-only weights and index stay on
+pages shared copy-on-write between all workers.
+
+``memory_report`` reads ``/proc/<pid>/smaps_rollup`` (Linux) to show how much
+of each worker's RSS is actually shared.
+
+Usage:
+    python scripts/run_server.py --prefork --workers 4
+    python scripts/memory_report.py [PARENT_PID]
+"""
+import gc
+import logging
+import os
+import signal
+import socket
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Set in the parent before forking; workers use it to report on the process group
+parent_pid: Optional[int] = None
+
+SMAPS_FIELDS = ("Rss", "Pss", "Shared_Clean", "Shared_Dirty", "Private_Clean", "Private_Dirty", "Swap")
+
+
+def read_smaps_rollup(pid: int) -> Dict[str, int]:
+    """Memory counters of one process in kB (Linux 4.14+)"""
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[0].rstrip(":") in SMAPS_FIELDS:
+                values[parts[0].rstrip(":")] = int(parts[1])
+    return {field: values.get(field, 0) for field in SMAPS_FIELDS}
+
+
+def child_pids(pid: int) -> List[int]:
+    """Direct children of a process"""
+    children_file = Path(f"/proc/{pid}/task/{pid}/children")
+    if children_file.exists():
+        return [int(p) for p in children_file.read_text().split()]
+
+    # Kernels without CONFIG_PROC_CHILDREN: scan /proc/*/stat for the parent pid
+    children = []
+    for stat in Path("/proc").glob("[0-9]*/stat"):
+        try:
+            fields = stat.read_text().rsplit(")", 1)[1].split()
+        except (OSError, IndexError):
+            continue
+        if int(fields[1]) == pid:
+            children.append(int(stat.parent.name))
+    return sorted(children)
+
+
+def memory_report(root_pid: Optional[int] = None) -> Dict:
+    """
+    RSS vs PSS of the pre-fork parent and its workers
+
+    Summed RSS counts a shared page once per process; summed PSS splits it
+    between the processes sharing it, so ``rss - pss`` is the memory saved by
+    sharing and PSS is the real footprint of the group.
+
+    Args:
+        root_pid: Parent process (default: pre-fork parent, else this process)
+    """
+    root = root_pid or parent_pid or os.getpid()
+    page_kb = os.sysconf("SC_PAGE_SIZE") // 1024
+
+    processes = []
+    for pid in [root] + child_pids(root):
+        try:
+            counters = read_smaps_rollup(pid)
+        except OSError:
+            continue  # exited or not readable
+        shared_kb = counters["Shared_Clean"] + counters["Shared_Dirty"]
+        private_kb = counters["Private_Clean"] + counters["Private_Dirty"]
+        processes.append({
+            "pid": pid,
+            "role": "parent" if pid == root else "worker",
+            "rss_kb": counters["Rss"],
+            "pss_kb": counters["Pss"],
+            "shared_kb": shared_kb,
+            "private_kb": private_kb,
+            "shared_pages": shared_kb // page_kb,
+            "shared_ratio": round(shared_kb / counters["Rss"], 4) if counters["Rss"] else 0.0
+        })
+
+    rss = sum(p["rss_kb"] for p in processes)
+    pss = sum(p["pss_kb"] for p in processes)
+    shared = sum(p["shared_kb"] for p in processes)
+    return {
+        "root_pid": root,
+        "workers": sum(1 for p in processes if p["role"] == "worker"),
+        "page_size_kb": page_kb,
+        "processes": processes,
+        "total": {
+            "rss_kb": rss,
+            "pss_kb": pss,
+            "shared_kb": shared,
+            "shared_pages": shared // page_kb,
+            "saved_by_sharing_kb": rss - pss
+        }
+    }
+
+
+def _bind_socket(host: str, port: int, backlog: int = 2048) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _run_worker(app, sock: socket.socket, index: int):
+    """Child process: serve the inherited socket until told to stop"""
+    import uvicorn
+
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+    logger.info(f"Pre-fork worker {index} started (pid {os.getpid()})")
+    server = uvicorn.Server(uvicorn.Config(app, log_level="info"))
+    server.run(sockets=[sock])
+
+
+def serve(host: str, port: int, workers: int):
+    """
+    Load models in this process, then fork and supervise ``workers`` servers
+
+    Workers that die unexpectedly are re-forked from the (still warm) parent.
+    """
+    global parent_pid
+
+    from src.server import main
+
+    start = time.time()
+    main.load_components()
+    if not main.warmup.is_ready():
+        raise SystemExit("Required components failed to load; not forking workers")
+    logger.info(f"✓ Models loaded in parent in {time.time() - start:.2f}s")
+
+    sock = _bind_socket(host, port)
+    parent_pid = os.getpid()
+
+    # Move everything allocated so far into the permanent generation: the
+    # workers' garbage collections then never write to (and un-share) it
+    gc.collect()
+    gc.freeze()
+
+    children: Dict[int, int] = {}
+    stopping = False
+
+    def spawn(index: int):
+        pid = os.fork()
+        if pid == 0:
+            try:
+                _run_worker(main.app, sock, index)
+            finally:
+                os._exit(0)
+        children[pid] = index
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    for i in range(workers):
+        spawn(i)
+    logger.info(f"✓ Pre-fork parent {parent_pid} serving http://{host}:{port} with {workers} workers")
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        index = children.pop(pid, None)
+        if index is not None and not stopping:
+            logger.warning(f"Worker {index} (pid {pid}) exited with status {status}; re-forking")
+            spawn(index)
+
+    sock.close()
+    logger.info("Pre-fork server stopped")
@@ -0,0 +1,88 @@
+"""
+Single-flight request coalescing
+
+Concurrent requests for the same key (e.g. a viral scam script submitted by
+many users within seconds) share one in-flight computation instead of each
+calling the LLM. The response cache only helps after the first call has
+finished; this covers the window while it is still running.
+
+The shared computation runs as its own task, so a caller that disconnects
+or gives up (``timeout``) does not cancel it for the others. Results and
+exceptions are delivered to every waiter; the key is forgotten as soon as
+the computation finishes, so later requests go through the cache again.
+
+The shared computation runs in its leader's context (e.g. the leader's
+request deadline). A failure that only reflects that context - the leader's
+budget ran out - can be retried by a follower under its own (``retry_if``).
+"""
+import asyncio
+import logging
+from typing import Any, Callable, Dict, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """Coalesce concurrent coroutine calls by key (one event loop)"""
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    async def do(
+        self,
+        key: Hashable,
+        coro_fn: Callable,
+        *args,
+        timeout: Optional[float] = None,
+        retry_if: Optional[Callable[[Exception], bool]] = None,
+        **kwargs
+    ) -> Any:
+        """
+        Await ``coro_fn(*args, **kwargs)``, or the identical call already in flight
+
+        Args:
+            timeout: Stop waiting after this many seconds (``asyncio.TimeoutError``);
+                the shared computation keeps running for the other waiters
+            retry_if: A caller that joined someone else's call and got an exception
+                for which this returns True runs the call again once, in its own
+                context, within what is left of its ``timeout``
+        """
+        task = self._calls.get(key)
+        led = task is None
+        if led:
+            task = asyncio.ensure_future(coro_fn(*args, **kwargs))
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+            self.leaders += 1
+        else:
+            self.coalesced += 1
+            logger.debug(f"Coalesced with in-flight call ({len(self._calls)} in flight)")
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        try:
+            if timeout is None:
+                return await asyncio.shield(task)
+            return await asyncio.wait_for(asyncio.shield(task), timeout=timeout)
+        except Exception as e:
+            if led or retry_if is None or isinstance(e, asyncio.TimeoutError) or not retry_if(e):
+                raise
+            logger.debug(f"Coalesced call failed for its leader ({e!r}), retrying under this caller")
+            if timeout is not None:
+                timeout = max(0.0, timeout - (loop.time() - started))
+            return await self.do(key, coro_fn, *args, timeout=timeout, **kwargs)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "in_flight": len(self._calls),
+            "leaders": self.leaders,
+            "coalesced": self.coalesced
+        }
+
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            task.exception()  # retrieved here so an unawaited failure is not logged as lost
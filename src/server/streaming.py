@@ -0,0 +1,226 @@
+"""
+Per-connection state for live (WebSocket) call analysis
+
+Audio arrives as small frames while the call is in progress. Frames are
+accumulated until a rolling window (``step_seconds``) is ready, the window is
+transcribed with Whisper and the transcript grows. Every buffer here is
+bounded so a long or stalled call cannot grow memory without limit:
+
+- pending PCM is capped at ``max_pending_seconds`` (oldest audio is dropped
+  if STT falls behind)
+- the transcript keeps only the last ``max_transcript_chars`` characters
+- container streams (WebM/Ogg Opus from MediaRecorder) are capped at
+  ``max_encoded_bytes`` of encoded data
+"""
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Dict, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+
+PCM_FORMATS = {
+    "pcm_s16le": np.int16,
+    "pcm_f32le": np.float32,
+}
+CONTAINER_FORMATS = {
+    "webm": ".webm",
+    "ogg": ".ogg",
+    "opus": ".webm",  # MediaRecorder "audio/webm;codecs=opus"
+}
+
+
+class StreamLimitExceeded(Exception):
+    """Raised when a container stream exceeds its encoded-size budget"""
+    pass
+
+
+def _resample(audio: np.ndarray, orig_sr: int) -> np.ndarray:
+    """Linear resampling to 16kHz (cheap enough for speech windows)"""
+    if orig_sr == SAMPLE_RATE or len(audio) == 0:
+        return audio
+    duration = len(audio) / orig_sr
+    target_len = int(round(duration * SAMPLE_RATE))
+    src_idx = np.linspace(0, len(audio) - 1, num=target_len)
+    return np.interp(src_idx, np.arange(len(audio)), audio).astype(np.float32)
+
+
+def _decode_container(data: bytes, suffix: str) -> np.ndarray:
+    """Decode an encoded container stream to 16kHz mono float32 (requires ffmpeg)"""
+    from whisper.audio import load_audio
+
+    fd, path = tempfile.mkstemp(suffix=suffix)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        return load_audio(path, sr=SAMPLE_RATE)
+    finally:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+class StreamingSession:
+    """
+    Bounded audio/transcript buffers for one streaming connection
+
+    Thread-safe: frames are added from the event loop while windows are taken
+    on the STT executor.
+    """
+
+    def __init__(
+        self,
+        audio_format: str = "pcm_s16le",
+        sample_rate: int = SAMPLE_RATE,
+        step_seconds: float = 4.0,
+        max_pending_seconds: float = 30.0,
+        max_transcript_chars: int = 4000,
+        max_encoded_bytes: int = 4 * 1024 * 1024
+    ):
+        if audio_format not in PCM_FORMATS and audio_format not in CONTAINER_FORMATS:
+            raise ValueError(
+                f"Unsupported audio format '{audio_format}'. "
+                f"Supported: {', '.join(list(PCM_FORMATS) + list(CONTAINER_FORMATS))}"
+            )
+
+        self.audio_format = audio_format
+        self.sample_rate = sample_rate
+        self.step_seconds = step_seconds
+        self.max_pending_samples = int(max_pending_seconds * SAMPLE_RATE)
+        self.max_transcript_chars = max_transcript_chars
+        self.max_encoded_bytes = max_encoded_bytes
+
+        self._lock = threading.Lock()
+        self._pending = np.zeros(0, dtype=np.float32)
+        self._encoded = bytearray()
+        self._decoded_samples = 0
+        self._last_decode = time.monotonic()
+        self._transcript = ""
+
+        self.received_bytes = 0
+        self.audio_seconds = 0.0
+        self.dropped_seconds = 0.0
+        self.windows = 0
+
+    @property
+    def is_container(self) -> bool:
+        return self.audio_format in CONTAINER_FORMATS
+
+    @property
+    def transcript(self) -> str:
+        with self._lock:
+            return self._transcript
+
+    def add_frame(self, data: bytes):
+        """Append one binary frame from the client"""
+        with self._lock:
+            self.received_bytes += len(data)
+
+            if self.is_container:
+                if len(self._encoded) + len(data) > self.max_encoded_bytes:
+                    raise StreamLimitExceeded(
+                        f"Encoded stream exceeds {self.max_encoded_bytes} bytes; "
+                        f"send PCM frames for long calls"
+                    )
+                self._encoded.extend(data)
+                return
+
+            dtype = PCM_FORMATS[self.audio_format]
+            usable = len(data) - len(data) % np.dtype(dtype).itemsize
+            samples = np.frombuffer(bytes(data[:usable]), dtype=dtype)
+            if dtype == np.int16:
+                samples = samples.astype(np.float32) / 32768.0
+            else:
+                samples = samples.astype(np.float32)
+            samples = _resample(samples, self.sample_rate)
+
+            self.audio_seconds += len(samples) / SAMPLE_RATE
+            self._append_pending(samples)
+
+    def ready(self) -> bool:
+        """True when a full step of new audio is waiting to be transcribed"""
+        with self._lock:
+            if self.is_container:
+                return (
+                    len(self._encoded) > 0 and
+                    time.monotonic() - self._last_decode >= self.step_seconds
+                )
+            return len(self._pending) >= self.step_seconds * SAMPLE_RATE
+
+    def take_window(self) -> np.ndarray:
+        """
+        Pop all pending audio as one 16kHz float32 window
+
+        Blocking for container formats (decodes with ffmpeg) - call it on the
+        STT executor, not the event loop.
+        """
+        if self.is_container:
+            with self._lock:
+                encoded = bytes(self._encoded)
+                self._last_decode = time.monotonic()
+            decoded = _decode_container(encoded, CONTAINER_FORMATS[self.audio_format])
+            with self._lock:
+                new_samples = decoded[self._decoded_samples:]
+                self._decoded_samples = len(decoded)
+                self.audio_seconds = len(decoded) / SAMPLE_RATE
+                self._append_pending(new_samples)
+
+        with self._lock:
+            window = self._pending
+            self._pending = np.zeros(0, dtype=np.float32)
+            if len(window):
+                self.windows += 1
+            return window
+
+    def add_transcript(self, text: str):
+        """Append a window's transcript, keeping only the most recent characters"""
+        text = text.strip()
+        if not text:
+            return
+        with self._lock:
+            combined = f"{self._transcript} {text}".strip()
+            if len(combined) > self.max_transcript_chars:
+                combined = combined[-self.max_transcript_chars:]
+            self._transcript = combined
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "format": self.audio_format,
+                "received_bytes": self.received_bytes,
+                "audio_seconds": round(self.audio_seconds, 2),
+                "pending_seconds": round(len(self._pending) / SAMPLE_RATE, 2),
+                "dropped_seconds": round(self.dropped_seconds, 2),
+                "windows": self.windows,
+                "transcript_chars": len(self._transcript)
+            }
+
+    def _append_pending(self, samples: np.ndarray):
+        # Caller holds the lock
+        pending = np.concatenate([self._pending, samples]) if len(self._pending) else samples
+        overflow = len(pending) - self.max_pending_samples
+        if overflow > 0:
+            pending = pending[overflow:]
+            self.dropped_seconds += overflow / SAMPLE_RATE
+            logger.warning(f"Streaming STT behind - dropped {overflow / SAMPLE_RATE:.1f}s of audio")
+        self._pending = pending
+
+
+def build_session(message: Optional[Dict], streaming_config) -> StreamingSession:
+    """Create a session from the client's optional ``{"type": "config"}`` message"""
+    message = message or {}
+    return StreamingSession(
+        audio_format=message.get("format", "pcm_s16le"),
+        sample_rate=int(message.get("sample_rate", SAMPLE_RATE)),
+        step_seconds=streaming_config.step_seconds,
+        max_pending_seconds=streaming_config.max_pending_seconds,
+        max_transcript_chars=streaming_config.max_transcript_chars,
+        max_encoded_bytes=streaming_config.max_encoded_bytes
+    )
@@ -0,0 +1,175 @@
+"""
+Concurrent model warm-up with per-component timing
+
+Independent components (Whisper, the embedding model + FAISS index, LLM
+clients) are loaded in parallel threads; a component starts as soon as the
+components it depends on are ready. The registry doubles as the readiness
+state behind ``/health/ready``.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+STATUS_PENDING = "pending"
+STATUS_LOADING = "loading"
+STATUS_READY = "ready"
+STATUS_FAILED = "failed"
+
+
+class Component:
+    """One warm-up unit: factory, dependencies and load outcome"""
+
+    def __init__(self, name: str, factory: Callable, depends_on: Sequence[str], required: bool):
+        self.name = name
+        self.factory = factory
+        self.depends_on = tuple(depends_on)
+        self.required = required
+        self.status = STATUS_PENDING
+        self.value: Any = None
+        self.error: Optional[str] = None
+        self.started_at: Optional[float] = None
+        self.seconds: Optional[float] = None
+
+
+class WarmupRegistry:
+    """
+    Registry of startup components loaded concurrently
+
+    Example:
+        registry.register("stt", lambda: WhisperSTT("base"))
+        registry.register("vector_store", load_vector_store)
+        registry.register("pipeline", PhishingDetectionPipeline, depends_on=["stt", "vector_store"])
+        registry.run()
+
+    A factory receives the values of its dependencies as positional arguments,
+    in ``depends_on`` order. Optional components (``required=False``) may fail
+    without making the service unready.
+    """
+
+    def __init__(self):
+        self._components: Dict[str, Component] = {}
+        self._lock = threading.Lock()
+        self._started_at: Optional[float] = None
+        self._total_seconds: Optional[float] = None
+        self.finished = threading.Event()
+
+    def register(
+        self,
+        name: str,
+        factory: Callable,
+        depends_on: Sequence[str] = (),
+        required: bool = True
+    ):
+        for dep in depends_on:
+            if dep not in self._components:
+                raise ValueError(f"Component '{name}' depends on unknown component '{dep}'")
+        self._components[name] = Component(name, factory, depends_on, required)
+
+    def get(self, name: str) -> Any:
+        """Loaded value of a component (None if not ready)"""
+        component = self._components.get(name)
+        return component.value if component and component.status == STATUS_READY else None
+
+    def run(self, max_workers: int = 4) -> Dict[str, Any]:
+        """
+        Load all components, in parallel where dependencies allow (blocking)
+
+        Returns:
+            Mapping name → loaded value for components that became ready
+        """
+        self._started_at = time.time()
+        remaining = dict(self._components)
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="warmup") as pool:
+            running = {}
+            while remaining or running:
+                for name, component in list(remaining.items()):
+                    deps = [self._components[d] for d in component.depends_on]
+                    failed = [d.name for d in deps if d.status == STATUS_FAILED]
+                    if failed:
+                        self._mark_failed(component, f"dependency failed: {', '.join(failed)}")
+                        del remaining[name]
+                    elif all(d.status == STATUS_READY for d in deps):
+                        with self._lock:
+                            component.status = STATUS_LOADING
+                            component.started_at = time.time()
+                        running[pool.submit(component.factory, *[d.value for d in deps])] = component
+                        del remaining[name]
+
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    component = running.pop(future)
+                    try:
+                        value = future.result()
+                    except Exception as e:
+                        self._mark_failed(component, str(e))
+                        continue
+                    with self._lock:
+                        component.value = value
+                        component.status = STATUS_READY
+                        component.seconds = time.time() - component.started_at
+                    logger.info(f"✓ {component.name} ready in {component.seconds:.2f}s")
+
+        self._total_seconds = time.time() - self._started_at
+        self.finished.set()
+        self._log_report()
+        return {name: c.value for name, c in self._components.items() if c.status == STATUS_READY}
+
+    def is_ready(self) -> bool:
+        """True once every required component has loaded"""
+        with self._lock:
+            return all(c.status == STATUS_READY for c in self._components.values() if c.required)
+
+    def report(self) -> Dict:
+        """Startup timing report (per component and total wall time)"""
+        with self._lock:
+            now = time.time()
+            components = {}
+            for name, c in self._components.items():
+                seconds = c.seconds
+                if seconds is None and c.started_at is not None:
+                    seconds = now - c.started_at
+                components[name] = {
+                    "status": c.status,
+                    "required": c.required,
+                    "depends_on": list(c.depends_on),
+                    "seconds": round(seconds, 3) if seconds is not None else None,
+                    "error": c.error
+                }
+            total = self._total_seconds
+            if total is None and self._started_at is not None:
+                total = now - self._started_at
+            return {
+                "finished": self.finished.is_set(),
+                "total_seconds": round(total, 3) if total is not None else None,
+                "sequential_seconds": round(sum(c["seconds"] or 0 for c in components.values()), 3),
+                "components": components
+            }
+
+    def _mark_failed(self, component: Component, error: str):
+        with self._lock:
+            component.status = STATUS_FAILED
+            component.error = error
+            if component.started_at is not None:
+                component.seconds = time.time() - component.started_at
+        log = logger.error if component.required else logger.warning
+        log(f"✗ {component.name} failed to load: {error}")
+
+    def _log_report(self):
+        report = self.report()
+        logger.info("=" * 60)
+        logger.info(
+            f"Startup timing: {report['total_seconds']:.2f}s wall "
+            f"({report['sequential_seconds']:.2f}s if loaded sequentially)"
+        )
+        for name, c in report["components"].items():
+            seconds = f"{c['seconds']:.2f}s" if c["seconds"] is not None else "-"
+            logger.info(f"  {name:<16} {c['status']:<8} {seconds:>8}")
+        logger.info("=" * 60)
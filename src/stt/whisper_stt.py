@@ -3,12 +3,12 @@ Whisper-based Speech-to-Text implementation
 Uses OpenAI Whisper for Korean speech recognition
 """
 import time
-import whisper
 import numpy as np
 from pathlib import Path
 from typing import Dict, List, Optional, Union
 import logging
-import librosa
+
+from src.monitoring import timed
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -38,6 +38,8 @@ class WhisperSTT:
         logger.info(f"Loading Whisper model: {model_size} on {device}")
         start_time = time.time()
 
+        import whisper  # heavy (torch) - imported only when a model is loaded
+
         self.model = whisper.load_model(model_size, device=device)
 
         load_time = time.time() - start_time
@@ -87,19 +89,21 @@ class WhisperSTT:
             try:
                 import soundfile as sf
                 logger.debug(f"Attempting soundfile...")
-                audio_data, sample_rate = sf.read(str(audio), dtype='float32')
+                with timed("decode"):
+                    audio_data, sample_rate = sf.read(str(audio), dtype='float32')
 
-                # Convert stereo to mono
-                if len(audio_data.shape) > 1:
-                    audio_data = audio_data.mean(axis=1)
+                    # Convert stereo to mono
+                    if len(audio_data.shape) > 1:
+                        audio_data = audio_data.mean(axis=1)
 
-                # Resample to 16kHz if needed
-                if sample_rate != 16000:
-                    audio_data = librosa.resample(audio_data, orig_sr=sample_rate, target_sr=16000)
-                    sample_rate = 16000
+                    # Resample to 16kHz if needed
+                    if sample_rate != 16000:
+                        import librosa
+                        audio_data = librosa.resample(audio_data, orig_sr=sample_rate, target_sr=16000)
+                        sample_rate = 16000
 
                 logger.info(f"✓ Soundfile: {len(audio_data)} samples at {sample_rate}Hz ({len(audio_data)/sample_rate:.2f}s)")
-                result = self.model.transcribe(audio_data, **options)
+                result = self._run_model(audio_data, **options)
                 loaded = True
 
             except Exception as e1:
@@ -108,10 +112,12 @@ class WhisperSTT:
             # Try 2: librosa (handles MP3, OGG, etc.)
             if not loaded:
                 try:
+                    import librosa
                     logger.debug(f"Attempting librosa...")
-                    audio_data, sr = librosa.load(str(audio), sr=16000, mono=True)
+                    with timed("decode"):
+                        audio_data, sr = librosa.load(str(audio), sr=16000, mono=True)
                     logger.info(f"✓ Librosa: {len(audio_data)} samples at {sr}Hz ({len(audio_data)/sr:.2f}s)")
-                    result = self.model.transcribe(audio_data, **options)
+                    result = self._run_model(audio_data, **options)
                     loaded = True
 
                 except Exception as e2:
@@ -120,11 +126,11 @@ class WhisperSTT:
             # Try 3: Whisper direct (uses ffmpeg internally)
             if not loaded:
                 logger.warning(f"All Python loaders failed, trying Whisper direct (requires ffmpeg)")
-                result = self.model.transcribe(str(audio), **options)
+                result = self._run_model(str(audio), **options)
                 logger.info(f"✓ Whisper direct transcription successful")
         else:
             # Already a numpy array
-            result = self.model.transcribe(audio, **options)
+            result = self._run_model(audio, **options)
 
         transcribe_time = time.time() - start_time
 
@@ -140,6 +146,11 @@ class WhisperSTT:
 
         return result
 
+    def _run_model(self, audio: Union[str, np.ndarray], **options) -> Dict:
+        """Whisper inference (timed as the "stt" stage; includes ffmpeg decode for paths)"""
+        with timed("stt"):
+            return self.model.transcribe(audio, **options)
+
     def transcribe_with_timestamps(
         self,
         audio: Union[str, Path, np.ndarray]
@@ -7,11 +7,10 @@ import pickle
 from pathlib import Path
 from typing import List, Dict, Tuple, Optional
 import numpy as np
-import faiss
-from sentence_transformers import SentenceTransformer
 import logging
 
 from src.config import config
+from src.monitoring import timed
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -37,7 +36,9 @@ class PhishingVectorStore:
         self.vector_db_path = vector_db_path or config.data_dir / "vector_db"
         self.vector_db_path.mkdir(parents=True, exist_ok=True)
 
-        # Load sentence transformer model
+        # Load sentence transformer model (heavy import - torch)
+        from sentence_transformers import SentenceTransformer
+
         logger.info(f"Loading embedding model: {model_name}")
         self.model = SentenceTransformer(model_name)
         self.embedding_dim = self.model.get_sentence_embedding_dimension()
@@ -75,6 +76,8 @@ class PhishingVectorStore:
 
         # Initialize FAISS index if not exists
         if self.index is None:
+            import faiss
+
             # Use IndexFlatIP for cosine similarity (with normalized vectors)
             self.index = faiss.IndexFlatIP(self.embedding_dim)
             logger.info(f"Created FAISS index with dimension {self.embedding_dim} (Cosine Similarity)")
@@ -114,13 +117,15 @@ class PhishingVectorStore:
             return []
 
         # Encode query (normalize for cosine similarity)
-        query_embedding = self.model.encode([query], convert_to_numpy=True, normalize_embeddings=True)
+        with timed("embedding"):
+            query_embedding = self.model.encode([query], convert_to_numpy=True, normalize_embeddings=True)
 
         # Search in FAISS
-        scores, indices = self.index.search(
-            query_embedding.astype('float32'),
-            min(top_k, len(self.scripts))
-        )
+        with timed("faiss_search"):
+            scores, indices = self.index.search(
+                query_embedding.astype('float32'),
+                min(top_k, len(self.scripts))
+            )
 
         # IndexFlatIP returns cosine similarity (higher is better, range -1 to 1)
         # Convert to 0-1 range: (score + 1) / 2
@@ -150,6 +155,8 @@ class PhishingVectorStore:
             logger.warning("No index to save")
             return
 
+        import faiss
+
         # Save FAISS index
         index_path = self.vector_db_path / f"{name}.index"
         faiss.write_index(self.index, str(index_path))
@@ -182,6 +189,8 @@ class PhishingVectorStore:
             logger.warning(f"Vector database not found at {self.vector_db_path}")
             return False
 
+        import faiss
+
         # Load FAISS index
         self.index = faiss.read_index(str(index_path))
 
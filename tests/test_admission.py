@@ -0,0 +1,89 @@
+"""
+Admission control tests (deadlines, in-flight limits)
+"""
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+from src.server.admission import (
+    AdmissionController, DeadlineExceeded, StageSaturated, deadline_scope, deadline_timeout
+)
+from src.server.executors import StageExecutor, StageExecutors
+
+
+def make_controller(llm_limit=1):
+    executors = StageExecutors({"llm": StageExecutor("llm", 4, 16)})
+    return AdmissionController(executors, limits={"llm": llm_limit}, min_budget={"llm": 0.05})
+
+
+def test_deadline_exceeded_and_timeout_capped():
+    """A slow LLM call is abandoned at the deadline; the HTTP timeout follows the budget"""
+    controller = make_controller()
+
+    def slow_llm():
+        timeout = deadline_timeout(30, grace=0)
+        time.sleep(0.3)
+        return timeout
+
+    async def scenario():
+        with deadline_scope(0.1):
+            with pytest.raises(DeadlineExceeded):
+                await controller.run("llm", slow_llm)
+        with deadline_scope(1.0):
+            return await controller.run("llm", slow_llm)
+
+    timeout = asyncio.run(scenario())
+    assert timeout <= 1.0
+    assert deadline_timeout(30) == 30  # no deadline outside a request
+    stats = controller.stats()["llm"]
+    assert stats["deadline_exceeded"] == 1
+    assert stats["in_flight"] == 0
+
+
+def test_abandoned_call_keeps_slot_until_finished():
+    """In-flight limit counts abandoned calls, so a new request is rejected, not queued"""
+    controller = make_controller(llm_limit=1)
+
+    async def scenario():
+        with deadline_scope(0.1):
+            with pytest.raises(DeadlineExceeded):
+                await controller.run("llm", time.sleep, 0.5)
+        with deadline_scope(0.2):
+            with pytest.raises(StageSaturated):
+                await controller.run("llm", lambda: "ok")
+        await asyncio.sleep(0.5)
+        with deadline_scope(1.0):
+            return await controller.run("llm", lambda: "ok")
+
+    assert asyncio.run(scenario()) == "ok"
+    assert controller.stats()["llm"]["saturated"] == 1
+
+
+def test_async_call_cancelled_at_deadline_frees_slot():
+    """Coroutines (async LLM clients) are cancelled at the deadline and release their slot at once"""
+    controller = make_controller(llm_limit=1)
+
+    async def slow_llm():
+        await asyncio.sleep(5)
+
+    async def fast_llm():
+        return "ok"
+
+    async def scenario():
+        with deadline_scope(0.1):
+            with pytest.raises(DeadlineExceeded):
+                await controller.run_async("llm", slow_llm)
+        with deadline_scope(0.2):
+            return await controller.run_async("llm", fast_llm)
+
+    assert asyncio.run(scenario()) == "ok"
+    assert controller.stats()["llm"]["in_flight"] == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,159 @@
+"""
+Multi-agent prompting modes (separate: 3 calls per model, combined: 1 structured call)
+"""
+import sys
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+import src.cache.llm_cache as llm_cache
+from src.cache import MemoryCacheBackend, ResponseCache
+from src.config import config
+from src.llm.agent_prompts import combine_agent_prompts, combined_call_options, split_combined_result
+from src.llm.llm_clients.base_client import BaseLLMClient
+from src.llm.multi_agent_detector import MultiAgentPhishingDetector
+from src.llm.multi_llm_ensemble import MultiLLMEnsemble
+
+AGENT_PROMPT = """당신은 {agent} 전문가입니다.
+
+**통화 내용:**
+"검찰입니다."
+
+**응답 (JSON):**
+{{
+  "score": <0-100 정수>,
+  "{flag}": <true/false>
+}}
+
+JSON:"""
+
+
+class CombinedClient:
+    """Answers every agent in one call"""
+
+    def __init__(self):
+        self.prompts = []
+
+    def analyze_phishing(self, text, prompt, **options):
+        self.prompts.append(prompt)
+        return {
+            "context": {"score": 90, "reasoning": "사칭"},
+            "psychological": {"score": 80, "reasoning": "압박"},
+            "financial": {"score": 60, "reasoning": "앱 설치"},
+            "model": "fake",
+            "usage": {"prompt_tokens": 1000, "output_tokens": 301}
+        }
+
+
+class AgentClient:
+    """One agent per call; the financial agent is slow"""
+
+    model_name = "fake"
+
+    def __init__(self):
+        self.prompts = []
+
+    def is_available(self):
+        return True
+
+    def analyze_phishing(self, text, prompt):
+        self.prompts.append(prompt)
+        if "금융 보안 전문가" in prompt:
+            time.sleep(1.0)
+            return {"score": 10, "reasoning": "늦은 응답"}
+        return {"score": 80 if "프로파일러" in prompt else 90, "reasoning": "의심"}
+
+
+def test_combined_prompt_keeps_each_agents_fields_and_sends_the_transcript_once():
+    prompts = {
+        agent: AGENT_PROMPT.format(agent=agent, flag=flag)
+        for agent, flag in (("context", "is_suspicious"), ("financial", "request_detected"))
+    }
+    prompt = combine_agent_prompts(prompts, transcript_block='**통화 내용:**\n"검찰입니다."')
+
+    assert "검찰입니다" not in prompt and prompt.count("**응답 (JSON") == 1
+    assert '  "context": {\n    "score"' in prompt and '"request_detected"' in prompt
+
+    split = split_combined_result({"context": {"score": 90}, "usage": {"prompt_tokens": 7}}, ["context", "financial"])
+    assert split["context"]["score"] == 90 and "error" not in split["context"]
+    assert "error" in split["financial"]  # missing agent = failed agent
+    assert split["context"]["usage"]["prompt_tokens"] + split["financial"]["usage"]["prompt_tokens"] == 7
+
+
+
+class TruncatedClient(BaseLLMClient):
+    """Answers a combined prompt with only the first agent (cut off at the output limit)"""
+
+    provider = "test_truncated"
+
+    def __init__(self):
+        super().__init__("key")
+        self.payloads = []
+
+    def is_available(self):
+        return True
+
+    def _build_request(self, text, prompt):
+        return "http://llm.invalid/v1", {}, {"model": "fake", "max_tokens": 800}
+
+    def _extract_content(self, result):
+        return result["content"]
+
+    def _post(self, url, headers, payload):
+        self.payloads.append(payload)
+        return {"content": '{"context": {"score": 90, "reasoning": "사칭"}, "psychological": {"sco'}
+
+
+def test_incomplete_combined_answer_is_not_cached_and_gets_a_larger_output_limit(monkeypatch):
+    monkeypatch.setattr(config.llm_cache, "enabled", True)
+    monkeypatch.setattr(llm_cache, "_llm_cache", ResponseCache(MemoryCacheBackend(), ttl_seconds=60))
+    client = TruncatedClient()
+
+    for _ in range(2):
+        result = client.analyze_phishing("검찰입니다.", "combined prompt", **combined_call_options())
+        assert "cached" not in result  # a partial answer is retried, not replayed for the cache TTL
+    assert len(client.payloads) == 2 and client.payloads[0]["max_tokens"] > 800
+
+
+def test_combined_mode_makes_one_call_per_model_with_the_same_weights():
+    ensemble = MultiLLMEnsemble(agent_mode="combined")
+    client = CombinedClient()
+    ensemble.available_llms = {"Fake": client}
+
+    result = ensemble.analyze("검찰입니다. 앱을 설치하세요.")
+
+    assert len(client.prompts) == 1 and result["llm_calls"] == 1
+    assert result["llm_scores"]["Fake"] == round(90 * 0.35 + 80 * 0.35 + 60 * 0.30, 2)
+    assert sum(item["usage"]["output_tokens"] for item in result["all_results"].values()) == 301
+
+
+def test_agents_run_concurrently_and_a_timed_out_agent_is_renormalized_away():
+    client = AgentClient()
+    detector = MultiAgentPhishingDetector(agent_mode="separate", client=client, agent_timeout=0.3)
+
+    start = time.perf_counter()
+    result = detector.analyze("검찰입니다. 모텔로 이동하세요.")
+
+    assert time.perf_counter() - start < 0.9  # not the sum of three round trips
+    assert result["missing_agents"] == ["financial"]
+    assert result["risk_score"] == round((90 * 0.35 + 80 * 0.35) / 0.70, 2)
+    assert result["agent_scores"]["financial"] is None  # not 0 ("safe")
+    assert result["confidence"] < 85
+    assert all("모텔로 이동하세요" not in prompt for prompt in client.prompts)  # the client adds the transcript
+
+
+
+def test_no_agent_answering_is_an_error_not_a_verdict():
+    client = AgentClient()
+    client.analyze_phishing = lambda text, prompt: {"score": 50, "error": "HTTP 503", "error_type": "transient"}
+    detector = MultiAgentPhishingDetector(agent_mode="separate", client=client)
+
+    result = detector.analyze("검찰입니다.")
+
+    assert result["error_type"] == "transient" and result["missing_agents"] == ["context", "psychological", "financial"]
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,59 @@
+"""
+Multi-transcript (batched) LLM prompting tests
+"""
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+from src.config import config
+from src.llm.llm_clients.base_client import BaseLLMClient
+from src.llm.llm_clients.errors import BatchParseError
+from src.llm.llm_clients.gemini_client import GeminiClient
+from scripts.mock_llm_server import MockBehavior, start_server
+
+
+def test_batch_response_is_ordered_by_index_and_checked():
+    items = BaseLLMClient._parse_batch_response(
+        '```json\n[{"index": 2, "score": 90, "is_phishing": true}, {"index": 1, "score": 5}]\n```', 2
+    )
+    assert [item["score"] for item in items] == [5, 90]
+    assert items[0]["is_phishing"] is False and "index" not in items[0]
+
+    with pytest.raises(BatchParseError):
+        BaseLLMClient._parse_batch_response('[{"index": 1, "score": 5}]', 2)  # one verdict missing
+    with pytest.raises(BatchParseError):
+        BaseLLMClient._parse_batch_response('[{"index": 1, "score": 5}, {"index": 2, "sco', 2)  # truncated
+
+
+
+def test_a_response_without_candidates_splits_instead_of_aborting(monkeypatch):
+    client = GeminiClient(api_key="key")
+    monkeypatch.setattr(config.llm_cache, "enabled", False)
+    monkeypatch.setattr(client, "_post", lambda url, headers, payload: {
+        "candidates": [], "promptFeedback": {"blockReason": "SAFETY"}
+    })
+
+    with pytest.raises(BatchParseError):  # split and retry, finished chunks are kept
+        client.analyze_batch(["첫 번째 통화", "두 번째 통화"], "prompt")
+    assert client.analyze_phishing("첫 번째 통화", "prompt")["error_type"] == "permanent"
+
+def test_one_request_scores_every_transcript(monkeypatch):
+    behavior = MockBehavior("fixed:5", verdicts=[{"match": "예약하신", "score": 8}])
+    server = start_server(behavior)
+    monkeypatch.setattr(config.llm_endpoints, "default", f"http://127.0.0.1:{server.server_port}")
+    try:
+        items = GeminiClient(api_key="mock").analyze_batch(
+            ["예약하신 진료 안내입니다.", "검찰입니다. 팀뷰어 설치하고 송금하세요."], "prompt"
+        )
+    finally:
+        server.shutdown()
+
+    assert items[0]["score"] == 8 and items[1]["score"] >= 70
+    assert all(item["batch_size"] == 2 for item in items)  # one request, two verdicts
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
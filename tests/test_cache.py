@@ -0,0 +1,131 @@
+"""
+Response cache tests
+"""
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+from src.cache import MemoryCacheBackend, SQLiteCacheBackend, ResponseCache, llm_cache_key
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend_factory(request, tmp_path):
+    def factory(**kwargs):
+        if request.param == "memory":
+            return MemoryCacheBackend(**kwargs)
+        return SQLiteCacheBackend(tmp_path / "cache.sqlite", **kwargs)
+    return factory
+
+
+def test_ttl_expiry(backend_factory):
+    """Entries expire after their TTL and are counted"""
+    clock = FakeClock()
+    backend = backend_factory(clock=clock)
+    backend.set("a", {"score": 95}, ttl=10)
+
+    assert backend.get("a") == {"score": 95}
+    clock.now += 11
+    assert backend.get("a") is None
+    assert backend.expirations == 1
+
+
+def test_lru_eviction_by_entries(backend_factory):
+    """Least recently used entry is evicted when over max_entries"""
+    clock = FakeClock()
+    backend = backend_factory(max_entries=2, clock=clock)
+    backend.set("a", 1, ttl=60)
+    clock.now += 1
+    backend.set("b", 2, ttl=60)
+    clock.now += 1
+    assert backend.get("a") == 1  # a is now most recently used
+    clock.now += 1
+    backend.set("c", 3, ttl=60)
+
+    assert backend.get("b") is None
+    assert backend.get("a") == 1
+    assert backend.get("c") == 3
+    assert backend.evictions == 1
+
+
+def test_byte_budget(backend_factory):
+    """Byte budget bounds the cache independently of entry count"""
+    backend = backend_factory(max_entries=1000, max_bytes=100)
+    for i in range(10):
+        backend.set(f"k{i}", "x" * 30, ttl=60)
+
+    assert backend.size()["bytes"] <= 100
+    assert backend.evictions > 0
+
+
+def test_key_includes_parameters():
+    """Different parameters never share a cache entry"""
+    filtered = ResponseCache.make_key("gemini", "검찰청입니다", enable_filter=True, prompt_version="v1")
+    unfiltered = ResponseCache.make_key("gemini", "검찰청입니다", enable_filter=False, prompt_version="v1")
+    new_prompt = ResponseCache.make_key("gemini", "검찰청입니다", enable_filter=True, prompt_version="v2")
+
+    assert len({filtered, unfiltered, new_prompt}) == 3
+
+
+def test_hit_rate_accounting():
+    """Hits and misses are counted and reported"""
+    cache = ResponseCache(MemoryCacheBackend(), ttl_seconds=60)
+    cache.get("missing")
+    cache.set("k", {"score": 10})
+    cache.get("k")
+    cache.get("k")
+
+    stats = cache.stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+    assert stats["cache_hit_rate"] == pytest.approx(2 / 3, rel=1e-3)
+
+
+def test_sqlite_shared_between_instances(tmp_path):
+    """Two backends on the same file (e.g. two workers) share entries"""
+    path = tmp_path / "shared.sqlite"
+    writer = SQLiteCacheBackend(path)
+    reader = SQLiteCacheBackend(path)
+
+    writer.set("k", {"score": 42}, ttl=60)
+    assert reader.get("k") == {"score": 42}
+
+
+
+def test_sqlite_totals_track_every_change(tmp_path):
+    """The meta totals follow inserts, overwrites, deletes and clears; hits do not write"""
+    backend = SQLiteCacheBackend(tmp_path / "cache.sqlite")
+    backend.set("a", "x" * 10, ttl=60)
+    backend.set("b", "y" * 20, ttl=60)
+    backend.set("a", "z" * 30, ttl=60)
+    backend.delete("b")
+
+    assert backend.size() == {"entries": 1, "bytes": 32}
+    changes = backend._conn().total_changes
+    assert backend.get("a") == "z" * 30
+    assert backend._conn().total_changes == changes
+
+    backend.clear()
+    assert backend.size() == {"entries": 0, "bytes": 0}
+
+
+def test_llm_cache_key_normalizes_text_and_tracks_prompt():
+    """Whitespace-only differences share a key; a changed prompt or model does not"""
+    key = llm_cache_key("gemini", "Gemini 2.5 Flash", "prompt v1", "검찰청입니다.\n  계좌가 동결됩니다.")
+
+    assert key == llm_cache_key("gemini", "Gemini 2.5 Flash", "prompt v1", " 검찰청입니다. 계좌가 동결됩니다. ")
+    assert key != llm_cache_key("gemini", "Gemini 2.5 Flash", "prompt v2", "검찰청입니다. 계좌가 동결됩니다.")
+    assert key != llm_cache_key("gemini", "Gemini 2.5 Pro", "prompt v1", "검찰청입니다. 계좌가 동결됩니다.")
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
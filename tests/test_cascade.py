@@ -0,0 +1,113 @@
+"""
+LLM cascade bands (fake first stage and escalation)
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+from src.llm.cascade_detector import CascadeDetector
+
+
+class FakeFirstStage:
+    """Gemini stand-in: query_llm returns ``score`` (or an error result); finalize keeps it"""
+
+    def __init__(self, score=None, error_type=None):
+        self.score = score
+        self.error_type = error_type
+
+    def is_available(self):
+        return True
+
+    def query_llm(self, text):
+        if self.error_type:
+            return {"score": 50, "error": "HTTP 503", "error_type": self.error_type}
+        return {"score": self.score, "reasoning": "fake"}
+
+    async def query_llm_async(self, text):
+        return self.query_llm(text)
+
+    def finalize(self, text, gemini_result, allow_second_stage=True):
+        score = gemini_result["score"]
+        return {"score": score, "is_phishing": score >= 70, "rule": "gemini_only", "reasoning": "fake"}
+
+    def _llm_failed(self, gemini_result):
+        return {"score": 50, "is_phishing": False, "rule": "error", **gemini_result}
+
+
+class FakeEscalation:
+    """3-Agent stand-in with a fixed verdict (or an error result)"""
+
+    def __init__(self, score=70, error_type=None):
+        self.score = score
+        self.error_type = error_type
+        self.calls = 0
+
+    def is_available(self):
+        return True
+
+    def analyze(self, text, similar_cases=None):
+        self.calls += 1
+        result = {"risk_score": self.score, "is_phishing": self.score >= 70, "llm_scores": {"Fake": self.score},
+                  "llm_calls": 3}
+        if self.error_type:
+            result.update(risk_score=50, is_phishing=False, llm_scores={},
+                          error="no agent answered", error_type=self.error_type)
+        return result
+
+
+def make_cascade(first, escalation=None):
+    return CascadeDetector(first_stage=first, escalation=escalation or FakeEscalation(),
+                           safe_below=30, phishing_at=85)
+
+
+@pytest.mark.parametrize("score, band", [(10, "safe"), (29, "safe"), (85, "phishing"), (97, "phishing")])
+def test_clear_first_stage_scores_are_final(score, band):
+    escalation = FakeEscalation()
+    result = make_cascade(FakeFirstStage(score), escalation).analyze("검찰청입니다.")
+
+    assert escalation.calls == 0
+    assert result["risk_score"] == score and result["cascade"]["band"] == band
+    assert result["cascade"]["stage"] == "first" and result["cascade"]["llm_calls"] == 1
+
+
+@pytest.mark.parametrize("score", [30, 60, 84])
+def test_uncertain_first_stage_scores_escalate(score):
+    result = make_cascade(FakeFirstStage(score), FakeEscalation(75)).analyze("검찰청입니다.")
+
+    assert result["risk_score"] == 75 and result["is_phishing"]
+    assert result["cascade"]["stage"] == "escalated" and result["cascade"]["band"] == "uncertain"
+    assert result["cascade"]["llm_calls"] == 4
+    assert result["llm_scores"] == {"Gemini (1st)": score, "Fake": 75}
+
+
+def test_first_stage_error_escalates_regardless_of_its_placeholder_score():
+    result = asyncio.run(
+        make_cascade(FakeFirstStage(error_type="transient"), FakeEscalation(20)).analyze_async("택배입니다.")
+    )
+
+    assert result["cascade"]["stage"] == "escalated" and result["risk_score"] == 20
+    assert "error" not in result
+
+
+def test_first_stage_and_escalation_both_failing_is_an_error():
+    result = make_cascade(
+        FakeFirstStage(error_type="circuit_open"), FakeEscalation(error_type="transient")
+    ).analyze("검찰청입니다.")
+
+    assert result["error_type"] == "circuit_open" and result["cascade"]["stage"] == "failed"
+    assert result["cascade"]["escalation_error"] == "no agent answered"
+
+
+def test_failed_escalation_keeps_the_first_stage_verdict():
+    result = make_cascade(FakeFirstStage(60), FakeEscalation(error_type="transient")).analyze("검찰청입니다.")
+
+    assert result["risk_score"] == 60 and "error" not in result
+    assert result["cascade"]["stage"] == "first" and result["cascade"]["escalation_error"] == "no agent answered"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,117 @@
+"""
+Multi-LLM ensemble quorum early exit (fake clients, separate agent mode)
+"""
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+from src.llm.multi_llm_ensemble import MultiLLMEnsemble
+
+
+class ScoreClient:
+    """Gives every agent the same score after ``delay`` seconds (or an error result)"""
+
+    def __init__(self, score=None, delay=0.0, error_type=None):
+        self.score = score
+        self.delay = delay
+        self.error_type = error_type
+        self.calls = 0
+
+    def analyze_phishing(self, text, prompt, **options):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.error_type:
+            return {"score": 50, "error": "HTTP 503", "error_type": self.error_type}
+        return {"score": self.score, "reasoning": "fake"}
+
+
+def make_ensemble(clients, quorum=2):
+    ensemble = MultiLLMEnsemble(agent_mode="separate")
+    ensemble.available_llms = clients
+    ensemble.quorum = quorum
+    ensemble.quorum_margin = 15  # phishing vote >= 85, safe vote <= 55
+    return ensemble
+
+
+def test_quorum_returns_without_waiting_for_the_slow_llm():
+    ensemble = make_ensemble({
+        "A": ScoreClient(95),
+        "B": ScoreClient(90, delay=0.05),
+        "Slow": ScoreClient(10, delay=1.0)
+    })
+
+    start = time.perf_counter()
+    result = ensemble.analyze("검찰청입니다. 계좌가 동결됩니다.")
+
+    assert time.perf_counter() - start < 0.9
+    assert result["quorum"]["reached"] and result["quorum"]["side"] == "phishing"
+    assert result["contributors"] == ["A", "B"] and result["stragglers"] == ["Slow"]
+    assert result["ensemble_score"] == 92.5 and result["is_phishing"]
+
+
+def test_async_quorum_returns_without_waiting_for_the_slow_llm():
+    ensemble = make_ensemble({
+        "A": ScoreClient(10),
+        "B": ScoreClient(20, delay=0.05),
+        "Slow": ScoreClient(95, delay=1.0)
+    })
+
+    async def analyze():
+        start = time.perf_counter()
+        result = await ensemble.analyze_async("택배 배송 안내입니다.")
+        return result, time.perf_counter() - start
+
+    result, elapsed = asyncio.run(analyze())
+
+    assert elapsed < 0.9
+    assert result["quorum"]["side"] == "safe" and result["stragglers"] == ["Slow"]
+    assert not result["is_phishing"]
+
+def test_a_dissenting_vote_blocks_early_exit():
+    ensemble = make_ensemble({
+        "A": ScoreClient(95, delay=0.05),
+        "B": ScoreClient(90, delay=0.1),
+        "Dissent": ScoreClient(10)
+    })
+
+    result = ensemble.analyze("검찰청입니다. 계좌가 동결됩니다.")
+
+    assert not result["quorum"]["reached"]
+    assert result["quorum"]["votes"] == {"phishing": ["A", "B"], "safe": ["Dissent"]}
+    assert sorted(result["contributors"]) == ["A", "B", "Dissent"] and result["stragglers"] == []
+
+
+def test_an_llm_whose_agents_all_fail_casts_no_vote_and_no_score():
+    ensemble = make_ensemble({
+        "A": ScoreClient(95),
+        "Down": ScoreClient(error_type="transient")
+    }, quorum=0)
+
+    result = ensemble.analyze("검찰청입니다.")
+
+    assert result["contributors"] == ["A"] and result["stragglers"] == ["Down"]
+    assert "Down" not in result["llm_scores"] and result["ensemble_score"] == 95  # not averaged with 50
+    assert result["quorum"]["votes"] == {"phishing": ["A"], "safe": []}
+    assert result["llm_calls"] == 6 and "error" not in result
+
+
+def test_every_llm_failing_is_an_error_not_a_verdict():
+    ensemble = make_ensemble({
+        "Down": ScoreClient(error_type="transient"),
+        "Open": ScoreClient(error_type="circuit_open", delay=0.01),
+        "Flaky": ScoreClient(error_type="transient", delay=0.02)
+    })
+
+    result = ensemble.analyze("검찰청입니다.")
+
+    assert result["error_type"] == "transient" and result["contributors"] == []
+    assert not result["quorum"]["reached"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
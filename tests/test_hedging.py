@@ -0,0 +1,72 @@
+"""
+Hedged LLM request tests
+"""
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+from src.llm.llm_clients.hedged_client import HedgedClient, LatencyTracker
+
+
+class FakeClient:
+    provider = "fake"
+
+    def __init__(self, name, seconds, score):
+        self.model_name = name
+        self.seconds = seconds
+        self.score = score
+        self.cancelled = False
+
+    def is_available(self):
+        return True
+
+    def analyze_phishing(self, text, prompt):
+        time.sleep(self.seconds)
+        return {"score": self.score, "model": self.model_name}
+
+    async def analyze_phishing_async(self, text, prompt):
+        try:
+            await asyncio.sleep(self.seconds)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return {"score": self.score, "model": self.model_name}
+
+
+def make_tracker(budget):
+    tracker = LatencyTracker(window=100, budget=budget, min_samples=1, min_delay=0.01)
+    tracker.record(0.05)  # observed p95: 50 ms
+    return tracker
+
+
+def test_slow_primary_is_hedged_and_cancelled():
+    """Past the observed p95 the secondary is raced; its answer wins and the primary is cancelled"""
+    primary = FakeClient("slow", 1.0, 90)
+    client = HedgedClient(primary, FakeClient("fast", 0.01, 95), "test_hedge", tracker=make_tracker(1.0))
+
+    start = time.perf_counter()
+    result = asyncio.run(client.analyze_phishing_async("text", "prompt"))
+
+    assert result["model"] == "fast" and result["hedged"] is True
+    assert time.perf_counter() - start < 0.5
+    assert primary.cancelled
+    assert client.tracker.stats()["window_hedged"] == 1
+
+
+def test_hedges_capped_by_budget():
+    """With a 10% budget only 2 of 20 slow calls are hedged; the rest wait for the primary"""
+    tracker = LatencyTracker(budget=0.1, min_samples=1000, initial_delay=0.02)
+    client = HedgedClient(FakeClient("slow", 0.06, 90), FakeClient("fast", 0.01, 95), "test_budget", tracker=tracker)
+    results = [client.analyze_phishing("text", "prompt") for _ in range(20)]
+
+    assert sum(1 for r in results if r.get("hedged")) == 2
+    assert sum(1 for r in results if r["score"] == 90) == 18
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
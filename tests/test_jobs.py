@@ -0,0 +1,88 @@
+"""
+SQLite job queue tests
+"""
+import sys
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+from src.server.jobs import JobStore, JobWorkerPool
+
+
+def test_claim_is_exclusive(tmp_path):
+    """A queued job is handed to exactly one worker"""
+    store = JobStore(tmp_path / "jobs.sqlite")
+    job_id = store.submit("audio", {"path": "a.wav"})
+
+    first = store.claim("w1")
+    assert first["id"] == job_id
+    assert first["attempts"] == 1
+    assert store.claim("w2") is None
+
+
+def test_expired_lease_is_reclaimed(tmp_path):
+    """A job whose worker died is picked up again after its lease (e.g. after restart)"""
+    path = tmp_path / "jobs.sqlite"
+    JobStore(path, lease_seconds=0.05).submit("audio", {})
+    JobStore(path, lease_seconds=0.05).claim("crashed")
+
+    time.sleep(0.1)
+    restarted = JobStore(path, lease_seconds=60)
+    job = restarted.claim("w2")
+    assert job is not None
+    assert job["attempts"] == 2
+
+
+
+def test_job_that_keeps_killing_its_worker_fails_after_max_attempts(tmp_path):
+    """A poison job whose lease expires on every attempt is failed, not reclaimed forever"""
+    store = JobStore(tmp_path / "jobs.sqlite", lease_seconds=0.01, max_attempts=2)
+    upload = tmp_path / "call.wav"
+    upload.write_bytes(b"RIFF")
+    job_id = store.submit("audio", {"path": str(upload)})
+    for _ in range(2):
+        assert store.claim("crashed") is not None
+        time.sleep(0.02)
+
+    assert store.claim("w") is None
+    pool = JobWorkerPool(store, {}, on_failed={"audio": lambda payload: Path(payload["path"]).unlink()})
+    assert pool.run_once("w") is False
+    assert store.get(job_id)["status"] == "failed" and not upload.exists()
+
+def test_retry_then_fail(tmp_path):
+    """Failures are re-queued until max_attempts"""
+    store = JobStore(tmp_path / "jobs.sqlite", max_attempts=2)
+    job_id = store.submit("audio", {})
+
+    store.claim("w")
+    assert store.fail(job_id, "boom") == "queued"
+    store.claim("w")
+    assert store.fail(job_id, "boom") == "failed"
+    assert store.get(job_id)["error"] == "boom"
+
+
+def test_worker_pool_runs_jobs(tmp_path):
+    """Worker threads run the handler and store its result"""
+    store = JobStore(tmp_path / "jobs.sqlite")
+    job_id = store.submit("echo", {"text": "검찰청"})
+    pool = JobWorkerPool(store, {"echo": lambda payload: {"echo": payload["text"]}}, poll_interval=0.05)
+
+    pool.start()
+    try:
+        deadline = time.time() + 5
+        while store.get(job_id)["status"] != "done" and time.time() < deadline:
+            time.sleep(0.05)
+    finally:
+        pool.stop()
+
+    job = store.get(job_id)
+    assert job["status"] == "done"
+    assert job["result"] == {"echo": "검찰청"}
+    assert store.stats()["done"] == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,98 @@
+"""
+LLM retry / circuit breaker tests
+"""
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+from src.config import config
+from src.llm.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, get_breaker, reset_breakers
+from src.llm.llm_clients.base_client import BaseLLMClient
+
+
+class FlakyClient(BaseLLMClient):
+    """Fails with the queued exceptions, then answers"""
+
+    def __init__(self, provider, failures):
+        self.provider = provider
+        self.model_name = provider
+        self.failures = list(failures)
+        self.attempts = 0
+
+    def is_available(self):
+        return True
+
+    def _build_request(self, text, prompt):
+        return "http://llm.invalid/v1", {}, {"model": self.provider}
+
+    def _extract_content(self, result):
+        return result["content"]
+
+    def _post_once(self, url, headers, payload):
+        self.attempts += 1
+        if self.failures:
+            raise self.failures.pop(0)
+        return {"content": '{"score": 90, "reasoning": "ok"}'}
+
+
+@pytest.fixture(autouse=True)
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(config.llm_resilience, "retry_attempts", 3)
+    monkeypatch.setattr(config.llm_resilience, "retry_base_delay", 0.0)
+    monkeypatch.setattr(config.llm_cache, "enabled", False)
+
+
+@pytest.fixture(autouse=True)
+def fresh_breakers():
+    """Breakers are process-wide: never leave one open for later tests (e.g. the mock server's)"""
+    reset_breakers()
+    yield
+    reset_breakers()
+
+
+def test_breaker_opens_then_half_open_trial_closes_it():
+    now = [0.0]
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_seconds=10, clock=lambda: now[0])
+
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+    breaker.record_failure()
+    assert breaker.state == OPEN and not breaker.allow()
+
+    now[0] = 10.0
+    assert breaker.allow() and breaker.state == HALF_OPEN
+    assert not breaker.allow()  # only one trial call
+    breaker.record_success()
+    assert breaker.state == CLOSED and breaker.allow()
+
+
+def test_transient_errors_are_retried_and_permanent_ones_are_not():
+    flaky = FlakyClient("test_flaky", [ConnectionError("reset"), TimeoutError("slow")])
+    result = flaky.analyze_phishing("text", "prompt")
+    assert flaky.attempts == 3 and result["score"] == 90 and "error" not in result
+    assert get_breaker("test_flaky").state == CLOSED
+
+    broken = FlakyClient("test_broken", [ValueError("bad payload")])
+    result = broken.analyze_phishing("text", "prompt")
+    assert broken.attempts == 1
+    assert result["error_type"] == "permanent"
+    assert get_breaker("test_broken").stats()["consecutive_failures"] == 0
+
+
+def test_each_gemini_model_has_its_own_breaker():
+    from src.llm.llm_clients.gemini_client import GeminiClient
+    primary = GeminiClient(api_key="key")
+    secondary = GeminiClient(api_key="key", model="gemini-2.5-flash-lite")
+    assert primary.endpoint_key != secondary.endpoint_key
+
+    for _ in range(config.llm_resilience.breaker_failures):
+        get_breaker(primary.endpoint_key).record_failure()
+    assert get_breaker(primary.endpoint_key).state == OPEN
+    assert get_breaker(secondary.endpoint_key).allow()  # failover target is not blocked
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
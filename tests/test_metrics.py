@@ -0,0 +1,79 @@
+"""
+Latency metrics tests
+"""
+import contextvars
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+from src.monitoring import Histogram, MetricsRegistry, record_llm_tokens, record_rule_outcome, timed, timed_llm, track_request
+from src.monitoring.metrics import REGISTRY
+
+
+def test_histogram_prometheus_format():
+    """Buckets are cumulative and end with +Inf, _sum and _count"""
+    registry = MetricsRegistry()
+    hist = registry.register(Histogram("test_seconds", "Test histogram", ["stage"], buckets=(0.1, 1.0)))
+    hist.observe(0.05, stage="stt")
+    hist.observe(0.5, stage="stt")
+    hist.observe(5.0, stage="stt")
+
+    text = registry.render()
+    assert "# TYPE test_seconds histogram" in text
+    assert 'test_seconds_bucket{stage="stt",le="0.1"} 1' in text
+    assert 'test_seconds_bucket{stage="stt",le="1"} 2' in text
+    assert 'test_seconds_bucket{stage="stt",le="+Inf"} 3' in text
+    assert 'test_seconds_count{stage="stt"} 3' in text
+
+
+def test_stages_on_worker_threads_keep_endpoint_and_timings():
+    """Stages timed on executor threads (copied context) land in the request's timings"""
+    def work():
+        with timed("embedding"):
+            pass
+        record_rule_outcome("rule1_financial_phone_scam")
+
+    with track_request("unit_test") as timings:
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            pool.submit(contextvars.copy_context().run, work).result()
+
+    assert "embedding" in timings.as_dict()
+    assert timings.rule == "rule1_financial_phone_scam"
+
+    text = REGISTRY.render()
+    assert 'sentinel_stage_duration_seconds_count{stage="embedding",endpoint="unit_test"} 1' in text
+    assert 'sentinel_rule_outcomes_total{endpoint="unit_test",rule="rule1_financial_phone_scam"} 1' in text
+    assert 'sentinel_request_duration_seconds_count{endpoint="unit_test",rule="rule1_financial_phone_scam"} 1' in text
+
+
+def test_llm_tokens_are_counted_per_provider_and_kind():
+    record_llm_tokens("unit_test_llm", {"prompt_tokens": 1200, "output_tokens": 40})
+    record_llm_tokens("unit_test_llm", {"prompt_tokens": 800, "output_tokens": 0})
+
+    text = REGISTRY.render()
+    assert 'sentinel_llm_tokens_total{provider="unit_test_llm",kind="prompt"} 2000' in text
+    assert 'sentinel_llm_tokens_total{provider="unit_test_llm",kind="output"} 40' in text
+
+
+
+def test_llm_error_results_are_timed_as_errors():
+    """A client that returns an error dict (instead of raising) is counted as status=error"""
+    with track_request("unit_test_llm_status"):
+        with timed_llm("unit_test_status") as call:
+            call.check({"score": 80})
+        with timed_llm("unit_test_status") as call:
+            call.check({"score": 50, "error": "timeout", "error_type": "transient"})
+        with timed_llm("unit_test_status") as call:
+            call.check([{"score": 10}, {"score": 50, "error": "parse"}])
+
+    text = REGISTRY.render()
+    labels = 'provider="unit_test_status",endpoint="unit_test_llm_status"'
+    assert f'sentinel_llm_request_duration_seconds_count{{{labels},status="ok"}} 1' in text
+    assert f'sentinel_llm_request_duration_seconds_count{{{labels},status="error"}} 2' in text
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
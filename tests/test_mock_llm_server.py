@@ -0,0 +1,44 @@
+"""
+Mock LLM provider server tests (clients pointed at it through LLM_BASE_URL)
+"""
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+from src.config import config
+from src.llm.llm_clients.gemini_client import GeminiClient
+from src.llm.llm_clients.openai_client import OpenAIClient
+from scripts.mock_llm_server import MockBehavior, start_server
+
+
+@pytest.fixture
+def mock_server(monkeypatch):
+    behavior = MockBehavior(
+        "fixed:5",
+        verdicts=[{"match": "예약하신", "score": 8}, {"match": "장애", "status": 503}]
+    )
+    server = start_server(behavior)
+    monkeypatch.setattr(config.llm_endpoints, "default", f"http://127.0.0.1:{server.server_port}")
+    monkeypatch.setattr(config.llm_resilience, "retry_base_delay", 0.0)
+    monkeypatch.setattr(config.llm_cache, "enabled", False)
+    yield behavior
+    server.shutdown()
+
+
+def test_clients_get_provider_shaped_mock_verdicts(mock_server):
+    gemini = GeminiClient(api_key="mock")
+    assert gemini.analyze_phishing("검찰입니다. 팀뷰어 설치하고 송금하세요.", "prompt")["score"] >= 70
+    assert OpenAIClient(api_key="mock").analyze_phishing("예약하신 진료 안내입니다.", "prompt")["score"] == 8
+
+
+def test_scripted_failures_surface_as_transient_errors(mock_server):
+    result = GeminiClient(api_key="mock").analyze_phishing("서버 장애", "prompt")
+    assert result["error_type"] == "transient"
+    assert mock_server.stats()["gemini.error"] == config.llm_resilience.retry_attempts
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,50 @@
+"""
+Per-provider LLM rate limiter tests
+"""
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+from src.llm.rate_limit import ProviderLimiter, TokenBucket
+
+
+def test_token_bucket_allows_burst_then_spaces_calls():
+    """First `burst` calls go immediately, later callers get evenly spaced slots in arrival order"""
+    bucket = TokenBucket(rate_per_second=10, burst=2)
+    waits = [bucket.reserve() for _ in range(4)]
+
+    assert waits[0] == 0 and waits[1] == 0
+    assert waits[2] == pytest.approx(0.1, abs=0.02)
+    assert waits[3] == pytest.approx(0.2, abs=0.02)
+
+
+def test_provider_limiter_caps_concurrency():
+    """No more than max_concurrent calls hold the provider at once"""
+    limiter = ProviderLimiter("test", max_concurrent=2, requests_per_minute=0)
+    peak = 0
+    lock = threading.Lock()
+
+    def call():
+        nonlocal peak
+        with limiter.limit():
+            with lock:
+                peak = max(peak, limiter.stats()["in_flight"])
+            time.sleep(0.05)
+
+    threads = [threading.Thread(target=call) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert peak == 2
+    assert limiter.stats() == {"max_concurrent": 2, "requests_per_minute": 0, "in_flight": 0, "waiting": 0}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
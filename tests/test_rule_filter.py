@@ -0,0 +1,94 @@
+"""
+Rule Filter V2 tests
+"""
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+from src.config import config
+from src.filters.rule_filter_v2 import RuleBasedFilterV2
+from src.filters.speculation import NOT_PREDICTED, SPECULATIONS, SpeculationBudget
+
+CASES = [
+    ("금융감독원입니다. 고객님 계좌 보호를 위해 보안 앱 설치 후 OTP 번호를 불러주세요.", 40),
+    ("환불해 주세요. 안 그러면 소비자원에 신고하겠습니다.", 80),
+    ("중고나라 거래인데 안전결제 말고 선입금으로 해주세요.", 90),
+    ("안녕하세요. 예약하신 배송이 내일 도착 예정입니다.", 10),
+]
+
+
+@pytest.fixture
+def rule_filter():
+    rule_filter = RuleBasedFilterV2()
+    rule_filter.second_stage_llm = None  # no network in tests
+    return rule_filter
+
+
+@pytest.mark.parametrize("text,llm_score", CASES)
+def test_precomputed_features_match(rule_filter, text, llm_score):
+    """filter(features=...) gives the same verdict as computing features inline"""
+    features = rule_filter.extract_features_batch([text])[0]
+
+    inline = rule_filter.filter(text, llm_score)
+    precomputed = rule_filter.filter(text, llm_score, features=features)
+
+    assert precomputed == inline
+
+
+class SecondStageLLM:
+    def __init__(self):
+        self.prompts = []
+
+    def analyze_phishing(self, text, prompt):
+        self.prompts.append(prompt)
+        return {"score": 10, "is_phishing": False, "reasoning": "고객이 환급을 받는 상황"}
+
+
+def speculation_count(outcome):
+    return SPECULATIONS._values.get((outcome,), 0)
+
+
+def test_speculative_second_stage_is_used_in_band_and_discarded_outside(rule_filter, monkeypatch):
+    monkeypatch.setattr(config.speculation, "enabled", True)
+    rule_filter.second_stage_llm = SecondStageLLM()
+    text = "국세청입니다. 환급금 입금을 위해 계좌번호를 알려주세요."
+    features = rule_filter.extract_features(text)
+    used, wasted = speculation_count("used"), speculation_count("wasted")
+
+    speculative = rule_filter.speculate(text, features)
+    assert speculative is not None  # crime keywords, no decisive text rule
+    result = rule_filter.filter(text, 75, features=features, speculative=speculative)
+    assert result["rule"] == "rule7_second_stage" and speculation_count("used") == used + 1
+    assert len(rule_filter.second_stage_llm.prompts) == 1  # no second call after the first score
+    assert "75" not in rule_filter.second_stage_llm.prompts[0]  # sent before the first score existed
+
+    rule_filter.filter(text, 30, features=features, speculative=rule_filter.speculate(text, features))
+    assert speculation_count("wasted") == wasted + 1
+
+
+def test_missed_counts_only_second_stages_the_predictor_ruled_out(rule_filter, monkeypatch):
+    rule_filter.second_stage_llm = SecondStageLLM()
+    text = "안녕하세요. 예약하신 배송이 내일 도착 예정입니다."  # no crime keyword
+    features = rule_filter.extract_features(text)
+    missed = speculation_count("missed")
+
+    rule_filter.filter(text, 75, features=features)  # speculation never attempted (off, batch path)
+    assert speculation_count("missed") == missed
+
+    monkeypatch.setattr(config.speculation, "enabled", True)
+    speculative = rule_filter.speculate(text, features)
+    assert speculative is NOT_PREDICTED
+    rule_filter.filter(text, 75, features=features, speculative=speculative)
+    assert speculation_count("missed") == missed + 1
+
+def test_speculation_budget_caps_the_share_of_calls():
+    budget = SpeculationBudget(window=10, budget=0.2)
+    admitted = [budget.admit(True) for _ in range(10)]
+    assert sum(admitted) == 2 and not budget.admit(False)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
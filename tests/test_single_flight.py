@@ -0,0 +1,95 @@
+"""
+Single-flight coalescing tests
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+from src.server.admission import AdmissionController, DeadlineExceeded, current_deadline, deadline_scope
+from src.server.executors import StageExecutor, StageExecutors
+from src.server.single_flight import SingleFlight
+
+
+def test_concurrent_calls_share_one_computation():
+    """Same key → one call; a waiter that times out does not cancel it for the others"""
+    flight = SingleFlight()
+    calls = []
+
+    async def analyze(text):
+        calls.append(text)
+        await asyncio.sleep(0.1)
+        return {"score": 95, "text": text}
+
+    async def scenario():
+        impatient = asyncio.ensure_future(flight.do("viral", analyze, "검찰청입니다", timeout=0.01))
+        results = await asyncio.gather(*(flight.do("viral", analyze, "검찰청입니다") for _ in range(5)))
+        with pytest.raises(asyncio.TimeoutError):
+            await impatient
+        other = await flight.do("other", analyze, "택배 조회")
+        return results, other
+
+    results, other = asyncio.run(scenario())
+    assert calls == ["검찰청입니다", "택배 조회"]
+    assert all(r == {"score": 95, "text": "검찰청입니다"} for r in results)
+    assert other["text"] == "택배 조회"
+    assert flight.stats() == {"in_flight": 0, "leaders": 2, "coalesced": 5}
+
+
+def test_failure_reaches_every_waiter_and_is_not_remembered():
+    flight = SingleFlight()
+    attempts = []
+
+    async def flaky():
+        attempts.append(1)
+        await asyncio.sleep(0.05)
+        if len(attempts) == 1:
+            raise RuntimeError("provider 503")
+        return "ok"
+
+    async def scenario():
+        outcomes = await asyncio.gather(*(flight.do("k", flaky) for _ in range(3)), return_exceptions=True)
+        return outcomes, await flight.do("k", flaky)
+
+    outcomes, retry = asyncio.run(scenario())
+    assert all(isinstance(o, RuntimeError) for o in outcomes)
+    assert retry == "ok"
+
+
+
+def test_follower_is_not_failed_by_its_leaders_short_deadline():
+    """A follower with a longer budget retries a call that ran out of its leader's budget"""
+    flight = SingleFlight()
+    admission = AdmissionController(
+        StageExecutors({"llm": StageExecutor("llm", 2, 4)}), limits={"llm": 4}, min_budget={"llm": 0.01}
+    )
+    calls = []
+
+    async def analyze():
+        async def llm():
+            calls.append(current_deadline().budget)
+            await asyncio.sleep(0.2)
+            return {"score": 95}
+        return await admission.run_async("llm", llm)
+
+    async def caller(budget, delay=0.0):
+        await asyncio.sleep(delay)
+        with deadline_scope(budget):
+            return await flight.do(
+                "viral", analyze, timeout=current_deadline().remaining(),
+                retry_if=lambda e: isinstance(e, DeadlineExceeded)
+            )
+
+    async def scenario():
+        return await asyncio.gather(caller(0.1), caller(2.0, delay=0.02), return_exceptions=True)
+
+    leader, follower = asyncio.run(scenario())
+    assert isinstance(leader, (asyncio.TimeoutError, DeadlineExceeded))
+    assert follower == {"score": 95}
+    assert calls == [0.1, 2.0]  # the retry ran under the follower's own deadline
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,65 @@
+"""
+Startup warm-up registry tests
+"""
+import sys
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+from src.server.warmup import WarmupRegistry
+
+
+def slow(value, seconds=0.2):
+    def factory(*deps):
+        time.sleep(seconds)
+        return value
+    return factory
+
+
+def test_independent_components_load_in_parallel():
+    """Independent components overlap; dependents receive their dependencies"""
+    registry = WarmupRegistry()
+    registry.register("stt", slow("whisper"))
+    registry.register("vector_store", slow("faiss"))
+    registry.register("pipeline", lambda stt, store: (stt, store), depends_on=["stt", "vector_store"])
+
+    loaded = registry.run(max_workers=4)
+    report = registry.report()
+
+    assert loaded["pipeline"] == ("whisper", "faiss")
+    assert registry.is_ready()
+    assert report["total_seconds"] < report["sequential_seconds"]
+
+
+def test_optional_failure_keeps_service_ready():
+    """A failed optional component is reported but does not block readiness"""
+    registry = WarmupRegistry()
+    registry.register("risk_scorer", lambda: "scorer")
+
+    def broken():
+        raise RuntimeError("GEMINI_API_KEY not set")
+
+    registry.register("gemini_detector", broken, required=False)
+    registry.register("uses_gemini", lambda g: g, depends_on=["gemini_detector"], required=False)
+    registry.run()
+
+    report = registry.report()["components"]
+    assert registry.is_ready()
+    assert report["gemini_detector"]["status"] == "failed"
+    assert "dependency failed" in report["uses_gemini"]["error"]
+
+
+def test_required_failure_is_not_ready():
+    registry = WarmupRegistry()
+    registry.register("stt", lambda: 1 / 0)
+    registry.run()
+
+    assert not registry.is_ready()
+    assert registry.get("stt") is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])